@@ -0,0 +1,156 @@
+"""
+Compare homepage throughput of a sync and the async home view under ASGI.
+
+Both views are served by Django's ASGI handler while a local stand-in server
+answers the feed requests after a fixed delay, and the feed cache is disabled
+so every request goes upstream; so are the page and section caches. Under
+ASGI a sync view runs on Django's single sync thread, so requests queue
+behind each other's feed round trips; the async view awaits the feeds and
+the blog query without holding it.
+
+Run from the repository root:
+
+    python benchmarks/home_async.py
+"""
+
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pyopensci_website.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.shortcuts import render  # noqa: E402
+from django.template.loader import render_to_string  # noqa: E402
+from django.test import AsyncClient, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import path  # noqa: E402
+from django.utils.safestring import mark_safe  # noqa: E402
+from ruamel.yaml import YAML  # noqa: E402
+
+from benchmarks.synthetic import make_contributors, make_packages  # noqa: E402
+from core.cache import feed_cache  # noqa: E402
+from core.http import connection_pool, feed_fetcher  # noqa: E402
+from core.utils import get_recent_contributors, get_recent_packages, prefetch_feeds  # noqa: E402
+from core.views import HERO_SUBTITLE, HERO_TITLE  # noqa: E402
+from pyopensci_website import urls as project_urls  # noqa: E402
+from publications.models import BlogPage  # noqa: E402
+
+UPSTREAM_DELAY = 0.05
+REQUESTS = 100
+CONCURRENCY = 10
+
+
+def sync_home(request):
+    """The home view as it was before it became async."""
+    prefetch_feeds()
+    context = {
+        'hero_title': HERO_TITLE,
+        'hero_subtitle': HERO_SUBTITLE,
+        'recent_contributors': get_recent_contributors(count=4),
+        'recent_packages': get_recent_packages(count=3),
+        'recent_blog_posts': BlogPage.objects.live().select_related('author').order_by('-date')[:3],
+    }
+    sections = {
+        name: mark_safe(render_to_string(f'core/home/{name}.html', context))
+        for name in ('hero', 'contributors', 'blog', 'packages')
+    }
+    return render(request, 'core/home.html', {'sections': sections})
+
+
+urlpatterns = [path('sync-home/', sync_home)] + project_urls.urlpatterns
+
+
+def serve_feeds(files, delay):
+    """Serve ``files`` from a local server that answers after ``delay`` seconds."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            requests.append(self.path)
+            time.sleep(delay)
+            body = files[self.path]
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, requests
+
+
+def yaml_bytes(data):
+    """Dump ``data`` to YAML bytes."""
+    stream = io.StringIO()
+    YAML().dump(data, stream)
+    return stream.getvalue().encode()
+
+
+async def drive(url):
+    """Request ``url`` REQUESTS times, CONCURRENCY at a time; return requests/s."""
+    remaining = iter(range(REQUESTS))
+
+    async def worker():
+        client = AsyncClient()
+        for _ in remaining:
+            response = await client.get(url)
+            if response.status_code != 200:
+                raise SystemExit(f"{url} returned {response.status_code}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def main():
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+    httpd, upstream = serve_feeds(
+        {
+            '/contributors.yml': yaml_bytes(make_contributors(100)),
+            '/packages.yml': yaml_bytes(make_packages(100)),
+        },
+        UPSTREAM_DELAY,
+    )
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    print(
+        f"{REQUESTS} requests, {CONCURRENCY} concurrent, "
+        f"{UPSTREAM_DELAY * 1e3:.0f} ms upstream latency, feed cache disabled"
+    )
+    print(f"{'view':<8}{'requests/s':>12}{'upstream fetches':>18}")
+    with override_settings(ROOT_URLCONF=__name__, FEED_CACHE_TTL=0, FEED_CACHE_DIR=None,
+                           PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0), \
+            patch('core.utils.CONTRIBUTORS_URL', f"{base}/contributors.yml"), \
+            patch('core.utils.PACKAGES_URL', f"{base}/packages.yml"):
+        for name, url in (('sync', '/sync-home/'), ('async', '/')):
+            feed_cache.clear()
+            feed_fetcher.clear()
+            upstream.clear()
+            throughput = asyncio.run(drive(url))
+            print(f"{name:<8}{throughput:>12.1f}{len(upstream):>18}")
+
+    httpd.shutdown()
+    connection_pool.close()
+
+
+if __name__ == '__main__':
+    main()
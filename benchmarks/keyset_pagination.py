@@ -0,0 +1,96 @@
+"""
+Compare numbered and cursor pagination of the blog index on a large archive.
+
+Builds a test database with 10,000 and then 100,000 live blog posts and
+times fetching the first, middle and last page of the blog index queryset
+with ``django.core.paginator.Paginator`` (a ``COUNT`` plus ``OFFSET``) and
+with ``KeysetPaginator`` (a range on ``(date, pk)``, no count). Numbered
+pages get slower the deeper they are; cursor pages should not.
+
+Run from the repository root:
+
+    python benchmarks/keyset_pagination.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pyopensci_website.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.paginator import Paginator  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from core.pagination import NEXT, KeysetPaginator  # noqa: E402
+from core.testing import seed_pages  # noqa: E402
+from publications.models import BlogPage  # noqa: E402
+
+SIZES = (10_000, 100_000)
+PER_PAGE = 12
+REPEAT = 5
+
+
+def blog_posts():
+    """Return the queryset the blog index paginates."""
+    return BlogPage.objects.live().select_related('author').prefetch_related('tags').order_by('-date')
+
+
+def best_of(func):
+    """Return the fastest of ``REPEAT`` runs of ``func``, in milliseconds."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def offset_page(number):
+    """Fetch numbered page ``number`` as the index did before cursors."""
+    page = Paginator(blog_posts(), PER_PAGE).page(number)
+    list(page)
+    return page.paginator.num_pages
+
+
+def keyset_page(cursor):
+    """Fetch the cursor page ``cursor`` points to."""
+    list(KeysetPaginator(blog_posts(), PER_PAGE, 'date').page(cursor))
+
+
+def cursor_before(position):
+    """Return the cursor of the page starting at row ``position``."""
+    if position == 0:
+        return None
+    row = BlogPage.objects.live().order_by('-date', '-pk')[position - 1]
+    return KeysetPaginator(blog_posts(), PER_PAGE, 'date').encode_cursor(NEXT, row)
+
+
+def main():
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+    print(f"{'posts':>8}  {'page':<7}{'offset ms':>11}{'cursor ms':>11}")
+    seeded = 0
+    for size in SIZES:
+        for start in range(seeded, size, 10_000):
+            seed_pages(BlogPage, min(10_000, size - start), start=start,
+                       first_date=BlogPage.objects.order_by('-date').values_list('date', flat=True).first())
+        seeded = size
+
+        num_pages = offset_page(1)
+        for label, number in (('first', 1), ('middle', num_pages // 2), ('last', num_pages)):
+            cursor = cursor_before((number - 1) * PER_PAGE)
+            offset_ms = best_of(lambda: offset_page(number))
+            cursor_ms = best_of(lambda: keyset_page(cursor))
+            print(f"{size:>8}  {label:<7}{offset_ms:>11.2f}{cursor_ms:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
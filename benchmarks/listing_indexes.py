@@ -0,0 +1,104 @@
+"""
+Show the query plans and latency of the listing queries with and without
+the ``(date, pk)`` and ``(start_date, pk)`` indexes.
+
+Builds a test database with 25,000 live blog posts and 25,000 live events,
+drops the listing indexes of ``publications.0003_listing_indexes``, then
+prints ``EXPLAIN QUERY PLAN`` and the best time of each listing query, and
+does the same again with the indexes back in place.
+
+Run from the repository root:
+
+    python benchmarks/listing_indexes.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pyopensci_website.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from core.facets import year_facets  # noqa: E402
+from core.pagination import NEXT, KeysetPaginator  # noqa: E402
+from core.testing import seed_pages  # noqa: E402
+from publications.models import BlogPage, EventPage  # noqa: E402
+
+PAGES = 25_000
+REPEAT = 5
+
+
+def listing_queries():
+    """Return the listing queries of the indexes, by name, as callables and querysets."""
+    posts = BlogPage.objects.live().select_related('author')
+    events = EventPage.objects.live().select_related('author')
+    middle = BlogPage.objects.live().order_by('-date', '-pk')[PAGES // 2]
+    cursor = KeysetPaginator(posts, 12, 'date').encode_cursor(NEXT, middle)
+    deep = KeysetPaginator(posts, 12, 'date').decode_cursor(cursor)[1]
+    year = middle.date.year
+    today = timezone.localdate()
+
+    return {
+        'blog first page': posts.order_by('-date', '-pk')[:13],
+        'blog deep page': posts.filter(date__lte=deep[0]).exclude(date=deep[0], pk__gte=deep[1])
+                               .order_by('-date', '-pk')[:13],
+        'blog year page': posts.filter(date__year=year).order_by('-date', '-pk')[:13],
+        'events first page': events.order_by('-start_date', '-pk')[:16],
+        'upcoming events': events.filter(start_date__gte=today).order_by('start_date')[:10],
+        'blog year facets': year_facets.count,
+    }
+
+
+def best_of(func):
+    """Return the fastest of ``REPEAT`` runs of ``func``, in milliseconds."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def report(title):
+    """Print the plan and latency of each listing query."""
+    print(f"\n== {title} ==")
+    for name, query in listing_queries().items():
+        if callable(query):
+            print(f"\n{name}: {best_of(lambda: query(BlogPage)):.2f} ms")
+            continue
+        print(f"\n{name}: {best_of(lambda: list(query.all())):.2f} ms")
+        for line in query.explain().splitlines():
+            print(f"    {line}")
+
+
+def main():
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+    seed_pages(BlogPage, PAGES)
+    seed_pages(EventPage, PAGES)
+
+    indexes = [(model, model._meta.indexes) for model in (BlogPage, EventPage)]
+    with connection.schema_editor() as editor:
+        for model, model_indexes in indexes:
+            for index in model_indexes:
+                editor.remove_index(model, index)
+    report("without listing indexes")
+
+    with connection.schema_editor() as editor:
+        for model, model_indexes in indexes:
+            for index in model_indexes:
+                editor.add_index(model, index)
+    report("with listing indexes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare the memory used by parsed feed dictionaries and compact records.
+
+Run from the repository root:
+
+    python benchmarks/records_memory.py
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pyopensci_website.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from benchmarks.synthetic import make_contributors, make_packages  # noqa: E402
+from core.records import ContributorRecord, PackageRecord, build_records  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def measure(build):
+    """Return the number of bytes retained by the value ``build`` returns."""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return current
+
+
+def main():
+    print(f"{'feed':<14}{'records':>10}{'dicts (MB)':>14}{'records (MB)':>16}{'saving':>10}")
+    for name, make, record_cls in (
+        ('contributors', make_contributors, ContributorRecord),
+        ('packages', make_packages, PackageRecord),
+    ):
+        for size in SIZES:
+            # Both forms are built from scratch inside the measurement; the
+            # dictionaries behind the records are garbage once converted
+            dict_bytes = measure(lambda: make(size))
+            record_bytes = measure(lambda: build_records(make(size), record_cls.from_yaml))
+            print(
+                f"{name:<14}{size:>10,}{dict_bytes / 1e6:>14.1f}{record_bytes / 1e6:>16.1f}"
+                f"{1 - record_bytes / dict_bytes:>10.0%}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Compare per-worker memory of snapshot loading and the shared feed mapping.
+
+Starts N worker processes that each either load the pickled snapshot of a
+100k-entry contributors feed (a private copy per worker) or map the shared
+feed file and read the homepage's four most recent records. Reports the
+private memory each worker gained, which is what grows with the number of
+workers; pages of the mapped file are shared between all of them.
+
+Linux only (reads /proc/self/smaps_rollup). Run from the repository root:
+
+    python benchmarks/shared_feed_memory.py
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pyopensci_website.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from benchmarks.synthetic import make_contributors  # noqa: E402
+from core.records import SCHEMA_VERSION, ContributorRecord, build_records  # noqa: E402
+from core.recency import recency_order  # noqa: E402
+from core.shared import SharedFeedStore  # noqa: E402
+from core.snapshot import SnapshotStore  # noqa: E402
+
+SIZE = 100_000
+WORKERS = (1, 4, 8)
+
+
+def private_kb():
+    """Return the private (unshared) memory of this process in kB."""
+    total = 0
+    with open('/proc/self/smaps_rollup') as smaps:
+        for line in smaps:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total
+
+
+def snapshot_worker(cache_dir, start, results):
+    """Load the whole feed from its snapshot, as every worker did before."""
+    before = private_kb()
+    start.wait()
+    records = SnapshotStore(cache_dir).load('contributors', 'hash', SCHEMA_VERSION)
+    results.put(private_kb() - before)
+    del records
+
+
+def shared_worker(cache_dir, start, results):
+    """Map the shared feed and read the four most recent records."""
+    before = private_kb()
+    start.wait()
+    feed = SharedFeedStore(cache_dir).get('contributors')
+    feed.recent(4)
+    results.put(private_kb() - before)
+
+
+def run(worker, cache_dir, count):
+    """Run ``count`` workers at once and return their private memory gains in kB."""
+    context = multiprocessing.get_context('fork')
+    start = context.Barrier(count)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(cache_dir, start, results)) for _ in range(count)]
+    for process in processes:
+        process.start()
+    gains = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return gains
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        records = build_records(make_contributors(SIZE), ContributorRecord.from_yaml)
+        SnapshotStore(cache_dir).save('contributors', 'hash', SCHEMA_VERSION, records)
+        order = recency_order(records, 'date_added', newest_last=True)
+        SharedFeedStore(cache_dir).publish('contributors', records, order)
+        shared_size = SharedFeedStore(cache_dir).path('contributors').stat().st_size
+        # Workers are forked; they must not inherit the records
+        del records, order
+
+        print(f"{SIZE:,} contributors, shared file {shared_size / 1e6:.1f} MB")
+        print("Private memory gained by all workers together:")
+        print(f"{'workers':>8}{'snapshot (MB)':>16}{'shared (MB)':>14}")
+        for count in WORKERS:
+            snapshot = sum(run(snapshot_worker, cache_dir, count)) / 1e3
+            shared = sum(run(shared_worker, cache_dir, count)) / 1e3
+            print(f"{count:>8}{snapshot:>16.1f}{shared:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
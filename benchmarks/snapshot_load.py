@@ -0,0 +1,77 @@
+"""
+Compare parsing the YAML feeds with loading their binary snapshots.
+
+Run from the repository root:
+
+    python benchmarks/snapshot_load.py
+"""
+
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pyopensci_website.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from ruamel.yaml import YAML  # noqa: E402
+
+from benchmarks.synthetic import make_contributors, make_packages  # noqa: E402
+from core.records import SCHEMA_VERSION, ContributorRecord, PackageRecord, build_records  # noqa: E402
+from core.snapshot import SnapshotStore  # noqa: E402
+from core.utils import yaml  # noqa: E402
+
+SIZES = (1_000, 10_000)
+LOAD_REPEAT = 5
+
+
+def timed(func):
+    """Return the result of ``func`` and the time it took in seconds."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def to_yaml(records):
+    """Serialize synthetic records the way the feeds are published."""
+    stream = io.StringIO()
+    YAML().dump(records, stream)
+    return stream.getvalue()
+
+
+def main():
+    print(f"{'feed':<14}{'records':>10}{'parse (ms)':>14}{'snapshot (ms)':>16}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        store = SnapshotStore(cache_dir)
+        for name, make, record_cls in (
+            ('contributors', make_contributors, ContributorRecord),
+            ('packages', make_packages, PackageRecord),
+        ):
+            for size in SIZES:
+                text = to_yaml(make(size))
+                digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+                # Parsing is slow enough that one run is representative
+                records, parse_seconds = timed(
+                    lambda: build_records(yaml.load(text), record_cls.from_yaml)
+                )
+                store.save(name, digest, SCHEMA_VERSION, records)
+                load_seconds = min(
+                    timed(lambda: store.load(name, digest, SCHEMA_VERSION))[1]
+                    for _ in range(LOAD_REPEAT)
+                )
+                print(
+                    f"{name:<14}{size:>10,}{parse_seconds * 1e3:>14.1f}{load_seconds * 1e3:>16.1f}"
+                    f"{parse_seconds / load_seconds:>9.0f}x"
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic contributors.yml / packages.yml data for benchmarks.
+
+Records use the same keys and value shapes as the real pyosMeta feeds, with
+a deterministic mix of filled and empty fields.
+"""
+
+import random
+from datetime import date, timedelta
+
+TITLES = ['Editor', 'Reviewer', 'Maintainer', 'Advisory Council', 'Emeritus Editor']
+PARTNERS = ['astropy', 'pangeo', 'scikit-hep']
+CONTRIBUTOR_TYPES = ['package-reviewer', 'package-maintainer', 'community', 'web-contrib', 'code-contrib']
+CATEGORIES = ['data-processing', 'data-retrieval', 'data-visualization', 'scientific-software', 'data-munging']
+
+
+def make_contributors(count, seed=0):
+    """Return ``count`` contributor dictionaries shaped like contributors.yml."""
+    rng = random.Random(seed)
+    start = date(2019, 1, 1)
+    contributors = []
+    for i in range(count):
+        username = f'user{i}'
+        contributors.append({
+            'name': f'Contributor {i}' if i % 5 else None,
+            'github_username': username,
+            'github_image_id': 1000000 + i,
+            'bio': f'Scientist and open source developer number {i}.' if i % 3 == 0 else '',
+            'organization': rng.choice(['University A', 'Lab B', 'Company C', '']),
+            'location': rng.choice(['Berlin', 'Denver', 'Nairobi', '']),
+            'email': f'{username}@example.org' if i % 4 == 0 else '',
+            'date_added': (start + timedelta(days=i % 2000)).isoformat(),
+            'deia_advisory': False,
+            'editorial_board': i % 50 == 0,
+            'emeritus_editor': False,
+            'advisory': False,
+            'emeritus_advisory': False,
+            'board': False,
+            'twitter': username if i % 7 == 0 else '',
+            'mastodon': '',
+            'orcidid': '',
+            'website': f'https://{username}.example.org' if i % 6 == 0 else '',
+            'title': rng.sample(TITLES, rng.randint(0, 2)),
+            'partners': rng.sample(PARTNERS, rng.randint(0, 1)),
+            'contributor_type': rng.sample(CONTRIBUTOR_TYPES, rng.randint(1, 3)),
+            'packages_eic': [],
+            'packages_editor': [f'pkg-{j}' for j in range(rng.randint(0, 2))],
+            'packages_submitted': [f'pkg-{j}' for j in range(rng.randint(0, 2))],
+            'packages_reviewed': [f'pkg-{j}' for j in range(rng.randint(0, 4))],
+            'sort': i,
+        })
+    return contributors
+
+
+def make_packages(count, seed=0):
+    """Return ``count`` package dictionaries shaped like packages.yml."""
+    rng = random.Random(seed)
+    start = date(2019, 1, 1)
+    packages = []
+    for i in range(count):
+        def person(j):
+            return {'name': f'Person {j}', 'github_username': f'user{j}'}
+
+        packages.append({
+            'package_name': f'pkg-{i}',
+            'package_description': f'Package {i} does useful scientific things with data.',
+            'repository_link': f'https://github.com/org/pkg-{i}',
+            'version_submitted': '0.1.0',
+            'version_accepted': '1.0.0',
+            'date_accepted': (start + timedelta(days=i % 2000)).strftime('%m/%d/%Y'),
+            'created_at': '2023-01-09T19:49:49Z',
+            'updated_at': '2023-06-01T10:00:00Z',
+            'closed_at': '2023-07-01T10:00:00Z',
+            'issue_link': f'https://github.com/pyOpenSci/software-submission/issues/{i}',
+            'archive': '',
+            'joss': '',
+            'active': True,
+            'submitting_author': person(i),
+            'all_current_maintainers': [person(i + j) for j in range(rng.randint(1, 3))],
+            'categories': rng.sample(CATEGORIES, rng.randint(1, 2)),
+            'editor': person(i + 1),
+            'eic': person(i + 2),
+            'reviewers': [person(i + j) for j in range(2)],
+            'partners': [],
+            'labels': ['6/pyOS-approved'],
+            'gh_meta': {
+                'name': f'pkg-{i}',
+                'description': 'A package',
+                'documentation': f'https://pkg-{i}.readthedocs.io',
+                'stargazers_count': rng.randint(0, 500),
+                'forks_count': rng.randint(0, 100),
+                'contrib_count': rng.randint(1, 50),
+                'open_issues_count': rng.randint(0, 40),
+                'last_commit': '2024-01-01T00:00:00Z',
+            },
+        })
+    return packages
@@ -0,0 +1,72 @@
+"""
+Compare the feed parser backends on a 10k-entry contributors file.
+
+Run from the repository root:
+
+    python benchmarks/yaml_parsers.py
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pyopensci_website.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from ruamel.yaml import YAML  # noqa: E402
+
+from benchmarks.synthetic import make_contributors  # noqa: E402
+from core.normalize import to_json  # noqa: E402
+from core.parsers import JSONParser, LibYAMLParser, RuamelParser  # noqa: E402
+from core.records import ContributorRecord, build_records  # noqa: E402
+
+SIZE = 10_000
+
+
+def timed(func):
+    """Return the result of ``func`` and the time it took in seconds."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    stream = io.StringIO()
+    YAML().dump(make_contributors(SIZE), stream)
+    yaml_text = stream.getvalue()
+    json_text = json.dumps(to_json(make_contributors(SIZE)))
+
+    backends = [('ruamel', RuamelParser(), yaml_text)]
+    if LibYAMLParser.is_available():
+        backends.append(('libyaml', LibYAMLParser(), yaml_text))
+    else:
+        print("PyYAML with libyaml is not installed; skipping the libyaml backend")
+    backends.append(('json mirror', JSONParser(), json_text))
+
+    print(f"{SIZE:,} contributors, {len(yaml_text) / 1e6:.1f} MB of YAML")
+    print(f"{'backend':<14}{'parse (ms)':>12}{'+ records (ms)':>16}{'speedup':>10}")
+    baseline = None
+    expected = None
+    for name, parser, text in backends:
+        data, parse_seconds = timed(lambda: parser.load(text))
+        records, build_seconds = timed(lambda: build_records(data, ContributorRecord.from_yaml))
+        total = parse_seconds + build_seconds
+        if baseline is None:
+            baseline, expected = total, records
+        elif records != expected:
+            raise SystemExit(f"{name} produced different records")
+        print(
+            f"{name:<14}{parse_seconds * 1e3:>12.0f}{total * 1e3:>16.0f}"
+            f"{baseline / total:>9.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -3,4 +3,62 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core'
\ No newline at end of file
+    name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from wagtail.signals import page_published, page_unpublished
+
+        from publications.models import Author, BlogPage, EventPage
+
+        from .facets import invalidate_facets_on_change
+        from .pagecache import invalidate_pages_on_publish
+        from .surrogate import purge_author_on_save, purge_page_on_publish
+        from .upcoming import invalidate_upcoming_on_change
+
+        # The cached home and index pages list blog posts and events
+        for name, signal in (
+            ('published', page_published), ('unpublished', page_unpublished), ('deleted', post_delete),
+        ):
+            for model in (BlogPage, EventPage):
+                signal.connect(
+                    invalidate_pages_on_publish,
+                    sender=model,
+                    dispatch_uid=f'pagecache-{name}-{model.__name__}',
+                )
+        # and the names of their authors
+        for name, signal in (('saved', post_save), ('deleted', post_delete)):
+            signal.connect(invalidate_pages_on_publish, sender=Author, dispatch_uid=f'pagecache-{name}-Author')
+
+        # The index year filters count the live pages of each year
+        for name, signal in (
+            ('published', page_published), ('unpublished', page_unpublished), ('deleted', post_delete),
+        ):
+            for model in (BlogPage, EventPage):
+                signal.connect(
+                    invalidate_facets_on_change,
+                    sender=model,
+                    dispatch_uid=f'facets-{name}-{model.__name__}',
+                )
+
+        # The events index lists the next upcoming events
+        for name, signal in (
+            ('published', page_published), ('unpublished', page_unpublished), ('deleted', post_delete),
+        ):
+            signal.connect(
+                invalidate_upcoming_on_change,
+                sender=EventPage,
+                dispatch_uid=f'upcoming-{name}-EventPage',
+            )
+
+        # Reverse proxies drop the pages showing changed content
+        for name, signal in (
+            ('published', page_published), ('unpublished', page_unpublished), ('deleted', post_delete),
+        ):
+            for model in (BlogPage, EventPage):
+                signal.connect(
+                    purge_page_on_publish,
+                    sender=model,
+                    dispatch_uid=f'surrogate-{name}-{model.__name__}',
+                )
+        post_save.connect(purge_author_on_save, sender=Author, dispatch_uid='surrogate-saved-Author')
@@ -0,0 +1,352 @@
+"""
+In-process cache for the contributor and package feeds.
+
+The homepage needs the parsed contributor and package feeds on every render.
+Fetching and parsing them is slow, so parsed results are kept in memory for a
+configurable time-to-live. Once an entry is older than its TTL it is still
+served (stale-while-revalidate) while a single background thread refreshes it,
+so requests only ever block on the upstream when the cache is cold.
+
+``refresh`` marks an entry stale and reloads it straight away, for callers
+that learn about upstream changes (see ``core.webhooks``) instead of waiting
+for the TTL to run out.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Default number of seconds a feed is considered fresh
+DEFAULT_FEED_CACHE_TTL = 300
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached value together with its bookkeeping.
+
+    Attributes
+    ----------
+    value : Any
+        The cached value.
+    fetched_at : float
+        ``time.monotonic()`` timestamp of when the value was loaded.
+    """
+    value: Any
+    fetched_at: float
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters describing how the cache has been used.
+
+    Attributes
+    ----------
+    hits : int
+        Lookups served from a fresh entry.
+    stale_hits : int
+        Lookups served from an expired entry while it was being refreshed.
+    misses : int
+        Lookups that found no entry and had to load synchronously.
+    refreshes : int
+        Background refreshes that completed successfully.
+    refresh_errors : int
+        Background refreshes that failed (the stale value was kept).
+    """
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'refresh_errors': self.refresh_errors,
+        }
+
+
+class FeedCache:
+    """
+    TTL cache with stale-while-revalidate semantics.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        Number of seconds an entry stays fresh. If None, the
+        ``FEED_CACHE_TTL`` setting is read on every lookup, falling back to
+        ``DEFAULT_FEED_CACHE_TTL``. A TTL of 0 or less disables caching.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._entries: Dict[str, CacheEntry] = {}
+        # Keys with a background refresh running, and those of them that
+        # must be refreshed again because ``refresh`` was called meanwhile
+        self._refreshing: Set[str] = set()
+        self._rerun: Set[str] = set()
+        # Version of each key's value; every different object stored gets a
+        # number never used before, by any key or before a ``clear``
+        self._versions: Dict[str, int] = {}
+        self._last_version = 0
+        # Number of calls to ``clear``; refreshes started before one are dropped
+        self._generation = 0
+        # Callbacks waiting for the refresh of each key to finish
+        self._on_done: Dict[str, List[Callable[[str], Any]]] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get_ttl(self) -> float:
+        """
+        Return the TTL currently in effect.
+
+        Returns
+        -------
+        float
+            Number of seconds an entry stays fresh.
+        """
+        if self.ttl is not None:
+            return self.ttl
+        return getattr(settings, 'FEED_CACHE_TTL', DEFAULT_FEED_CACHE_TTL)
+
+    def get(self, key: str, loader: Callable[[], Any], on_change: Optional[Callable[[str], Any]] = None) -> Any:
+        """
+        Return the cached value for ``key``, loading it if necessary.
+
+        A missing entry is loaded synchronously and any exception raised by
+        ``loader`` propagates to the caller. An expired entry is returned as
+        is while one background thread calls ``loader`` to replace it.
+
+        Parameters
+        ----------
+        key : str
+            Cache key, e.g. the feed name.
+        loader : callable
+            Zero-argument callable returning a fresh value.
+        on_change : callable, optional
+            Called with ``key`` once a background refresh started by this
+            lookup has stored a different value, e.g. to purge pages built
+            from the old one.
+
+        Returns
+        -------
+        Any
+            The cached or freshly loaded value.
+        """
+        ttl = self.get_ttl()
+        if ttl <= 0:
+            with self._lock:
+                self._stats.misses += 1
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry.fetched_at < ttl:
+                    self._stats.hits += 1
+                    return entry.value
+
+                self._stats.stale_hits += 1
+                if key not in self._refreshing:
+                    self._start_refresh(key, loader, on_change)
+                return entry.value
+
+            self._stats.misses += 1
+
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store ``value`` under ``key`` and mark it fresh.
+
+        Parameters
+        ----------
+        key : str
+            Cache key.
+        value : Any
+            Value to store.
+        """
+        with self._lock:
+            self._store(key, value)
+
+    def version(self, key: str) -> int:
+        """
+        Return a number that changes whenever the value of ``key`` changes.
+
+        Loaders return the same object for as long as their source is
+        unchanged, so only a different object counts as a change. Numbers
+        are not reused, even after ``clear``.
+
+        Parameters
+        ----------
+        key : str
+            Cache key.
+
+        Returns
+        -------
+        int
+            Version of the value, 0 before the first one is stored.
+        """
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def refresh(self, key: str, loader: Callable[[], Any], on_done: Optional[Callable[[str], Any]] = None) -> bool:
+        """
+        Mark the entry for ``key`` stale and reload it in a background thread.
+
+        Until the reload finishes, lookups keep getting the old value. If a
+        refresh of ``key`` is already running, it may have read the upstream
+        before it changed, so one more refresh follows it.
+
+        Parameters
+        ----------
+        key : str
+            Cache key.
+        loader : callable
+            Zero-argument callable returning a fresh value.
+        on_done : callable, optional
+            Called with ``key`` once the last refresh of ``key`` has stored
+            its value (not if it fails), e.g. to purge pages built from it.
+
+        Returns
+        -------
+        bool
+            True if a refresh was started, False if it was queued behind the
+            running one.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.fetched_at = float('-inf')
+            if on_done is not None:
+                self._on_done.setdefault(key, []).append(on_done)
+            if key in self._refreshing:
+                self._rerun.add(key)
+                return False
+            self._start_refresh(key, loader)
+            return True
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drop the entry for ``key`` so the next lookup loads it again.
+
+        Parameters
+        ----------
+        key : str
+            Cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop all entries and per-key state, and reset the counters.
+
+        Refreshes still running finish in the background but their values
+        are discarded, so the next lookup of an expired key starts a new one.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._refreshing.clear()
+            self._rerun.clear()
+            self._on_done.clear()
+            self._generation += 1
+            self._stats = CacheStats()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return a snapshot of the hit/miss counters.
+
+        Returns
+        -------
+        dict
+            Counter name to value.
+        """
+        with self._lock:
+            return self._stats.as_dict()
+
+    def _start_refresh(
+        self, key: str, loader: Callable[[], Any], on_change: Optional[Callable[[str], Any]] = None,
+    ) -> threading.Thread:
+        """Refresh ``key`` in a daemon thread. Must be called with the lock held."""
+        self._refreshing.add(key)
+        thread = threading.Thread(
+            target=self._refresh,
+            args=(key, loader, self._generation, on_change),
+            name=f"feed-cache-refresh-{key}",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _refresh(
+        self, key: str, loader: Callable[[], Any], generation: int, on_change: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        """Load a new value for ``key``, keeping the stale one on failure."""
+        try:
+            value = loader()
+        except Exception as e:
+            logger.error(f"Background refresh of {key} failed, serving stale data: {e}")
+            with self._lock:
+                if generation != self._generation:
+                    return
+                self._stats.refresh_errors += 1
+                if not self._finish_refresh(key, loader):
+                    self._on_done.pop(key, None)
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                logger.debug(f"Dropping refresh of {key} started before the cache was cleared")
+                return
+            version = self._versions.get(key)
+            self._store(key, value)
+            self._stats.refreshes += 1
+            callbacks = [] if self._finish_refresh(key, loader) else self._on_done.pop(key, [])
+            if on_change is not None and self._versions[key] != version:
+                callbacks.append(on_change)
+        for callback in callbacks:
+            try:
+                callback(key)
+            except Exception as e:
+                logger.error(f"Callback after refreshing {key} failed: {e}")
+
+    def _store(self, key: str, value: Any) -> None:
+        """Store ``value`` as fresh. Must be called with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None or entry.value is not value:
+            self._last_version += 1
+            self._versions[key] = self._last_version
+        self._entries[key] = CacheEntry(value=value, fetched_at=time.monotonic())
+
+    def _finish_refresh(self, key: str, loader: Callable[[], Any]) -> bool:
+        """
+        Mark the refresh of ``key`` done, starting a queued one. Must be called with the lock held.
+
+        Returns True if another refresh was started.
+        """
+        self._refreshing.discard(key)
+        if key in self._rerun:
+            self._rerun.discard(key)
+            self._start_refresh(key, loader)
+            return True
+        return False
+
+
+# Process-wide cache shared by the contributor and package feeds
+feed_cache = FeedCache()
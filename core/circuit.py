@@ -0,0 +1,146 @@
+"""
+Circuit breaker for upstream feed hosts.
+
+While raw.githubusercontent.com is down or stalling, every feed refresh
+would tie up a worker until its timeout expires. After
+``FEED_CIRCUIT_FAILURES`` consecutive failures a host's circuit opens and
+requests to it fail immediately with ``CircuitOpenError`` for
+``FEED_CIRCUIT_COOLDOWN`` seconds. After that a single trial request is let
+through: success closes the circuit, failure opens it for another cooldown.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from urllib.error import URLError
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the FEED_CIRCUIT_FAILURES and FEED_CIRCUIT_COOLDOWN settings
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN = 60
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(URLError):
+    """Raised instead of contacting a host whose circuit is open."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Track failures of one upstream and decide whether to call it.
+
+    Parameters
+    ----------
+    name : str
+        Name used in log messages, e.g. the host.
+    failure_threshold : int, optional
+        Consecutive failures that open the circuit. Defaults to the
+        ``FEED_CIRCUIT_FAILURES`` setting.
+    cooldown : float, optional
+        Seconds the circuit stays open. Defaults to the
+        ``FEED_CIRCUIT_COOLDOWN`` setting.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, cooldown: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_failure_threshold(self) -> int:
+        """Return the number of consecutive failures that opens the circuit."""
+        if self.failure_threshold is not None:
+            return self.failure_threshold
+        return getattr(settings, 'FEED_CIRCUIT_FAILURES', DEFAULT_FAILURE_THRESHOLD)
+
+    def get_cooldown(self) -> float:
+        """Return the number of seconds the circuit stays open."""
+        if self.cooldown is not None:
+            return self.cooldown
+        return getattr(settings, 'FEED_CIRCUIT_COOLDOWN', DEFAULT_COOLDOWN)
+
+    def before_call(self) -> None:
+        """
+        Check that a call may be made.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit is open, or half-open with a trial call running.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.get_cooldown():
+                # Let exactly one trial call through
+                self.state = HALF_OPEN
+                return
+            raise CircuitOpenError(f"Circuit for {self.name} is open, not calling it")
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit if there were too many."""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.get_failure_threshold():
+                if self.state != OPEN:
+                    logger.warning(
+                        f"Circuit for {self.name} opened after {self.failures} failures"
+                    )
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """One ``CircuitBreaker`` per upstream host, created on first use."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        """
+        Return the breaker for ``host``.
+
+        Parameters
+        ----------
+        host : str
+            Host name, with port if any.
+
+        Returns
+        -------
+        CircuitBreaker
+            The host's breaker.
+        """
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host)
+            return breaker
+
+    def clear(self) -> None:
+        """Forget all breakers, closing every circuit."""
+        with self._lock:
+            self._breakers.clear()
+
+
+# Process-wide breakers used by core.http.ConditionalFetcher
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,143 @@
+"""
+Validators for conditional GET of blog post and event pages.
+
+A detail page shows the page itself and related pages of the same type,
+rendered with its template. Its validators are derived from:
+
+* the page's own ``last_modified``,
+* its author, shown in the byline and the "About" box: which author it is
+  and the author's ``updated_at``,
+* the version of the related pages: the latest ``last_modified`` and the
+  number of live pages of the type, since any of them may be listed,
+* the version of the templates, a hash of their source.
+
+All of them come from one aggregate query, so a client whose copy is
+current gets a 304 without the page being rendered or its related pages
+queried. The validators are computed once per request and are strong:
+the same validators always mean the same body.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.template.loader import get_template
+
+# Templates every detail page extends besides its own
+BASE_TEMPLATES = ('base.html',)
+
+
+@dataclass(frozen=True)
+class PageValidators:
+    """
+    Conditional GET validators of a detail page.
+
+    Attributes
+    ----------
+    etag : str
+        Strong entity tag, unquoted.
+    last_modified : datetime
+        Latest modification of the page, its author or any page it may
+        list.
+    """
+    etag: str
+    last_modified: datetime
+
+
+def _hash_templates(names) -> str:
+    """Return the SHA-256 of the sources of the templates ``names``."""
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(get_template(name).template.source.encode('utf-8'))
+    return digest.hexdigest()
+
+
+_hash_templates_cached = lru_cache(maxsize=None)(_hash_templates)
+
+
+def template_version(name: str) -> str:
+    """
+    Return a hash of template ``name`` and the base templates.
+
+    Parameters
+    ----------
+    name : str
+        Template of the page type.
+
+    Returns
+    -------
+    str
+        Hex digest; computed once per process unless ``DEBUG`` is on, so
+        that template edits show up during development.
+    """
+    names = (name,) + BASE_TEMPLATES
+    if settings.DEBUG:
+        return _hash_templates(names)
+    return _hash_templates_cached(names)
+
+
+def get_page_validators(request, model, slug: str) -> Optional[PageValidators]:
+    """
+    Return the validators of the live ``model`` page ``slug``.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Incoming request; the result is remembered on it.
+    model : type
+        ``BlogPage`` or ``EventPage``.
+    slug : str
+        Page slug from the URL.
+
+    Returns
+    -------
+    PageValidators or None
+        None if there is no such live page; the view then answers 404.
+    """
+    validators = getattr(request, '_page_validators', None)
+    if validators is not None and validators[0] == (model, slug):
+        return validators[1]
+
+    stats = model.objects.live().aggregate(
+        page=Max('last_modified', filter=Q(slug=slug)),
+        page_author=Max('author', filter=Q(slug=slug)),
+        author_updated=Max('author__updated_at', filter=Q(slug=slug)),
+        latest=Max('last_modified'),
+        count=Count('pk'),
+    )
+    result = None
+    if stats['page'] is not None:
+        author_updated = stats['author_updated']
+        version = "|".join([
+            stats['page'].isoformat(),
+            f"{stats['page_author']}@{author_updated.isoformat() if author_updated else ''}",
+            stats['latest'].isoformat(),
+            str(stats['count']),
+            template_version(model.template),
+        ])
+        result = PageValidators(
+            etag=hashlib.sha256(version.encode('utf-8')).hexdigest(),
+            last_modified=max(filter(None, (stats['latest'], author_updated))),
+        )
+    request._page_validators = ((model, slug), result)
+    return result
+
+
+def page_etag(model) -> Callable:
+    """Return an ``etag_func`` for ``django.views.decorators.http.condition``."""
+    def etag(request, slug):
+        validators = get_page_validators(request, model, slug)
+        return validators.etag if validators is not None else None
+    return etag
+
+
+def page_last_modified(model) -> Callable:
+    """Return a ``last_modified_func`` for ``django.views.decorators.http.condition``."""
+    def last_modified(request, slug):
+        validators = get_page_validators(request, model, slug)
+        return validators.last_modified if validators is not None else None
+    return last_modified
@@ -0,0 +1,145 @@
+"""
+Coordination of feed refreshes between threads and worker processes.
+
+When a feed expires under load, every request that notices would otherwise
+download and parse it. ``SingleFlight`` lets one thread per key do the work
+while the other threads wait for its result, and ``FileLock`` extends that to
+worker processes sharing ``FEED_CACHE_DIR``: the process holding the lock
+refreshes the on-disk copy that the others then reuse.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight call and, once finished, its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time, sharing its outcome.
+
+    Threads calling ``do`` with a key that is already in flight wait for the
+    running call and receive its return value, or its exception.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Call ``func`` unless a call for ``key`` is already running.
+
+        Parameters
+        ----------
+        key : str
+            Identifies the work, e.g. a feed URL.
+        func : callable
+            Zero-argument callable doing the work.
+
+        Returns
+        -------
+        Any
+            The value returned by whichever call ran.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being worked on."""
+        with self._lock:
+            return len(self._calls)
+
+
+class FileLock:
+    """
+    Exclusive advisory lock on a file, shared between processes.
+
+    Used as a context manager. If the lock cannot be taken within ``timeout``
+    seconds the block runs unlocked, so a stuck process can slow the others
+    down but not stop them. Locking is a no-op where ``fcntl`` is missing.
+
+    Parameters
+    ----------
+    path : str or Path
+        Lock file, created if necessary.
+    timeout : float, optional
+        Seconds to wait for the lock; None waits indefinitely.
+    poll_interval : float, default 0.05
+        Seconds between attempts to take the lock.
+    """
+
+    def __init__(self, path, timeout: Optional[float] = None, poll_interval: float = 0.05):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.locked = False
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a+b')
+        except OSError as e:
+            logger.warning(f"Could not open lock file {self.path}: {e}")
+            return self
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self.locked = True
+                return self
+            except BlockingIOError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning(f"Timed out waiting for {self.path}, continuing unlocked")
+                    return self
+                time.sleep(self.poll_interval)
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            if self.locked:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+                self.locked = False
+            self._file.close()
+            self._file = None
+        return False
@@ -0,0 +1,172 @@
+"""
+Cached year facets of the blog and events indexes.
+
+The year dropdown of each index lists the years that have live pages, with
+the number of pages in each. Counting them on every request scans every
+live page, and numbered pagination would count the filtered pages again.
+``YearFacets`` keeps the year-to-count table of each page type in the
+``PAGE_CACHE_ALIAS`` cache, so the views read both the dropdown and the
+total number of pages from one cache lookup.
+
+Publishing, unpublishing or deleting a page increments a generation counter
+of its type shared by all workers (see ``core.shared``), which moves that
+type's facets to a new key; the next request counts again.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+from .shared import shared_feeds
+
+logger = logging.getLogger(__name__)
+
+# Default for the FACET_CACHE_TIMEOUT setting, in seconds
+DEFAULT_FACET_CACHE_TIMEOUT = 86400
+
+# Page model name to the date field its index filters by year
+YEAR_FIELDS = {'blogpage': 'date', 'eventpage': 'start_date'}
+
+
+@dataclass(frozen=True)
+class YearFacet:
+    """
+    Number of live pages of a type in one year.
+
+    Attributes
+    ----------
+    year : int
+        Year of the pages' date.
+    count : int
+        Number of live pages dated that year.
+    """
+    year: int
+    count: int
+
+
+class YearFacets:
+    """
+    Store the year facets of each page type, keyed by a content version.
+
+    Parameters
+    ----------
+    alias : str, optional
+        Django cache to use. Defaults to the ``PAGE_CACHE_ALIAS`` setting,
+        or ``default``.
+    timeout : float, optional
+        Seconds facets are kept. Defaults to the ``FACET_CACHE_TIMEOUT``
+        setting; 0 or less counts on every call.
+    """
+
+    def __init__(self, alias: Optional[str] = None, timeout: Optional[float] = None):
+        self.alias = alias
+        self.timeout = timeout
+
+    def get_timeout(self) -> float:
+        """Return the number of seconds facets are kept."""
+        if self.timeout is not None:
+            return self.timeout
+        return getattr(settings, 'FACET_CACHE_TIMEOUT', DEFAULT_FACET_CACHE_TIMEOUT)
+
+    def get_cache(self):
+        """Return the Django cache holding the facets."""
+        return caches[self.alias or getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+    def _counter(self, model):
+        """Return the generation counter of ``model``'s facets."""
+        return shared_feeds.counter(f"facets-{model._meta.model_name}")
+
+    def key(self, model, before: Optional[date] = None) -> str:
+        """Return the cache key of the current facets of ``model``."""
+        scope = f":{before.isoformat()}" if before is not None else ''
+        return f"facets:{model._meta.model_name}:{self._counter(model).get()}{scope}"
+
+    def get(self, model, before: Optional[date] = None) -> List[YearFacet]:
+        """
+        Return the year facets of ``model``, newest year first.
+
+        Parameters
+        ----------
+        model : type
+            ``BlogPage`` or ``EventPage``.
+        before : date, optional
+            Only count pages dated before this day, e.g. past events.
+
+        Returns
+        -------
+        list of YearFacet
+            One entry per year with live pages.
+        """
+        timeout = self.get_timeout()
+        if timeout <= 0:
+            return self.count(model, before)
+
+        cache = self.get_cache()
+        key = self.key(model, before)
+        facets = cache.get(key)
+        if facets is None:
+            facets = self.count(model, before)
+            cache.set(key, facets, timeout)
+        return facets
+
+    def count(self, model, before: Optional[date] = None) -> List[YearFacet]:
+        """Return the year facets of ``model``, counted from the database."""
+        field = YEAR_FIELDS[model._meta.model_name]
+        pages = model.objects.live()
+        if before is not None:
+            pages = pages.filter(**{f'{field}__lt': before})
+        rows = (
+            pages
+            .annotate(year=ExtractYear(field))
+            .values('year')
+            .annotate(count=Count('pk'))
+            .order_by('-year')
+        )
+        return [YearFacet(row['year'], row['count']) for row in rows]
+
+    def invalidate(self, model) -> int:
+        """
+        Move the facets of ``model`` to a new key, in all workers.
+
+        Returns
+        -------
+        int
+            The new version of the facets.
+        """
+        version = self._counter(model).increment()
+        logger.info(f"Year facets of {model._meta.model_name} moved to version {version}")
+        return version
+
+
+def total(facets: List[YearFacet], year: Optional[int] = None) -> int:
+    """
+    Return the number of pages in ``year``, or in all years.
+
+    Parameters
+    ----------
+    facets : list of YearFacet
+        Facets from ``YearFacets.get``.
+    year : int, optional
+        Year to count; all years if omitted.
+
+    Returns
+    -------
+    int
+        Number of live pages.
+    """
+    return sum(facet.count for facet in facets if year is None or facet.year == year)
+
+
+def invalidate_facets_on_change(sender, instance, **kwargs):
+    """Signal receiver recounting the facets of a published, unpublished or deleted page's type."""
+    year_facets.invalidate(type(instance))
+
+
+# Process-wide facets used by the index views
+year_facets = YearFacets()
@@ -0,0 +1,104 @@
+"""
+Concurrent loading of the contributor and package feeds.
+
+The homepage needs every feed, and a cold feed costs a network round trip
+plus a parse. ``FeedLoader`` runs the loads on a shared thread pool so that
+a page waits for the slowest feed rather than for the sum of all of them,
+either by waiting for a batch (``load``) or by awaiting each load from async
+code (``run``).
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FeedLoader:
+    """
+    Run feed loaders concurrently on a thread pool.
+
+    Parameters
+    ----------
+    max_workers : int, default 4
+        Maximum number of feeds loaded at the same time.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def load(self, loaders: Dict[str, Callable[[], Any]], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Call every loader concurrently and collect the results.
+
+        Parameters
+        ----------
+        loaders : dict
+            Feed name to zero-argument callable returning the feed.
+        timeout : float, optional
+            Seconds to wait for all loaders. Loaders still running after that
+            keep running in the background.
+
+        Returns
+        -------
+        dict
+            Feed name to the loaded value, or to the exception the loader
+            raised (``TimeoutError`` if it did not finish in time).
+        """
+        executor = self._get_executor()
+        futures = {name: executor.submit(loader) for name, loader in loaders.items()}
+        wait(futures.values(), timeout=timeout)
+
+        results = {}
+        for name, future in futures.items():
+            if not future.done():
+                logger.error(f"Loading the {name} feed did not finish in time")
+                results[name] = TimeoutError(f"Loading the {name} feed timed out")
+            elif future.exception() is not None:
+                results[name] = future.exception()
+            else:
+                results[name] = future.result()
+        return results
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Await ``func(*args)`` running on the loader's thread pool.
+
+        Parameters
+        ----------
+        func : callable
+            Blocking function, e.g. ``get_recent_contributors``.
+        *args
+            Arguments passed to ``func``.
+
+        Returns
+        -------
+        Any
+            The value returned by ``func``.
+        """
+        return await asyncio.wrap_future(self._get_executor().submit(func, *args))
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once running loads finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='feed-loader'
+                )
+            return self._executor
+
+
+# Process-wide loader used by core.utils.prefetch_feeds and the home view
+feed_loader = FeedLoader()
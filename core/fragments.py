@@ -0,0 +1,154 @@
+"""
+Versioned fragment cache for the sections of the homepage.
+
+The homepage is made of independent sections (hero, recent contributors,
+recent blog posts, recent packages), each built from its own data. Every
+section is rendered from its own template and cached under a key made of
+its name and the version of that data: the feed version for a feed's card
+list, the latest ``last_modified`` of the live blog posts for the blog
+section. When one source changes only its section gets a new key and is
+rendered again; the others are reused, and their data is not loaded at all.
+
+Versions are read on every request, so they must be cheap. A version of
+None means the data cannot be tracked, and the section is then always
+rendered.
+"""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+logger = logging.getLogger(__name__)
+
+# Default for the FRAGMENT_CACHE_TIMEOUT setting, in seconds
+DEFAULT_FRAGMENT_CACHE_TIMEOUT = 3600
+
+
+@dataclass(frozen=True)
+class Section:
+    """
+    A cacheable part of a page.
+
+    Attributes
+    ----------
+    name : str
+        Section name; the rendered HTML is returned under it.
+    template : str
+        Template rendering the section from the context ``load`` returns.
+    version : callable
+        Coroutine function returning the version of the section's data, or
+        None if it cannot be told.
+    load : callable
+        Coroutine function returning the section's template context.
+    """
+    name: str
+    template: str
+    version: Callable[[], Awaitable[Optional[str]]]
+    load: Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class FragmentCache:
+    """
+    Store rendered sections by name and data version.
+
+    Parameters
+    ----------
+    alias : str, optional
+        Django cache to use. Defaults to the ``PAGE_CACHE_ALIAS`` setting,
+        or ``default``.
+    timeout : float, optional
+        Seconds a section is kept. Defaults to the ``FRAGMENT_CACHE_TIMEOUT``
+        setting; 0 or less disables the fragment cache.
+    """
+
+    def __init__(self, alias: Optional[str] = None, timeout: Optional[float] = None):
+        self.alias = alias
+        self.timeout = timeout
+
+    def get_timeout(self) -> float:
+        """Return the number of seconds a section is kept."""
+        if self.timeout is not None:
+            return self.timeout
+        return getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', DEFAULT_FRAGMENT_CACHE_TIMEOUT)
+
+    def get_cache(self):
+        """Return the Django cache holding the sections."""
+        return caches[self.alias or getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+    def key(self, name: str, version: str) -> str:
+        """
+        Return the cache key of section ``name`` at ``version``.
+
+        Parameters
+        ----------
+        name : str
+            Section name.
+        version : str
+            Version of the section's data.
+
+        Returns
+        -------
+        str
+            Cache key.
+        """
+        digest = hashlib.sha256(version.encode('utf-8')).hexdigest()
+        return f"fragments:{name}:{digest}"
+
+    async def render(self, sections: Sequence[Section]) -> Tuple[Dict[str, SafeString], Dict[str, Any]]:
+        """
+        Return the HTML of each section, rendering only those not cached.
+
+        The data of the sections to render is loaded concurrently.
+
+        Parameters
+        ----------
+        sections : sequence of Section
+            Sections of the page.
+
+        Returns
+        -------
+        tuple of (dict, dict)
+            HTML by section name, and the merged context of the sections that
+            were rendered.
+        """
+        keys: List[Optional[str]] = [None] * len(sections)
+        cached: Dict[str, str] = {}
+        if self.get_timeout() > 0:
+            versions = await asyncio.gather(*(section.version() for section in sections))
+            keys = [
+                self.key(section.name, version) if version is not None else None
+                for section, version in zip(sections, versions)
+            ]
+            cached = await self.get_cache().aget_many([key for key in keys if key is not None])
+
+        html: Dict[str, SafeString] = {}
+        missing = []
+        for section, key in zip(sections, keys):
+            if key in cached:
+                html[section.name] = mark_safe(cached[key])
+            else:
+                missing.append((section, key))
+
+        contexts = await asyncio.gather(*(section.load() for section, _ in missing))
+        context: Dict[str, Any] = {}
+        rendered: Dict[str, str] = {}
+        for (section, key), section_context in zip(missing, contexts):
+            html[section.name] = mark_safe(render_to_string(section.template, section_context))
+            context.update(section_context)
+            if key is not None:
+                rendered[key] = str(html[section.name])
+        if rendered:
+            await self.get_cache().aset_many(rendered, self.get_timeout())
+            logger.debug(f"Rendered sections {[section.name for section, _ in missing]}")
+        return html, context
+
+
+# Process-wide fragment cache used by the homepage
+fragment_cache = FragmentCache()
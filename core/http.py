@@ -0,0 +1,646 @@
+"""
+Conditional HTTP fetching for the contributor and package feeds.
+
+Feeds are downloaded with ``If-None-Match`` / ``If-Modified-Since`` validators
+and ``Accept-Encoding: gzip`` over keep-alive connections that are reused for
+later requests to the same host. The last response body and its validators are
+stored on disk (in ``FEED_CACHE_DIR``) so that they survive restarts; each body
+is named after its content hash and only the metadata pointing to it is
+replaced, so a reader never pairs a new body with old metadata. The parsed
+result is remembered in memory so that a ``304 Not Modified`` response does
+not have to be parsed again. Parsed results can also be snapshotted to
+disk (see ``core.snapshot``) so that other workers skip the parse too.
+
+``fetch_parsed`` runs at most one refresh per feed at a time: threads of a
+process share one call (``core.coordination.SingleFlight``) and processes
+take turns through a lock file, reusing a copy another process fetched less
+than ``max_age`` seconds ago instead of contacting the server again.
+"""
+
+import contextlib
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import logging
+import os
+import ssl
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, replace
+from email.message import Message
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request
+
+from django.conf import settings
+
+from .circuit import circuit_breakers
+from .coordination import FileLock, SingleFlight
+from .snapshot import MISSING, SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# Seconds a process waits for another one to finish refreshing a feed
+REFRESH_LOCK_TIMEOUT = 60
+
+# A socket timeout in seconds, or a (connect, read) pair
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of a conditional fetch.
+
+    Attributes
+    ----------
+    url : str
+        The URL that was fetched.
+    body : bytes
+        The (decompressed) response body, or the stored body after a 304.
+    etag : str or None
+        ``ETag`` validator returned by the server.
+    last_modified : str or None
+        ``Last-Modified`` validator returned by the server.
+    content_hash : str
+        SHA-256 hex digest of ``body``.
+    not_modified : bool
+        True if the server answered ``304 Not Modified``.
+    bytes_transferred : int
+        Number of body bytes received over the network (compressed size).
+    fetched_at : float
+        ``time.time()`` of the last contact with the server about this body.
+    """
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    not_modified: bool = False
+    bytes_transferred: int = 0
+    fetched_at: float = 0.0
+
+    @property
+    def text(self) -> str:
+        """Return the body decoded as UTF-8."""
+        return self.body.decode('utf-8')
+
+
+@dataclass
+class PooledResponse:
+    """
+    A fully read HTTP response.
+
+    Attributes
+    ----------
+    url : str
+        The URL that produced the response, after redirects.
+    status : int
+        HTTP status code.
+    headers : email.message.Message
+        Response headers.
+    body : bytes
+        Response body, as sent (not decompressed).
+    """
+    url: str
+    status: int
+    headers: Message
+    body: bytes
+
+    def read(self) -> bytes:
+        """Return the response body."""
+        return self.body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections, reused for requests to the same host.
+
+    ``urlopen`` takes the place of ``urllib.request.urlopen`` for feed
+    fetches: it follows redirects and raises ``HTTPError`` for non-2xx
+    statuses (including 304) and ``URLError`` for network failures. The body
+    is read completely before the connection is returned to the pool.
+
+    Parameters
+    ----------
+    max_idle_per_host : int, default 4
+        Number of idle connections kept open per host.
+    max_redirects : int, default 5
+        Number of redirects followed before giving up.
+    """
+
+    def __init__(self, max_idle_per_host: int = 4, max_redirects: int = 5):
+        self.max_idle_per_host = max_idle_per_host
+        self.max_redirects = max_redirects
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = None
+
+    def urlopen(self, request: Request, timeout: Timeout = None) -> PooledResponse:
+        """
+        Send ``request`` and return the complete response.
+
+        Parameters
+        ----------
+        request : urllib.request.Request
+            Request to send.
+        timeout : float or tuple of float, optional
+            Socket timeout in seconds, or a ``(connect, read)`` pair. The read
+            timeout applies to each socket read.
+
+        Returns
+        -------
+        PooledResponse
+            The 2xx response.
+
+        Raises
+        ------
+        urllib.error.HTTPError
+            If the final response is not 2xx.
+        urllib.error.URLError
+            If the request fails or times out.
+        """
+        url = request.full_url
+        # Request stores names capitalized ("Accept-encoding"); send them as
+        # urllib does
+        headers = {name.title(): value for name, value in request.header_items()}
+        for _ in range(self.max_redirects + 1):
+            response = self._send(url, request.get_method(), headers, timeout)
+            location = response.headers.get('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            if not 200 <= response.status < 300:
+                raise HTTPError(
+                    url, response.status, http.client.responses.get(response.status, ''),
+                    response.headers, io.BytesIO(response.body),
+                )
+            return response
+        raise URLError(f"Too many redirects fetching {request.full_url}")
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _send(self, url: str, method: str, headers: Dict[str, str], timeout: Timeout) -> PooledResponse:
+        """Send one request, retrying once if a reused connection was closed."""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise URLError(f"Unsupported URL scheme: {url}")
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or '/'
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        while True:
+            connection, reused = self._acquire(key, connect_timeout)
+            try:
+                if connection.sock is None:
+                    connection.connect()
+                connection.sock.settimeout(read_timeout)
+                connection.request(method, path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                # The server may have dropped an idle keep-alive connection
+                if reused and not isinstance(e, TimeoutError):
+                    continue
+                raise URLError(e)
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return PooledResponse(url=url, status=response.status, headers=response.headers, body=body)
+
+    def _acquire(self, key: Tuple[str, str], timeout: Optional[float]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection for ``key`` or a new one, and whether it was reused."""
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        if connection is not None:
+            return connection, True
+
+        scheme, netloc = key
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(netloc, timeout=timeout, context=self._ssl_context), False
+        return http.client.HTTPConnection(netloc, timeout=timeout), False
+
+    def _release(self, key: Tuple[str, str], connection: http.client.HTTPConnection) -> None:
+        """Return ``connection`` to the idle pool, closing it if the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+
+class ConditionalFetcher:
+    """
+    Fetch URLs with HTTP validators, caching bodies on disk.
+
+    Parameters
+    ----------
+    cache_dir : str or Path, optional
+        Directory where bodies and validators are stored. If None, the
+        ``FEED_CACHE_DIR`` setting is used; if that is also unset, validators
+        are only kept in memory.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._results: Dict[str, FetchResult] = {}
+        self._parsed: Dict[str, Tuple[str, Any]] = {}
+        self._flights = SingleFlight()
+        self.snapshots = SnapshotStore(cache_dir)
+
+    def get_cache_dir(self) -> Optional[Path]:
+        """
+        Return the directory used for on-disk storage.
+
+        Returns
+        -------
+        Path or None
+            Cache directory, or None if disk storage is disabled.
+        """
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            cache_dir = getattr(settings, 'FEED_CACHE_DIR', None)
+        return Path(cache_dir) if cache_dir else None
+
+    def fetch(self, url: str, timeout: Timeout = None) -> FetchResult:
+        """
+        Fetch ``url``, sending validators from the previous response.
+
+        Network errors, timeouts and 5xx responses count as failures of the
+        host's circuit breaker; while it is open the host is not contacted.
+
+        Parameters
+        ----------
+        url : str
+            URL to fetch.
+        timeout : float or tuple of float, optional
+            Socket timeout in seconds, or a ``(connect, read)`` pair; None
+            waits indefinitely.
+
+        Returns
+        -------
+        FetchResult
+            The fresh body, or the stored body if the server answered 304.
+
+        Raises
+        ------
+        core.circuit.CircuitOpenError
+            If the host's circuit is open.
+        urllib.error.URLError
+            If the request fails, including HTTP error statuses.
+        """
+        previous = self._get_previous(url)
+
+        headers = {'Accept-Encoding': 'gzip'}
+        if previous is not None:
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+
+        breaker = circuit_breakers.get(urlsplit(url).netloc)
+        breaker.before_call()
+        try:
+            with connection_pool.urlopen(Request(url, headers=headers), timeout=timeout) as response:
+                raw = response.read()
+                response_headers = response.headers
+        except HTTPError as e:
+            if e.code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if e.code == 304 and previous is not None:
+                logger.info(f"{url} not modified, reusing stored copy")
+                result = FetchResult(
+                    url=url,
+                    body=previous.body,
+                    etag=e.headers.get('ETag') or previous.etag,
+                    last_modified=e.headers.get('Last-Modified') or previous.last_modified,
+                    content_hash=previous.content_hash,
+                    not_modified=True,
+                    fetched_at=time.time(),
+                )
+                with self._lock:
+                    self._results[url] = result
+                self._store(result, body=False)
+                return result
+            raise
+        except URLError:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+
+        body = raw
+        if response_headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(raw)
+
+        result = FetchResult(
+            url=url,
+            body=body,
+            etag=response_headers.get('ETag'),
+            last_modified=response_headers.get('Last-Modified'),
+            content_hash=hashlib.sha256(body).hexdigest(),
+            bytes_transferred=len(raw),
+            fetched_at=time.time(),
+        )
+        with self._lock:
+            self._results[url] = result
+        self._store(result)
+        return result
+
+    def fetch_parsed(
+        self,
+        url: str,
+        parse: Callable[[str], Any],
+        cache_key: Optional[str] = None,
+        snapshot_version: Optional[str] = None,
+        timeout: Timeout = None,
+        max_age: Optional[float] = None,
+    ) -> Any:
+        """
+        Fetch ``url`` and parse it, skipping the parse if the body is unchanged.
+
+        Concurrent calls with the same ``cache_key`` share one fetch and
+        parse. Across processes, the refresh of ``url`` is serialized with a
+        lock file in the cache directory. If the server cannot be reached,
+        the last good copy (from memory or disk) is used instead.
+
+        Parameters
+        ----------
+        url : str
+            URL to fetch.
+        parse : callable
+            Called with the decoded body when it has changed since the last
+            successful parse.
+        cache_key : str, optional
+            Key under which the parsed result is remembered. Callers that
+            parse the same URL into different shapes pass distinct keys.
+            Defaults to ``url``.
+        snapshot_version : str, optional
+            Schema version of the parsed result. If given, the result is
+            snapshotted to disk and later loaded from there instead of being
+            parsed, as long as the body and version are unchanged.
+        timeout : float or tuple of float, optional
+            Socket timeout in seconds, or a ``(connect, read)`` pair; None
+            waits indefinitely.
+        max_age : float, optional
+            If the stored copy (from this or another process) was fetched
+            less than ``max_age`` seconds ago, use it without contacting the
+            server. By default the server is always asked.
+
+        Returns
+        -------
+        Any
+            The parsed body.
+        """
+        cache_key = cache_key or url
+        return self._flights.do(
+            cache_key,
+            lambda: self._fetch_parsed(url, parse, cache_key, snapshot_version, timeout, max_age),
+        )
+
+    def _fetch_parsed(self, url, parse, cache_key, snapshot_version, timeout, max_age):
+        """Do the work of ``fetch_parsed`` while holding the refresh lock."""
+        with self._refresh_lock(url):
+            result = self._get_fresh(url, max_age) or self._fetch_or_last_good(url, timeout)
+
+            with self._lock:
+                parsed = self._parsed.get(cache_key)
+            if parsed is not None and parsed[0] == result.content_hash:
+                return parsed[1]
+
+            data = MISSING
+            if snapshot_version is not None:
+                data = self.snapshots.load(cache_key, result.content_hash, snapshot_version)
+            if data is MISSING:
+                data = parse(result.text)
+                if snapshot_version is not None:
+                    self.snapshots.save(cache_key, result.content_hash, snapshot_version, data)
+
+        with self._lock:
+            self._parsed[cache_key] = (result.content_hash, data)
+        return data
+
+    def forget_parsed(self, data: Any) -> None:
+        """
+        Stop keeping ``data``, a result of ``fetch_parsed``, in memory.
+
+        For callers that keep the parsed data elsewhere. The next fetch of
+        the same body loads it from its snapshot or parses it again.
+
+        Parameters
+        ----------
+        data : Any
+            Parsed data returned by ``fetch_parsed``.
+        """
+        with self._lock:
+            for cache_key, (_, parsed) in list(self._parsed.items()):
+                if parsed is data:
+                    del self._parsed[cache_key]
+
+    def expire(self, url: str) -> None:
+        """
+        Make the next fetch of ``url`` ask the server, whatever its ``max_age``.
+
+        The stored copy is kept, with its validators, so the server can
+        still answer 304 if nothing changed. Expiring the copy on disk too
+        stops other processes from reusing it as fresh.
+
+        Parameters
+        ----------
+        url : str
+            URL whose stored copy is out of date.
+        """
+        with self._lock:
+            result = self._results.get(url)
+            if result is not None:
+                self._results[url] = replace(result, fetched_at=0.0)
+
+        stored = self._load_stored(url)
+        if stored is not None:
+            stored.fetched_at = 0.0
+            self._store(stored, body=False)
+
+    def clear(self) -> None:
+        """Forget everything held in memory (files on disk are kept)."""
+        with self._lock:
+            self._results.clear()
+            self._parsed.clear()
+
+    def _meta_path(self, url: str) -> Optional[Path]:
+        """Return the path of the metadata stored for ``url``."""
+        cache_dir = self.get_cache_dir()
+        if cache_dir is None:
+            return None
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return cache_dir / f"{name}.json"
+
+    @staticmethod
+    def _body_path(meta_path: Path, content_hash: str) -> Path:
+        """Return the path of the body with ``content_hash`` next to ``meta_path``."""
+        return meta_path.with_name(f"{meta_path.stem}.{content_hash}.body")
+
+    def _fetch_or_last_good(self, url: str, timeout: Timeout) -> FetchResult:
+        """Fetch ``url``, falling back to the last good copy if that fails."""
+        try:
+            return self.fetch(url, timeout=timeout)
+        except URLError as e:
+            if isinstance(e, HTTPError) and e.code < 500:
+                raise
+            previous = self._get_previous(url)
+            if previous is None:
+                raise
+            logger.warning(f"Could not fetch {url}, using last good copy: {e}")
+            return previous
+
+    def _refresh_lock(self, url: str) -> contextlib.AbstractContextManager:
+        """Return the cross-process lock guarding refreshes of ``url``."""
+        cache_dir = self.get_cache_dir()
+        if cache_dir is None:
+            return contextlib.nullcontext()
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return FileLock(cache_dir / 'locks' / f"{name}.lock", timeout=REFRESH_LOCK_TIMEOUT)
+
+    def _get_fresh(self, url: str, max_age: Optional[float]) -> Optional[FetchResult]:
+        """Return a copy of ``url`` fetched less than ``max_age`` seconds ago."""
+        if not max_age or max_age <= 0:
+            return None
+        with self._lock:
+            candidates = [self._results.get(url)]
+        # Another process may have refreshed the copy on disk
+        candidates.append(self._load_stored(url))
+        fresh = [c for c in candidates if c is not None and time.time() - c.fetched_at < max_age]
+        if not fresh:
+            return None
+
+        result = max(fresh, key=lambda c: c.fetched_at)
+        with self._lock:
+            self._results[url] = result
+        return result
+
+    def _get_previous(self, url: str) -> Optional[FetchResult]:
+        """Return the last result for ``url`` from memory or disk."""
+        with self._lock:
+            previous = self._results.get(url)
+        if previous is not None:
+            return previous
+
+        previous = self._load_stored(url)
+        if previous is not None:
+            with self._lock:
+                self._results.setdefault(url, previous)
+        return previous
+
+    def _load_stored(self, url: str) -> Optional[FetchResult]:
+        """Read the stored copy of ``url`` from disk, if there is a valid one."""
+        meta_path = self._meta_path(url)
+        if meta_path is None:
+            return None
+        # A writer may replace the metadata and remove the body it pointed to
+        # between the two reads; the new metadata then names a new body
+        for attempt in range(2):
+            try:
+                meta = json.loads(meta_path.read_text())
+                body = self._body_path(meta_path, meta['content_hash']).read_bytes()
+                break
+            except FileNotFoundError:
+                if attempt:
+                    return None
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+
+        if hashlib.sha256(body).hexdigest() != meta.get('content_hash'):
+            logger.warning(f"Ignoring corrupt cached copy of {url}")
+            return None
+
+        return FetchResult(
+            url=url,
+            body=body,
+            etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'),
+            content_hash=meta['content_hash'],
+            fetched_at=meta.get('fetched_at', 0.0),
+        )
+
+    def _store(self, result: FetchResult, body: bool = True) -> None:
+        """
+        Write ``result`` (or, if the body is stored already, only its metadata) to disk.
+
+        The body is written under its content hash before the metadata is
+        replaced, so the rename of the metadata publishes the new copy in one
+        step; the body the old metadata pointed to is removed afterwards.
+        """
+        meta_path = self._meta_path(result.url)
+        if meta_path is None:
+            return
+        body_path = self._body_path(meta_path, result.content_hash)
+        try:
+            previous_hash = json.loads(meta_path.read_text()).get('content_hash')
+        except (OSError, ValueError, AttributeError):
+            previous_hash = None
+        meta = {
+            'url': result.url,
+            'etag': result.etag,
+            'last_modified': result.last_modified,
+            'content_hash': result.content_hash,
+            'fetched_at': result.fetched_at,
+        }
+        try:
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            if body or not body_path.exists():
+                _atomic_write(body_path, result.body)
+            _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not store {result.url} in feed cache: {e}")
+            return
+
+        if previous_hash and previous_hash != result.content_hash:
+            with contextlib.suppress(OSError):
+                self._body_path(meta_path, previous_hash).unlink()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a temporary file and rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Process-wide connection pool and fetcher used by the feed helpers in core.utils
+connection_pool = ConnectionPool()
+feed_fetcher = ConditionalFetcher()
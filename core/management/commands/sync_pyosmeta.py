@@ -0,0 +1,224 @@
+from dataclasses import dataclass
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import Contributor, Package
+from core.normalize import content_hash, contributor_fields, package_fields
+from core.shared import shared_feeds
+from core.surrogate import feed_key, purge_dispatcher
+from core.utils import (
+    SYNC_COUNTER,
+    ContributorDataError,
+    PackageDataError,
+    fetch_contributors_yaml,
+    fetch_packages_yaml,
+)
+
+
+# Largest share of a table's rows a sync may delete without --force
+DEFAULT_MAX_DELETE_FRACTION = 0.5
+
+
+class UnsafeDeleteError(Exception):
+    """Raised when a sync would delete too many rows, e.g. after a truncated feed."""
+    pass
+
+
+@dataclass
+class SyncStats:
+    """Row counts for one synced model."""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    skipped: int = 0
+
+    def __str__(self):
+        return (
+            f"{self.inserted} inserted, {self.updated} updated, "
+            f"{self.unchanged} unchanged, {self.deleted} deleted, "
+            f"{self.skipped} skipped"
+        )
+
+
+def upsert_records(model, key, records, normalize, batch_size=500, delete_missing=True,
+                   max_delete_fraction=DEFAULT_MAX_DELETE_FRACTION, force=False):
+    """
+    Bulk-upsert YAML records into ``model``, skipping unchanged rows.
+
+    Existing rows are looked up with a single query of ``(key, content_hash)``
+    pairs. Only new or changed records are written, with
+    ``bulk_create(update_conflicts=True)`` in batches of ``batch_size``. Rows
+    whose key no longer appears in ``records`` are deleted, unless the feed
+    is empty or more than ``max_delete_fraction`` of the rows would go; an
+    empty or truncated upstream file then raises instead of emptying the
+    table.
+
+    Parameters
+    ----------
+    model : type
+        ``Contributor`` or ``Package``.
+    key : str
+        Name of the unique field identifying a record.
+    records : list of dict
+        Raw YAML records.
+    normalize : callable
+        Maps a raw record onto model field values.
+    batch_size : int, default 500
+        Number of rows per INSERT statement.
+    delete_missing : bool, default True
+        Whether to delete rows that are no longer in the feed.
+    max_delete_fraction : float, default 0.5
+        Largest share of the existing rows that may be deleted.
+    force : bool, default False
+        Delete missing rows even if the feed is empty or more than
+        ``max_delete_fraction`` of the rows would go.
+
+    Returns
+    -------
+    SyncStats
+        Counts of inserted, updated, unchanged, deleted and skipped rows.
+
+    Raises
+    ------
+    UnsafeDeleteError
+        If rows would be deleted from an empty feed, or too many would be,
+        and ``force`` is not set. Nothing is written.
+    """
+    stats = SyncStats()
+
+    # Later duplicates win, matching how the YAML would be read top to bottom
+    rows = {}
+    for record in records:
+        if not isinstance(record, dict):
+            stats.skipped += 1
+            continue
+        fields = normalize(record)
+        if not fields.get(key):
+            stats.skipped += 1
+            continue
+        fields['content_hash'] = content_hash(fields)
+        rows[fields[key]] = fields
+
+    existing = dict(model.objects.order_by().values_list(key, 'content_hash'))
+
+    missing = [value for value in existing if value not in rows] if delete_missing else []
+    if missing and not force:
+        if not rows:
+            raise UnsafeDeleteError(
+                f"The {model._meta.verbose_name} feed is empty; refusing to delete all {len(existing)} rows"
+            )
+        if len(missing) > max_delete_fraction * len(existing):
+            raise UnsafeDeleteError(
+                f"Refusing to delete {len(missing)} of {len(existing)} {model._meta.verbose_name_plural} "
+                f"(more than {max_delete_fraction:.0%})"
+            )
+
+    changed = []
+    for value, fields in rows.items():
+        current_hash = existing.get(value)
+        if current_hash is None:
+            stats.inserted += 1
+        elif current_hash != fields['content_hash']:
+            stats.updated += 1
+        else:
+            stats.unchanged += 1
+            continue
+        changed.append(model(**fields))
+
+    if changed:
+        # auto_now_add fields keep their original value on update
+        update_fields = [
+            f.name for f in model._meta.concrete_fields
+            if not f.primary_key and f.name != key and not getattr(f, 'auto_now_add', False)
+        ]
+        model.objects.bulk_create(
+            changed,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=[key],
+            update_fields=update_fields,
+        )
+
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        stats.deleted += model.objects.filter(**{f'{key}__in': batch}).delete()[0]
+
+    return stats
+
+
+class Command(BaseCommand):
+    help = "Sync contributors and packages from the pyosMeta YAML feeds into the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--contributors-url',
+            help='URL of contributors.yml (default: the pyOpenSci GitHub copy)'
+        )
+        parser.add_argument(
+            '--packages-url',
+            help='URL of packages.yml (default: the pyOpenSci GitHub copy)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows written per query (default: 500)'
+        )
+        parser.add_argument(
+            '--keep-missing',
+            action='store_true',
+            help='Keep database rows that no longer appear in the YAML feeds'
+        )
+        parser.add_argument(
+            '--max-delete-fraction',
+            type=float,
+            default=DEFAULT_MAX_DELETE_FRACTION,
+            help='Largest share of rows a sync may delete (default: 0.5)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Delete missing rows even if a feed is empty or most rows would go'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            contributors = fetch_contributors_yaml(options['contributors_url'])
+            packages = fetch_packages_yaml(options['packages_url'])
+        except (ContributorDataError, PackageDataError) as e:
+            raise CommandError(f"Could not fetch pyosMeta data: {e}")
+
+        batch_size = options['batch_size']
+
+        delete_options = {
+            'delete_missing': not options['keep_missing'],
+            'max_delete_fraction': options['max_delete_fraction'],
+            'force': options['force'],
+        }
+
+        # One transaction so the site never sees a half-synced state
+        try:
+            with transaction.atomic():
+                contributor_stats = upsert_records(
+                    Contributor, 'github_username', contributors, contributor_fields,
+                    batch_size=batch_size, **delete_options,
+                )
+                package_stats = upsert_records(
+                    Package, 'package_name', packages, package_fields,
+                    batch_size=batch_size, **delete_options,
+                )
+        except UnsafeDeleteError as e:
+            raise CommandError(f"{e}. Nothing was synced; use --force to delete them anyway.")
+
+        # Pages built from the tables are cached by this version
+        if any(
+            stats.inserted or stats.updated or stats.deleted
+            for stats in (contributor_stats, package_stats)
+        ):
+            shared_feeds.counter(SYNC_COUNTER).increment()
+            purge_dispatcher.purge_on_commit([feed_key('contributors'), feed_key('packages')])
+
+        self.stdout.write(self.style.SUCCESS(f'Contributors: {contributor_stats}'))
+        self.stdout.write(self.style.SUCCESS(f'Packages: {package_stats}'))
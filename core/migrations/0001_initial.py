@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-14 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Contributor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=255, null=True)),
+                ('github_username', models.CharField(max_length=100, unique=True)),
+                ('github_image_id', models.IntegerField(blank=True, null=True)),
+                ('bio', models.TextField(blank=True, null=True)),
+                ('organization', models.CharField(blank=True, max_length=255, null=True)),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('date_added', models.DateField(blank=True, null=True)),
+                ('deia_advisory', models.BooleanField(default=False)),
+                ('editorial_board', models.BooleanField(default=False)),
+                ('emeritus_editor', models.BooleanField(default=False)),
+                ('advisory', models.BooleanField(default=False)),
+                ('emeritus_advisory', models.BooleanField(default=False)),
+                ('board', models.BooleanField(default=False)),
+                ('twitter', models.CharField(blank=True, max_length=50, null=True)),
+                ('mastodon', models.URLField(blank=True, null=True)),
+                ('orcidid', models.CharField(blank=True, max_length=50, null=True)),
+                ('website', models.URLField(blank=True, null=True)),
+                ('title', models.JSONField(blank=True, default=list)),
+                ('partners', models.JSONField(blank=True, default=list)),
+                ('contributor_type', models.JSONField(blank=True, default=list)),
+                ('packages_eic', models.JSONField(blank=True, default=list)),
+                ('packages_editor', models.JSONField(blank=True, default=list)),
+                ('packages_submitted', models.JSONField(blank=True, default=list)),
+                ('packages_reviewed', models.JSONField(blank=True, default=list)),
+                ('sort', models.IntegerField(blank=True, null=True)),
+                ('content_hash', models.CharField(blank=True, help_text='Hash of the YAML record, used to skip unchanged rows on sync', max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Contributor',
+                'verbose_name_plural': 'Contributors',
+                'ordering': ['-date_added', 'sort', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Package',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('package_name', models.CharField(max_length=255, unique=True)),
+                ('package_description', models.TextField(blank=True, null=True)),
+                ('repository_link', models.URLField(blank=True, null=True)),
+                ('version_submitted', models.CharField(blank=True, max_length=100, null=True)),
+                ('version_accepted', models.CharField(blank=True, max_length=100, null=True)),
+                ('date_accepted', models.CharField(blank=True, max_length=50, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('closed_at', models.DateTimeField(blank=True, null=True)),
+                ('issue_link', models.URLField(blank=True, null=True)),
+                ('archive', models.URLField(blank=True, null=True)),
+                ('joss', models.URLField(blank=True, null=True)),
+                ('active', models.BooleanField(default=True)),
+                ('submitting_author', models.JSONField(blank=True, default=dict)),
+                ('all_current_maintainers', models.JSONField(blank=True, default=list)),
+                ('categories', models.JSONField(blank=True, default=list)),
+                ('editor', models.JSONField(blank=True, default=dict)),
+                ('eic', models.JSONField(blank=True, default=dict)),
+                ('reviewers', models.JSONField(blank=True, default=list)),
+                ('partners', models.JSONField(blank=True, default=list)),
+                ('labels', models.JSONField(blank=True, default=list)),
+                ('gh_meta', models.JSONField(blank=True, default=dict)),
+                ('content_hash', models.CharField(blank=True, help_text='Hash of the YAML record, used to skip unchanged rows on sync', max_length=64)),
+                ('django_created_at', models.DateTimeField(auto_now_add=True)),
+                ('django_updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Package',
+                'verbose_name_plural': 'Packages',
+                'ordering': ['-date_accepted', 'package_name'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-14 23:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contributor',
+            name='date_added',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='package',
+            name='date_accepted',
+            field=models.CharField(blank=True, db_index=True, max_length=50, null=True),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from django.db import migrations, models
+
+# Layouts the string column may hold; kept here so the migration does not
+# depend on application code that may change later
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%m-%d-%Y')
+
+
+def parse_accepted_date(value):
+    """Parse a stored date_accepted string, returning None if unparseable."""
+    if not value:
+        return None
+    text = str(value).strip().replace('T', ' ').split(' ', 1)[0]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def copy_dates_forward(apps, schema_editor):
+    Package = apps.get_model('core', 'Package')
+    packages = list(Package.objects.exclude(date_accepted_text=None).only('pk', 'date_accepted_text'))
+    for package in packages:
+        package.date_accepted = parse_accepted_date(package.date_accepted_text)
+    Package.objects.bulk_update(packages, ['date_accepted'], batch_size=500)
+
+
+def copy_dates_backward(apps, schema_editor):
+    Package = apps.get_model('core', 'Package')
+    packages = list(Package.objects.exclude(date_accepted=None).only('pk', 'date_accepted'))
+    for package in packages:
+        package.date_accepted_text = package.date_accepted.isoformat()
+    Package.objects.bulk_update(packages, ['date_accepted_text'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_recency_indexes'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='package',
+            old_name='date_accepted',
+            new_name='date_accepted_text',
+        ),
+        migrations.AlterField(
+            model_name='package',
+            name='date_accepted_text',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='date_accepted',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(copy_dates_forward, copy_dates_backward),
+        migrations.RemoveField(
+            model_name='package',
+            name='date_accepted_text',
+        ),
+    ]
@@ -20,7 +20,7 @@ class Contributor(models.Model):
     email = models.EmailField(null=True, blank=True)
     
     # Dates
-    date_added = models.DateField(null=True, blank=True)
+    date_added = models.DateField(null=True, blank=True, db_index=True)
     
     # Role flags
     deia_advisory = models.BooleanField(default=False)
@@ -47,6 +47,11 @@ class Contributor(models.Model):
     
     # Metadata
     sort = models.IntegerField(null=True, blank=True)
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the YAML record, used to skip unchanged rows on sync"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -106,14 +111,14 @@ class Package(models.Model):
     """
     
     # Basic package information
-    package_name = models.CharField(max_length=255)
+    package_name = models.CharField(max_length=255, unique=True)
     package_description = models.TextField(null=True, blank=True)
     repository_link = models.URLField(null=True, blank=True)
     version_submitted = models.CharField(max_length=100, null=True, blank=True)
     version_accepted = models.CharField(max_length=100, null=True, blank=True)
     
-    # Dates (stored as strings to match YAML format)
-    date_accepted = models.CharField(max_length=50, null=True, blank=True)
+    # Dates
+    date_accepted = models.DateField(null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(null=True, blank=True)
     closed_at = models.DateTimeField(null=True, blank=True)
@@ -138,6 +143,11 @@ class Package(models.Model):
     gh_meta = models.JSONField(default=dict, blank=True)
     
     # Django metadata
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the YAML record, used to skip unchanged rows on sync"
+    )
     django_created_at = models.DateTimeField(auto_now_add=True)
     django_updated_at = models.DateTimeField(auto_now=True)
     
@@ -0,0 +1,311 @@
+"""
+Normalization of pyosMeta YAML records into model field values.
+
+The contributors.yml and packages.yml feeds are loosely typed: dates may be
+strings or ``date`` objects, list fields are sometimes missing or scalars and
+optional values are often empty strings. The helpers here turn a raw YAML
+record into a dictionary of clean values keyed by ``Contributor`` /
+``Package`` field name, plus a stable content hash used to skip unchanged rows.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from django.utils.dateparse import parse_datetime
+
+# Date layouts seen in the YAML feeds; strptime also accepts unpadded
+# months and days, so "2024-1-5" parses like "2024-01-05"
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%m-%d-%Y')
+
+# Contributor model fields, grouped by how their YAML values are cleaned
+CONTRIBUTOR_TEXT_FIELDS = [
+    'name', 'github_username', 'bio', 'organization', 'location', 'email',
+    'twitter', 'mastodon', 'orcidid', 'website',
+]
+CONTRIBUTOR_BOOLEAN_FIELDS = [
+    'deia_advisory', 'editorial_board', 'emeritus_editor', 'advisory',
+    'emeritus_advisory', 'board',
+]
+CONTRIBUTOR_LIST_FIELDS = [
+    'title', 'partners', 'contributor_type', 'packages_eic', 'packages_editor',
+    'packages_submitted', 'packages_reviewed',
+]
+
+# Package model fields, grouped by how their YAML values are cleaned
+PACKAGE_TEXT_FIELDS = [
+    'package_name', 'package_description', 'repository_link',
+    'version_submitted', 'version_accepted', 'issue_link', 'archive', 'joss',
+]
+PACKAGE_DATE_FIELDS = ['date_accepted']
+PACKAGE_DATETIME_FIELDS = ['created_at', 'updated_at', 'closed_at']
+PACKAGE_DICT_FIELDS = ['submitting_author', 'editor', 'eic', 'gh_meta']
+PACKAGE_LIST_FIELDS = [
+    'all_current_maintainers', 'categories', 'reviewers', 'partners', 'labels',
+]
+
+
+def clean_text(value: Any) -> Optional[str]:
+    """
+    Return ``value`` as a stripped string, or None if it is empty.
+
+    Parameters
+    ----------
+    value : Any
+        Raw YAML value.
+
+    Returns
+    -------
+    str or None
+        Cleaned string.
+    """
+    if value is None:
+        return None
+    if isinstance(value, date):
+        value = value.isoformat()
+    value = str(value).strip()
+    return value or None
+
+
+def clean_int(value: Any) -> Optional[int]:
+    """
+    Return ``value`` as an integer, or None if it cannot be converted.
+
+    Parameters
+    ----------
+    value : Any
+        Raw YAML value.
+
+    Returns
+    -------
+    int or None
+        Cleaned integer.
+    """
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def clean_list(value: Any) -> list:
+    """
+    Return ``value`` as a JSON-serializable list.
+
+    Parameters
+    ----------
+    value : Any
+        Raw YAML value. Scalars are wrapped in a list and None becomes ``[]``.
+
+    Returns
+    -------
+    list
+        Cleaned list.
+    """
+    if value is None or value == '':
+        return []
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    return [to_json(item) for item in value]
+
+
+def clean_dict(value: Any) -> dict:
+    """
+    Return ``value`` as a JSON-serializable dictionary.
+
+    Parameters
+    ----------
+    value : Any
+        Raw YAML value. Anything that is not a mapping becomes ``{}``.
+
+    Returns
+    -------
+    dict
+        Cleaned dictionary.
+    """
+    if not isinstance(value, dict):
+        return {}
+    return to_json(value)
+
+
+def to_json(value: Any) -> Any:
+    """
+    Recursively convert YAML values into JSON-compatible values.
+
+    Dates and datetimes become ISO 8601 strings; mappings and sequences are
+    converted item by item.
+
+    Parameters
+    ----------
+    value : Any
+        Raw YAML value.
+
+    Returns
+    -------
+    Any
+        JSON-compatible value.
+    """
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """
+    Parse a YAML date value.
+
+    Parameters
+    ----------
+    value : Any
+        A ``date``, ``datetime`` or a string in one of ``DATE_FORMATS``, such
+        as ``2024-01-05``, ``2024-1-5`` or ``1/5/2024``. A time part after
+        ``T`` or a space is ignored.
+
+    Returns
+    -------
+    date or None
+        Parsed date, or None if the value is empty or unparseable.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = clean_text(value)
+    if text is None:
+        return None
+    text = text.replace('T', ' ').split(' ', 1)[0]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Parse a YAML timestamp such as ``2023-01-09T19:49:49Z``.
+
+    Parameters
+    ----------
+    value : Any
+        A ``datetime`` or an ISO 8601 string.
+
+    Returns
+    -------
+    datetime or None
+        Parsed datetime, or None if the value is empty or unparseable.
+    """
+    if isinstance(value, datetime):
+        return value
+    text = clean_text(value)
+    if text is None:
+        return None
+    try:
+        return parse_datetime(text)
+    except ValueError:
+        return None
+
+
+def contributor_fields(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a contributors.yml record onto ``Contributor`` field values.
+
+    Parameters
+    ----------
+    raw : dict
+        One record from contributors.yml.
+
+    Returns
+    -------
+    dict
+        Field name to cleaned value. Unknown YAML keys are ignored.
+    """
+    fields = {name: clean_text(raw.get(name)) for name in CONTRIBUTOR_TEXT_FIELDS}
+    fields.update({name: bool(raw.get(name)) for name in CONTRIBUTOR_BOOLEAN_FIELDS})
+    fields.update({name: clean_list(raw.get(name)) for name in CONTRIBUTOR_LIST_FIELDS})
+    fields['github_image_id'] = clean_int(raw.get('github_image_id'))
+    fields['sort'] = clean_int(raw.get('sort'))
+    fields['date_added'] = parse_date(raw.get('date_added'))
+    return fields
+
+
+def package_fields(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a packages.yml record onto ``Package`` field values.
+
+    Parameters
+    ----------
+    raw : dict
+        One record from packages.yml.
+
+    Returns
+    -------
+    dict
+        Field name to cleaned value. Unknown YAML keys are ignored.
+    """
+    fields = {name: clean_text(raw.get(name)) for name in PACKAGE_TEXT_FIELDS}
+    fields.update({name: parse_date(raw.get(name)) for name in PACKAGE_DATE_FIELDS})
+    fields.update({name: parse_timestamp(raw.get(name)) for name in PACKAGE_DATETIME_FIELDS})
+    fields.update({name: clean_dict(raw.get(name)) for name in PACKAGE_DICT_FIELDS})
+    fields.update({name: clean_list(raw.get(name)) for name in PACKAGE_LIST_FIELDS})
+    fields['active'] = bool(raw.get('active', True))
+    return fields
+
+
+def content_hash(fields: Dict[str, Any]) -> str:
+    """
+    Return a stable SHA-256 hex digest of normalized field values.
+
+    Parameters
+    ----------
+    fields : dict
+        Output of ``contributor_fields`` or ``package_fields``.
+
+    Returns
+    -------
+    str
+        64-character hex digest.
+    """
+    payload = json.dumps(fields, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def generate_github_avatar_url(github_image_id: int) -> str:
+    """
+    Generate GitHub avatar URL from image ID.
+    
+    Parameters
+    ----------
+    github_image_id : int
+        GitHub user's image ID.
+        
+    Returns
+    -------
+    str
+        GitHub avatar URL.
+    """
+    return f"https://avatars.githubusercontent.com/u/{github_image_id}?s=400&v=4"
+
+
+def generate_github_profile_url(github_username: str) -> str:
+    """
+    Generate GitHub profile URL from username.
+    
+    Parameters
+    ----------
+    github_username : str
+        GitHub username.
+        
+    Returns
+    -------
+    str
+        GitHub profile URL.
+    """
+    return f"https://github.com/{github_username}"
@@ -0,0 +1,208 @@
+"""
+Full-page cache for anonymous visitors of the home and index pages.
+
+Anonymous visitors all see the same homepage, blog index and events index,
+yet each request fetches feeds, runs several queries and renders templates.
+Views decorated with ``cache_anonymous_page`` store their rendered response
+under a key made of the request path, the query parameters the views read
+(``year``, ``cursor``, ``upcoming`` and ``page``) and a version, so a hit
+costs one cache lookup.
+
+Publishing, unpublishing or deleting a ``BlogPage`` or ``EventPage``, and
+saving or deleting an ``Author``, increments a generation counter shared by
+all workers (see ``core.shared``), which moves every page to new keys. A view can add its own
+data version to the key, as the homepage does with the feed version and the
+events index with today's date, so that a feed refresh only moves the
+homepage.
+
+Requests carrying a session cookie (e.g. from the Wagtail admin) are never
+served from or stored in the cache.
+"""
+
+import hashlib
+import logging
+from functools import wraps
+from typing import Callable, Optional
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+
+from .shared import shared_feeds
+
+logger = logging.getLogger(__name__)
+
+# Default for the PAGE_CACHE_TIMEOUT setting, in seconds
+DEFAULT_PAGE_CACHE_TIMEOUT = 300
+
+# Query parameters that change what the cached views render
+PAGE_QUERY_PARAMS = ('cursor', 'page', 'upcoming', 'year')
+
+# Generation counter bumped when pages must be rebuilt
+PAGES_COUNTER = 'pages'
+
+
+class PageCache:
+    """
+    Store rendered responses by path, query and content version.
+
+    Parameters
+    ----------
+    alias : str, optional
+        Django cache to use. Defaults to the ``PAGE_CACHE_ALIAS`` setting,
+        or ``default``.
+    timeout : float, optional
+        Seconds a page is kept. Defaults to the ``PAGE_CACHE_TIMEOUT``
+        setting; 0 or less disables the page cache.
+    """
+
+    def __init__(self, alias: Optional[str] = None, timeout: Optional[float] = None):
+        self.alias = alias
+        self.timeout = timeout
+
+    def get_timeout(self) -> float:
+        """Return the number of seconds a page is kept."""
+        if self.timeout is not None:
+            return self.timeout
+        return getattr(settings, 'PAGE_CACHE_TIMEOUT', DEFAULT_PAGE_CACHE_TIMEOUT)
+
+    def get_cache(self):
+        """Return the Django cache holding the pages."""
+        return caches[self.alias or getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+    def version(self) -> int:
+        """Return the current content version of all pages."""
+        return shared_feeds.counter(PAGES_COUNTER).get()
+
+    def invalidate(self) -> int:
+        """
+        Move every cached page to new keys, in all workers.
+
+        Returns
+        -------
+        int
+            The new content version.
+        """
+        version = shared_feeds.counter(PAGES_COUNTER).increment()
+        logger.info(f"Page cache moved to version {version}")
+        return version
+
+    def is_cacheable(self, request) -> bool:
+        """
+        Return True if ``request`` may be answered from the cache.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            Incoming request.
+
+        Returns
+        -------
+        bool
+            Whether the request is an anonymous GET or HEAD.
+        """
+        return (
+            self.get_timeout() > 0
+            and request.method in ('GET', 'HEAD')
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        )
+
+    def key(self, request, variant: str = '') -> str:
+        """
+        Return the cache key of the page ``request`` asks for.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            Incoming request.
+        variant : str, default ''
+            Version of the view's own data, e.g. the feed version.
+
+        Returns
+        -------
+        str
+            Cache key.
+        """
+        query = urlencode([(name, request.GET[name]) for name in PAGE_QUERY_PARAMS if name in request.GET])
+        digest = hashlib.sha256(f"{request.path}?{query}#{variant}".encode('utf-8')).hexdigest()
+        return f"pages:{self.version()}:{digest}"
+
+    def should_store(self, response) -> bool:
+        """
+        Return True if ``response`` can be shown to every anonymous visitor.
+
+        Parameters
+        ----------
+        response : HttpResponse
+            Response of the view.
+
+        Returns
+        -------
+        bool
+            Whether the response is a complete 200 that sets no cookies.
+        """
+        return response.status_code == 200 and not response.streaming and not response.cookies
+
+
+def cache_anonymous_page(variant: Optional[Callable[[], str]] = None, cache: Optional[PageCache] = None):
+    """
+    Serve a view's responses to anonymous visitors from the page cache.
+
+    Works for sync and async views.
+
+    Parameters
+    ----------
+    variant : callable, optional
+        Returns the version of data the view depends on besides pages, such
+        as ``core.utils.get_feed_version``; part of the cache key.
+    cache : PageCache, optional
+        Page cache to use; defaults to ``page_cache``.
+
+    Returns
+    -------
+    callable
+        Decorator for a view function.
+    """
+    def decorator(view):
+        def lookup(request):
+            pages = cache or page_cache
+            if not pages.is_cacheable(request):
+                return pages, None
+            return pages, pages.key(request, variant() if variant is not None else '')
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                pages, key = lookup(request)
+                if key is None:
+                    return await view(request, *args, **kwargs)
+                response = await pages.get_cache().aget(key)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                    if pages.should_store(response):
+                        await pages.get_cache().aset(key, response, pages.get_timeout())
+                return response
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                pages, key = lookup(request)
+                if key is None:
+                    return view(request, *args, **kwargs)
+                response = pages.get_cache().get(key)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                    if pages.should_store(response):
+                        pages.get_cache().set(key, response, pages.get_timeout())
+                return response
+        return wrapper
+    return decorator
+
+
+def invalidate_pages_on_publish(sender, **kwargs):
+    """Signal receiver moving all pages to new keys when a page goes live, is withdrawn or is deleted, or an author changes."""
+    page_cache.invalidate()
+
+
+# Process-wide page cache used by the index views
+page_cache = PageCache()
@@ -0,0 +1,242 @@
+"""
+Keyset (seek) pagination for the blog and events indexes.
+
+``django.core.paginator.Paginator`` counts every matching row and skips to
+a page with ``OFFSET``, so deep pages get slower as the archive grows.
+``KeysetPaginator`` instead orders by a date field and the primary key and
+continues from the last row shown: the next page is the rows that sort
+after ``(date, pk)`` of that row, found with an index range scan, so every
+page costs the same as the first. There is no count and no page numbers;
+pages link to each other with opaque cursor tokens carried in the
+``cursor`` query parameter.
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from typing import Any, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+
+# Query parameter carrying the cursor
+CURSOR_PARAM = 'cursor'
+
+# Directions a cursor can point in from its row
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+    pass
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by ``(field, pk)``, newest first by default.
+
+    Parameters
+    ----------
+    queryset : QuerySet
+        Rows to paginate, filtered but not ordered.
+    per_page : int
+        Rows per page.
+    field : str
+        Date field ordering the rows, e.g. ``date`` or ``start_date``; ties
+        are broken by primary key.
+    descending : bool, default True
+        Whether pages run from the latest ``(field, pk)`` to the earliest,
+        or, when False, from the earliest to the latest.
+    """
+
+    # Lets templates tell keyset pages from numbered ones
+    keyset = True
+
+    def __init__(self, queryset, per_page: int, field: str, descending: bool = True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def page(self, cursor: Optional[str] = None) -> 'KeysetPage':
+        """
+        Return the page a cursor points to.
+
+        Parameters
+        ----------
+        cursor : str, optional
+            Token from ``KeysetPage.next_cursor`` or ``previous_cursor``. A
+            missing or invalid token gives the first page.
+
+        Returns
+        -------
+        KeysetPage
+            The rows of the page, in display order.
+        """
+        try:
+            direction, key = self.decode_cursor(cursor) if cursor else (NEXT, None)
+        except InvalidCursor:
+            direction, key = NEXT, None
+
+        # Walk from the key towards smaller (field, pk) when moving forward
+        # through descending pages or back through ascending ones
+        downwards = self.descending == (direction == NEXT)
+        queryset = self.queryset
+        if key is not None:
+            queryset = self._beyond(queryset, key, downwards)
+        order = (f'-{self.field}', '-pk') if downwards else (self.field, 'pk')
+        rows = list(queryset.order_by(*order)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == NEXT:
+            return KeysetPage(rows, self, has_previous=key is not None, has_next=has_more)
+        return KeysetPage(rows[::-1], self, has_previous=has_more, has_next=True)
+
+    def _beyond(self, queryset, key: Tuple[Any, Any], downwards: bool):
+        """
+        Return the rows strictly below or above ``key`` in ``(field, pk)`` order.
+
+        The range on the field keeps the scan on the ``(field, pk)`` index.
+        """
+        field = self.field
+        if downwards:
+            return queryset.filter(**{f'{field}__lte': key[0]}).exclude(**{field: key[0], 'pk__gte': key[1]})
+        return queryset.filter(**{f'{field}__gte': key[0]}).exclude(**{field: key[0], 'pk__lte': key[1]})
+
+    def encode_cursor(self, direction: str, row) -> str:
+        """
+        Return the token pointing from ``row`` in ``direction``.
+
+        Parameters
+        ----------
+        direction : str
+            ``NEXT`` or ``PREVIOUS``.
+        row : Model
+            Last (for ``NEXT``) or first (for ``PREVIOUS``) row of a page.
+
+        Returns
+        -------
+        str
+            URL-safe token.
+        """
+        value = self.queryset.model._meta.get_field(self.field).value_to_string(row)
+        data = json.dumps([direction, value, row.pk], separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, token: str) -> Tuple[str, Tuple[Any, Any]]:
+        """
+        Return the direction and ``(field, pk)`` key of a cursor token.
+
+        Raises
+        ------
+        InvalidCursor
+            If the token was not made by ``encode_cursor``.
+        """
+        meta = self.queryset.model._meta
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            direction, value, pk = json.loads(data)
+            if direction not in (NEXT, PREVIOUS):
+                raise ValueError(f"unknown direction {direction!r}")
+            key = (meta.get_field(self.field).to_python(value), meta.pk.to_python(pk))
+        except (ValueError, TypeError, ValidationError) as e:
+            raise InvalidCursor(f"Invalid cursor {token!r}: {e}")
+        if key[0] is None or key[1] is None:
+            raise InvalidCursor(f"Invalid cursor {token!r}")
+        return direction, key
+
+
+class KeysetPage(Sequence):
+    """
+    One page of a ``KeysetPaginator``.
+
+    Supports the parts of ``django.core.paginator.Page`` that do not need a
+    count: iteration, ``has_next``, ``has_previous`` and
+    ``has_other_pages``, plus the cursors of the neighbouring pages.
+    """
+
+    def __init__(self, object_list: List[Any], paginator: KeysetPaginator, has_previous: bool, has_next: bool):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_previous = has_previous and bool(object_list)
+        self._has_next = has_next and bool(object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self.object_list)} rows>"
+
+    def has_next(self) -> bool:
+        """Return True if rows follow this page."""
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        """Return True if rows precede this page."""
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        """Return True if there is a page before or after this one."""
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        """Token of the next page, or None."""
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(NEXT, self.object_list[-1])
+
+    @property
+    def previous_cursor(self) -> Optional[str]:
+        """Token of the previous page, or None."""
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(PREVIOUS, self.object_list[0])
+
+
+def paginate(request, queryset, per_page: int, field: str, count: Optional[int] = None):
+    """
+    Return the page of ``queryset`` that ``request`` asks for.
+
+    Uses keyset pagination on ``(field, pk)`` with the ``cursor`` query
+    parameter, or numbered pages with the ``page`` parameter when the
+    ``INDEX_PAGINATION`` setting is ``"offset"``.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Incoming request.
+    queryset : QuerySet
+        Rows to paginate, ordered by ``field`` descending.
+    per_page : int
+        Rows per page.
+    field : str
+        Date field ordering the rows.
+    count : int, optional
+        Number of rows, if known, so that numbered pages need not count
+        them.
+
+    Returns
+    -------
+    KeysetPage or django.core.paginator.Page
+        The requested page; the first page if the request names none or an
+        invalid one, and the last numbered page if it is out of range.
+    """
+    if getattr(settings, 'INDEX_PAGINATION', 'cursor') != 'offset':
+        return KeysetPaginator(queryset, per_page, field).page(request.GET.get(CURSOR_PARAM))
+
+    paginator = Paginator(queryset, per_page)
+    if count is not None:
+        paginator.count = count
+    try:
+        return paginator.page(request.GET.get('page'))
+    except PageNotAnInteger:
+        return paginator.page(1)
+    except EmptyPage:
+        return paginator.page(paginator.num_pages)
@@ -0,0 +1,221 @@
+"""
+Parser backends for the contributor and package feeds.
+
+ruamel.yaml's safe loader is pure Python and dominates the cost of loading a
+feed. PyYAML is a dependency of the project, and its wheels ship the libyaml
+C extension, which the ``libyaml`` backend uses to parse the same documents
+several times faster; a PyYAML built without libyaml falls back to ruamel. It is configured with
+ruamel's YAML 1.2 implicit resolvers, so scalars such as ``yes``, ``010`` or
+``1e3`` load to the same values with either backend.
+
+Feeds that are also published as JSON can be read from that mirror with the
+``json`` backend (see the ``FEED_JSON_MIRRORS`` setting). JSON has no dates,
+so the raw values differ, but the records built from them are identical
+because ``core.normalize`` parses date strings.
+
+All backends raise ``FeedParseError``, a ``YAMLError``, for malformed input.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from ruamel.yaml import YAML, YAMLError
+from ruamel.yaml.resolver import implicit_resolvers
+
+try:
+    import yaml as pyyaml
+    from yaml import CSafeLoader
+except ImportError:
+    pyyaml = None
+    CSafeLoader = None
+
+logger = logging.getLogger(__name__)
+
+# Values accepted by the FEED_PARSER setting
+FEED_PARSERS = ('auto', 'libyaml', 'ruamel')
+
+# Implicit tags that the YAML 1.2 core schema resolves
+YAML_12_TAGS = {
+    'tag:yaml.org,2002:bool',
+    'tag:yaml.org,2002:float',
+    'tag:yaml.org,2002:int',
+    'tag:yaml.org,2002:merge',
+    'tag:yaml.org,2002:null',
+    'tag:yaml.org,2002:timestamp',
+}
+
+
+class FeedParseError(YAMLError):
+    """Raised when a feed body cannot be parsed."""
+    pass
+
+
+class RuamelParser:
+    """Parse YAML with ruamel.yaml's pure-Python safe loader."""
+
+    name = 'ruamel'
+
+    def __init__(self):
+        self._yaml = YAML(typ='safe', pure=True)
+
+    def load(self, text: str) -> Any:
+        """
+        Parse a YAML document.
+
+        Parameters
+        ----------
+        text : str
+            YAML document.
+
+        Returns
+        -------
+        Any
+            Parsed data.
+        """
+        return self._yaml.load(text)
+
+
+if CSafeLoader is not None:
+    class _Yaml12Loader(CSafeLoader):
+        """libyaml safe loader resolving plain scalars like ruamel.yaml."""
+
+        def construct_yaml_int(self, node):
+            # YAML 1.2: a leading zero does not make a number octal
+            value = self.construct_scalar(node).replace('_', '')
+            sign = -1 if value.startswith('-') else 1
+            value = value.lstrip('+-')
+            for prefix, base in (('0b', 2), ('0o', 8), ('0x', 16)):
+                if value.startswith(prefix):
+                    return sign * int(value[2:], base)
+            return sign * int(value)
+
+    _Yaml12Loader.yaml_implicit_resolvers = {}
+    for _versions, _tag, _regexp, _first in implicit_resolvers:
+        if (1, 2) in _versions and _tag in YAML_12_TAGS:
+            _Yaml12Loader.add_implicit_resolver(_tag, _regexp, _first)
+    _Yaml12Loader.add_constructor('tag:yaml.org,2002:int', _Yaml12Loader.construct_yaml_int)
+
+
+class LibYAMLParser:
+    """Parse YAML with PyYAML's libyaml C loader, using YAML 1.2 resolution."""
+
+    name = 'libyaml'
+
+    @staticmethod
+    def is_available() -> bool:
+        """Return True if PyYAML was built with libyaml."""
+        return CSafeLoader is not None
+
+    def load(self, text: str) -> Any:
+        """
+        Parse a YAML document.
+
+        Parameters
+        ----------
+        text : str
+            YAML document.
+
+        Returns
+        -------
+        Any
+            Parsed data.
+        """
+        try:
+            return pyyaml.load(text, Loader=_Yaml12Loader)
+        except pyyaml.YAMLError as e:
+            raise FeedParseError(str(e)) from e
+
+
+class JSONParser:
+    """Parse a JSON mirror of a feed."""
+
+    name = 'json'
+
+    def load(self, text: str) -> Any:
+        """
+        Parse a JSON document.
+
+        Parameters
+        ----------
+        text : str
+            JSON document.
+
+        Returns
+        -------
+        Any
+            Parsed data.
+        """
+        try:
+            return json.loads(text)
+        except ValueError as e:
+            raise FeedParseError(str(e)) from e
+
+
+def available_parsers() -> List[str]:
+    """
+    Return the names of the YAML backends that can be used here.
+
+    Returns
+    -------
+    list of str
+        Backend names, fastest first.
+    """
+    names = ['ruamel']
+    if LibYAMLParser.is_available():
+        names.insert(0, 'libyaml')
+    return names
+
+
+def get_parser(name: Optional[str] = None):
+    """
+    Return the YAML parser backend to use.
+
+    Parameters
+    ----------
+    name : str, optional
+        ``auto``, ``libyaml`` or ``ruamel``. Defaults to the ``FEED_PARSER``
+        setting; ``auto`` picks the fastest available backend.
+
+    Returns
+    -------
+    RuamelParser or LibYAMLParser
+        The parser.
+
+    Raises
+    ------
+    ImproperlyConfigured
+        If ``name`` is unknown or its backend is not installed.
+    """
+    name = name or getattr(settings, 'FEED_PARSER', 'auto')
+    if name not in FEED_PARSERS:
+        raise ImproperlyConfigured(
+            f"FEED_PARSER must be one of {', '.join(FEED_PARSERS)}, not {name!r}"
+        )
+    if name == 'auto':
+        name = available_parsers()[0]
+    if name == 'libyaml':
+        if not LibYAMLParser.is_available():
+            raise ImproperlyConfigured("FEED_PARSER is 'libyaml' but PyYAML with libyaml is not installed")
+        return LibYAMLParser()
+    return RuamelParser()
+
+
+def get_json_mirror(url: str) -> Optional[str]:
+    """
+    Return the JSON mirror configured for a YAML feed URL.
+
+    Parameters
+    ----------
+    url : str
+        YAML feed URL.
+
+    Returns
+    -------
+    str or None
+        Mirror URL from the ``FEED_JSON_MIRRORS`` setting, if any.
+    """
+    mirrors: Dict[str, str] = getattr(settings, 'FEED_JSON_MIRRORS', None) or {}
+    return mirrors.get(url)
@@ -0,0 +1,175 @@
+"""
+Recency ordering for contributor and package feed records.
+
+The homepage only ever shows the few most recent records of each feed.
+``RecencyIndex`` sorts a feed once per version so that any ``count`` is a
+slice; ``most_recent`` is a top-k selection with ``heapq.nlargest`` for data
+that is not worth indexing because it will not be seen again.
+"""
+
+import heapq
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .normalize import parse_date
+
+
+def recency_key(
+    records: Sequence[Any], date_key: str, newest_last: bool
+) -> Callable[[int], Tuple[date, int]]:
+    """
+    Return a sort key over record positions, most recent sorting largest.
+
+    Records are compared by their parsed ``date_key``; records without a
+    parseable date sort as oldest. Ties are broken by position.
+
+    Parameters
+    ----------
+    records : sequence of dict
+        Feed records.
+    date_key : str
+        Name of the date field, e.g. ``date_added``.
+    newest_last : bool
+        If True, later records win ties (contributors.yml is appended to);
+        otherwise earlier records win.
+
+    Returns
+    -------
+    callable
+        Maps a record position to a comparable key.
+    """
+    dates = [parse_date(record.get(date_key)) or date.min for record in records]
+    if newest_last:
+        return lambda i: (dates[i], i)
+    return lambda i: (dates[i], -i)
+
+
+def recency_order(records: Sequence[Any], date_key: str, newest_last: bool = False) -> List[int]:
+    """
+    Return the positions of all records, most recent first.
+
+    Parameters
+    ----------
+    records : sequence of dict
+        Feed records.
+    date_key : str
+        Name of the date field.
+    newest_last : bool, default False
+        Whether later records win ties.
+
+    Returns
+    -------
+    list of int
+        Record positions.
+    """
+    key = recency_key(records, date_key, newest_last)
+    return sorted(range(len(records)), key=key, reverse=True)
+
+
+def most_recent(
+    records: Sequence[Any], count: int, date_key: str, newest_last: bool = False
+) -> List[Any]:
+    """
+    Return the ``count`` most recent records without sorting all of them.
+
+    Parameters
+    ----------
+    records : sequence of dict
+        Feed records.
+    count : int
+        Number of records to return.
+    date_key : str
+        Name of the date field.
+    newest_last : bool, default False
+        Whether later records win ties.
+
+    Returns
+    -------
+    list of dict
+        Most recent records first.
+    """
+    key = recency_key(records, date_key, newest_last)
+    return [records[i] for i in heapq.nlargest(count, range(len(records)), key=key)]
+
+
+class RecencyIndex:
+    """
+    Feed records sorted most recent first, computed once.
+
+    Parameters
+    ----------
+    records : sequence of dict
+        Feed records.
+    date_key : str
+        Name of the date field.
+    newest_last : bool, default False
+        Whether later records win ties.
+    """
+
+    def __init__(self, records: Sequence[Any], date_key: str, newest_last: bool = False):
+        self.records = records
+        self.ordered = [records[i] for i in recency_order(records, date_key, newest_last)]
+
+    def recent(self, count: int) -> List[Any]:
+        """
+        Return the ``count`` most recent records.
+
+        Parameters
+        ----------
+        count : int
+            Number of records to return.
+
+        Returns
+        -------
+        list of dict
+            Most recent records first.
+        """
+        return self.ordered[:count]
+
+
+_indexes: Dict[str, RecencyIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_recency_index(
+    name: str, records: Sequence[Any], date_key: str, newest_last: bool = False
+) -> RecencyIndex:
+    """
+    Return the recency index for a feed, rebuilding it when the feed changes.
+
+    The fetch layer returns the same list object for as long as a feed's
+    content is unchanged, so the index is rebuilt only when a new version of
+    the feed is seen.
+
+    Parameters
+    ----------
+    name : str
+        Feed name, e.g. ``contributors``.
+    records : sequence of dict
+        Current feed records.
+    date_key : str
+        Name of the date field.
+    newest_last : bool, default False
+        Whether later records win ties.
+
+    Returns
+    -------
+    RecencyIndex
+        Index over ``records``.
+    """
+    with _indexes_lock:
+        index = _indexes.get(name)
+    if index is not None and index.records is records:
+        return index
+
+    index = RecencyIndex(records, date_key, newest_last)
+    with _indexes_lock:
+        _indexes[name] = index
+    return index
+
+
+def clear_recency_indexes() -> None:
+    """Forget all recency indexes."""
+    with _indexes_lock:
+        _indexes.clear()
@@ -0,0 +1,303 @@
+"""
+Compact, immutable record types for the contributor and package feeds.
+
+Parsed YAML gives one dictionary per record, with nested lists and
+dictionaries for fields like ``packages_reviewed`` or
+``all_current_maintainers``. Every worker keeps the parsed feeds in memory,
+so the cache stores them as frozen ``__slots__`` objects instead: no
+per-record ``__dict__``, tuples instead of lists and interned strings for the
+small vocabularies (titles, partners, categories) that repeat across records.
+
+Records support attribute access for templates, plus ``record['field']`` and
+``record.get('field')`` for code written against the YAML dictionaries.
+"""
+
+import hashlib
+import logging
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .normalize import (
+    CONTRIBUTOR_BOOLEAN_FIELDS,
+    CONTRIBUTOR_LIST_FIELDS,
+    CONTRIBUTOR_TEXT_FIELDS,
+    PACKAGE_DATE_FIELDS,
+    PACKAGE_DATETIME_FIELDS,
+    PACKAGE_DICT_FIELDS,
+    PACKAGE_LIST_FIELDS,
+    PACKAGE_TEXT_FIELDS,
+    contributor_fields,
+    generate_github_avatar_url,
+    generate_github_profile_url,
+    package_fields,
+)
+
+logger = logging.getLogger(__name__)
+
+# Package fields holding people rather than plain values
+PACKAGE_PERSON_FIELDS = ['submitting_author', 'editor', 'eic']
+PACKAGE_PEOPLE_LIST_FIELDS = ['all_current_maintainers', 'reviewers']
+
+# Contributor fields computed from the stored ones when a record is built
+CONTRIBUTOR_DERIVED_FIELDS = ['display_name', 'github_avatar_url', 'github_profile_url']
+
+
+def _rebuild(cls, values):
+    """Recreate a record from its slot values (used by pickle)."""
+    return cls._make(values)
+
+
+class FeedRecord:
+    """
+    Base class for immutable slotted feed records.
+
+    Subclasses list their fields in ``__slots__``. Missing values are None.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+
+    @classmethod
+    def _make(cls, values: Sequence[Any]) -> 'FeedRecord':
+        """Create a record from slot values in ``__slots__`` order."""
+        record = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, values):
+            object.__setattr__(record, name, value)
+        return record
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__slots__
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Return the value of field ``name``, or ``default`` if there is none.
+
+        Parameters
+        ----------
+        name : str
+            Field name.
+        default : Any, optional
+            Value returned for unknown fields or None values.
+
+        Returns
+        -------
+        Any
+            The field value.
+        """
+        value = getattr(self, name, None) if name in self.__slots__ else None
+        return default if value is None else value
+
+    def values(self) -> tuple:
+        """Return the slot values in ``__slots__`` order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dictionary."""
+        return dict(zip(self.__slots__, self.values()))
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def __reduce__(self):
+        return _rebuild, (type(self), self.values())
+
+    def __repr__(self):
+        first = self.__slots__[0] if self.__slots__ else ''
+        return f"<{type(self).__name__} {getattr(self, first, '')!r}>"
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings so repeated values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_all(values: Optional[Iterable[Any]]) -> tuple:
+    """Return ``values`` as a tuple of interned strings."""
+    return tuple(_intern(value) for value in values or ())
+
+
+class PersonRecord(FeedRecord):
+    """
+    A person referenced by a package: author, editor, maintainer or reviewer.
+
+    Attributes
+    ----------
+    name : str
+        Display name, or an empty string.
+    github_username : str
+        GitHub username, or an empty string.
+    """
+
+    __slots__ = ('name', 'github_username')
+
+    @classmethod
+    def from_yaml(cls, raw: Any) -> Optional['PersonRecord']:
+        """
+        Build a person from a YAML mapping (or a bare name).
+
+        Parameters
+        ----------
+        raw : dict or str
+            YAML value.
+
+        Returns
+        -------
+        PersonRecord or None
+            The person, or None if ``raw`` is empty.
+        """
+        if not raw:
+            return None
+        if not isinstance(raw, dict):
+            return cls(name=str(raw), github_username='')
+        return cls(
+            name=raw.get('name') or '',
+            github_username=_intern(raw.get('github_username') or ''),
+        )
+
+
+class ContributorRecord(FeedRecord):
+    """
+    A contributor from contributors.yml.
+
+    Fields mirror ``core.models.Contributor``; list fields are tuples.
+    ``display_name``, ``github_avatar_url`` and ``github_profile_url`` are
+    computed once when the record is built, so readers never modify it.
+    """
+
+    # Fields stored in the feed and the ``Contributor`` table
+    stored_fields = tuple(
+        CONTRIBUTOR_TEXT_FIELDS + CONTRIBUTOR_BOOLEAN_FIELDS + CONTRIBUTOR_LIST_FIELDS
+        + ['github_image_id', 'sort', 'date_added']
+    )
+    __slots__ = stored_fields + tuple(CONTRIBUTOR_DERIVED_FIELDS)
+
+    @classmethod
+    def from_fields(cls, fields: Dict[str, Any]) -> 'ContributorRecord':
+        """
+        Build a record from normalized field values.
+
+        Parameters
+        ----------
+        fields : dict
+            Output of ``contributor_fields`` or a ``Contributor`` values row.
+            Derived fields are recomputed.
+
+        Returns
+        -------
+        ContributorRecord
+            The record.
+        """
+        values = dict(fields)
+        for name in CONTRIBUTOR_LIST_FIELDS:
+            values[name] = _intern_all(values.get(name))
+        for name in ('organization', 'location'):
+            values[name] = _intern(values.get(name))
+
+        github_username = values.get('github_username') or ''
+        values['display_name'] = values.get('name') or f"@{github_username}"
+        values['github_avatar_url'] = (
+            generate_github_avatar_url(values['github_image_id'])
+            if values.get('github_image_id') else None
+        )
+        values['github_profile_url'] = generate_github_profile_url(github_username)
+        return cls(**values)
+
+    @classmethod
+    def from_yaml(cls, raw: Dict[str, Any]) -> 'ContributorRecord':
+        """Build a record from one contributors.yml entry."""
+        return cls.from_fields(contributor_fields(raw))
+
+
+class PackageRecord(FeedRecord):
+    """
+    A package from packages.yml.
+
+    Fields mirror ``core.models.Package``. People are ``PersonRecord``
+    objects, list fields are tuples and ``gh_meta`` stays a dictionary that
+    must not be modified.
+    """
+
+    __slots__ = tuple(
+        PACKAGE_TEXT_FIELDS + PACKAGE_DATE_FIELDS + PACKAGE_DATETIME_FIELDS
+        + PACKAGE_DICT_FIELDS + PACKAGE_LIST_FIELDS + ['active']
+    )
+
+    @classmethod
+    def from_fields(cls, fields: Dict[str, Any]) -> 'PackageRecord':
+        """
+        Build a record from normalized field values.
+
+        Parameters
+        ----------
+        fields : dict
+            Output of ``package_fields`` or a ``Package`` values row.
+
+        Returns
+        -------
+        PackageRecord
+            The record.
+        """
+        values = dict(fields)
+        for name in PACKAGE_PERSON_FIELDS:
+            values[name] = PersonRecord.from_yaml(values.get(name))
+        for name in PACKAGE_LIST_FIELDS:
+            if name in PACKAGE_PEOPLE_LIST_FIELDS:
+                people = (PersonRecord.from_yaml(p) for p in values.get(name) or ())
+                values[name] = tuple(p for p in people if p is not None)
+            else:
+                values[name] = _intern_all(values.get(name))
+        values['gh_meta'] = values.get('gh_meta') or {}
+        return cls(**values)
+
+    @classmethod
+    def from_yaml(cls, raw: Dict[str, Any]) -> 'PackageRecord':
+        """Build a record from one packages.yml entry."""
+        return cls.from_fields(package_fields(raw))
+
+
+def build_records(raw_records: Iterable[Any], build: Callable[[Dict[str, Any]], FeedRecord]) -> List[FeedRecord]:
+    """
+    Convert parsed YAML entries into records, skipping malformed entries.
+
+    Parameters
+    ----------
+    raw_records : iterable of dict
+        Parsed YAML entries.
+    build : callable
+        ``ContributorRecord.from_yaml`` or ``PackageRecord.from_yaml``.
+
+    Returns
+    -------
+    list of FeedRecord
+        The records, in feed order.
+    """
+    records = []
+    for raw in raw_records:
+        if not isinstance(raw, dict):
+            logger.warning(f"Skipping malformed feed entry: {raw!r}")
+            continue
+        records.append(build(raw))
+    return records
+
+
+# Identifies the record layout; pickled records (see core.snapshot) are
+# positional, so snapshots taken with different slots must not be loaded
+SCHEMA_VERSION = hashlib.sha256(repr([
+    (cls.__name__, cls.__slots__) for cls in (PersonRecord, ContributorRecord, PackageRecord)
+]).encode('utf-8')).hexdigest()[:16]
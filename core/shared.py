@@ -0,0 +1,494 @@
+"""
+Feed records shared between worker processes through memory-mapped files.
+
+With snapshots (``core.snapshot``) each worker still unpickles and holds its
+own copy of every feed. Instead, the worker that loads a feed publishes it to
+``FEED_CACHE_DIR/shared/<name>.feed`` and every worker maps that file
+read-only. The operating system keeps one copy of the pages however many
+workers map them, and a worker only unpickles the few records it shows.
+
+A published file is replaced atomically by writing a new file and renaming
+it over the old one; workers that still map the old file keep a valid view
+of it. Each feed also has a generation counter in ``<name>.gen``, itself
+mapped by every worker. Publishing sets it after the rename, and a worker
+whose mapping is older than the counter maps the new file on its next read,
+so one worker's refresh reaches all of them without re-parsing. The new
+generation follows both the counter and the generation of the published
+file, so it is newer than every mapping even if the counter file was lost.
+
+File layout, little-endian::
+
+    header   magic, format, generation, published_at, count, digest
+    offsets  count + 1 unsigned 64-bit offsets of the records, from the data
+    order    count unsigned 32-bit record positions, most recent first
+    data     the records, pickled one by one
+
+The files are written by this application into its own cache directory,
+which is what makes unpickling them safe.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from django.conf import settings
+
+from .coordination import FileLock
+from .http import _atomic_write
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PYOSFEED'
+# Bump when the file layout written by SharedFeedStore.publish changes
+SHARED_FORMAT = 1
+
+HEADER = struct.Struct('<8sIQdI32s')
+PUBLISHED_AT = struct.Struct('<d')
+# Offset of published_at in the header, rewritten in place by publish and expire
+PUBLISHED_AT_OFFSET = 8 + 4 + 8
+GENERATION = struct.Struct('<Q')
+
+# Seconds a worker waits for another one to finish publishing a feed
+PUBLISH_LOCK_TIMEOUT = 60
+
+
+class _Mapping:
+    """One published file mapped into memory."""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as feed_file:
+            self.mm = mmap.mmap(feed_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.generation, _, self.count, self.digest = HEADER.unpack_from(self.mm, 0)
+            if magic != MAGIC or version != SHARED_FORMAT:
+                raise ValueError(f"{path} is not a shared feed of format {SHARED_FORMAT}")
+            self.offsets_at = HEADER.size
+            self.order_at = self.offsets_at + 8 * (self.count + 1)
+            self.data_at = self.order_at + 4 * self.count
+            self.recent_cache: Dict[int, List[Any]] = {}
+        except Exception:
+            self.mm.close()
+            raise
+
+    @property
+    def published_at(self) -> float:
+        return PUBLISHED_AT.unpack_from(self.mm, PUBLISHED_AT_OFFSET)[0]
+
+    def record(self, position: int) -> Any:
+        start, end = struct.unpack_from('<2Q', self.mm, self.offsets_at + 8 * position)
+        return pickle.loads(self.mm[self.data_at + start:self.data_at + end])
+
+    def recent(self, count: int) -> List[Any]:
+        # The homepage asks for the same few records on every request
+        records = self.recent_cache.get(count)
+        if records is None:
+            count = min(count, self.count)
+            positions = struct.unpack_from(f'<{count}I', self.mm, self.order_at)
+            records = self.recent_cache[count] = [self.record(i) for i in positions]
+        return records
+
+
+class SharedFeed:
+    """
+    Read-only view of a published feed that follows new generations.
+
+    Every read first checks the feed's generation counter, and maps the
+    newly published file if another worker has replaced it. Records are
+    unpickled from the mapping when they are read.
+
+    Parameters
+    ----------
+    store : SharedFeedStore
+        Store the feed is published in.
+    name : str
+        Feed name, e.g. ``contributors``.
+    """
+
+    def __init__(self, store: 'SharedFeedStore', name: str):
+        self.store = store
+        self.name = name
+        self._mapping: Optional[_Mapping] = None
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Generation of the mapped file, or 0 if nothing is published."""
+        mapping = self._current()
+        return mapping.generation if mapping is not None else 0
+
+    def age(self) -> float:
+        """
+        Return the seconds since the feed was published or last confirmed.
+
+        Returns
+        -------
+        float
+            Age in seconds; infinite if nothing is published or the feed
+            was expired.
+        """
+        mapping = self._current()
+        if mapping is None or not mapping.published_at:
+            return float('inf')
+        return time.time() - mapping.published_at
+
+    def recent(self, count: int) -> List[Any]:
+        """
+        Return the ``count`` most recent records.
+
+        Parameters
+        ----------
+        count : int
+            Number of records to return.
+
+        Returns
+        -------
+        list
+            Most recent records first.
+        """
+        mapping = self._current()
+        return mapping.recent(count) if mapping is not None else []
+
+    def __len__(self) -> int:
+        mapping = self._current()
+        return mapping.count if mapping is not None else 0
+
+    def __getitem__(self, position: int) -> Any:
+        mapping = self._current()
+        if mapping is None or not -mapping.count <= position < mapping.count:
+            raise IndexError(position)
+        return mapping.record(position % mapping.count)
+
+    def __iter__(self) -> Iterator[Any]:
+        mapping = self._current()
+        if mapping is not None:
+            for position in range(mapping.count):
+                yield mapping.record(position)
+
+    def close(self) -> None:
+        """Unmap the file; the next read maps it again."""
+        with self._lock:
+            if self._mapping is not None:
+                self._mapping.mm.close()
+                self._mapping = None
+
+    def _current(self) -> Optional[_Mapping]:
+        """Return the mapping of the latest generation, remapping if needed."""
+        generation = self.store.generation(self.name)
+        with self._lock:
+            mapping = self._mapping
+            if mapping is not None and mapping.generation >= generation:
+                return mapping
+            try:
+                new_mapping = _Mapping(self.store.path(self.name))
+            except FileNotFoundError:
+                return mapping
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable shared {self.name} feed: {e}")
+                return mapping
+            # Readers still using the old mapping hold their own references to
+            # its records, so it can simply be dropped
+            self._mapping = new_mapping
+            return new_mapping
+
+
+class GenerationCounter:
+    """
+    Unsigned 64-bit counter in a small file that every process maps.
+
+    Reading it is a memory access, cheap enough for every request. Without
+    a path, or if the file cannot be opened, the counter lives in this
+    process only.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        Counter file, created if necessary.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self._mm: Optional[mmap.mmap] = None
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> int:
+        """Return the current value."""
+        mm = self._map()
+        return GENERATION.unpack_from(mm, 0)[0] if mm is not None else self._value
+
+    def set(self, value: int) -> None:
+        """
+        Store ``value``.
+
+        Parameters
+        ----------
+        value : int
+            New value.
+        """
+        mm = self._map()
+        if mm is not None:
+            GENERATION.pack_into(mm, 0, value)
+        else:
+            self._value = value
+
+    def increment(self) -> int:
+        """
+        Add one, atomically across processes.
+
+        Returns
+        -------
+        int
+            The new value.
+        """
+        if self.path is None:
+            with self._lock:
+                self._value += 1
+                return self._value
+        with FileLock(self.path.with_suffix('.lock'), timeout=PUBLISH_LOCK_TIMEOUT):
+            value = self.get() + 1
+            self.set(value)
+        return value
+
+    def close(self) -> None:
+        """Unmap the file; the next access maps it again."""
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+
+    def _map(self) -> Optional[mmap.mmap]:
+        """Return the mapped counter file, mapping it on first use."""
+        mm = self._mm
+        if mm is not None or self.path is None:
+            return mm
+        with self._lock:
+            if self._mm is not None:
+                return self._mm
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError as e:
+                logger.warning(f"Could not open generation counter {self.path}, using a local one: {e}")
+                self.path = None
+                return None
+            try:
+                if os.fstat(fd).st_size < GENERATION.size:
+                    os.ftruncate(fd, GENERATION.size)
+                self._mm = mmap.mmap(fd, GENERATION.size)
+            finally:
+                os.close(fd)
+            return self._mm
+
+
+class SharedFeedStore:
+    """
+    Publish feeds to memory-mapped files shared by all worker processes.
+
+    Parameters
+    ----------
+    cache_dir : str or Path, optional
+        Directory holding the files. If None, the ``FEED_CACHE_DIR`` setting
+        is used; if that is also unset, sharing is disabled.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._feeds: Dict[Path, SharedFeed] = {}
+        # Keyed by path, or by name for counters local to this process
+        self._counters: Dict[Any, GenerationCounter] = {}
+        self._lock = threading.Lock()
+
+    def get_cache_dir(self) -> Optional[Path]:
+        """
+        Return the directory holding the shared feeds.
+
+        Returns
+        -------
+        Path or None
+            Directory, or None if sharing is disabled.
+        """
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            cache_dir = getattr(settings, 'FEED_CACHE_DIR', None)
+        return Path(cache_dir) / 'shared' if cache_dir else None
+
+    def enabled(self) -> bool:
+        """Return True if feeds are shared between processes."""
+        return self.get_cache_dir() is not None
+
+    def path(self, name: str) -> Path:
+        """Return the path of the published file of feed ``name``."""
+        return self.get_cache_dir() / f"{name}.feed"
+
+    def get(self, name: str) -> Optional[SharedFeed]:
+        """
+        Return the view of feed ``name``.
+
+        Parameters
+        ----------
+        name : str
+            Feed name.
+
+        Returns
+        -------
+        SharedFeed or None
+            The view, which may not have anything published yet, or None if
+            sharing is disabled.
+        """
+        if not self.enabled():
+            return None
+        path = self.path(name)
+        with self._lock:
+            feed = self._feeds.get(path)
+            if feed is None:
+                feed = self._feeds[path] = SharedFeed(self, name)
+            return feed
+
+    def generation(self, name: str) -> int:
+        """
+        Return the current generation of feed ``name``.
+
+        Parameters
+        ----------
+        name : str
+            Feed name.
+
+        Returns
+        -------
+        int
+            Number of times the feed has been published, 0 if never.
+        """
+        return self.counter(name).get()
+
+    def publish(self, name: str, records: Sequence[Any], order: Sequence[int]) -> int:
+        """
+        Publish a new version of feed ``name`` to every worker.
+
+        If the records are the same as the published ones, the published
+        file is only marked as confirmed now, and no worker has to remap it.
+
+        Parameters
+        ----------
+        name : str
+            Feed name.
+        records : sequence
+            Picklable records, in feed order.
+        order : sequence of int
+            Positions of ``records``, most recent first.
+
+        Returns
+        -------
+        int
+            Generation of the published feed.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be written.
+        """
+        blobs = [pickle.dumps(record, pickle.HIGHEST_PROTOCOL) for record in records]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        index = struct.pack(f'<{len(offsets)}Q', *offsets) + struct.pack(f'<{len(order)}I', *order)
+        data = b''.join(blobs)
+        digest = hashlib.sha256(index + data).digest()
+
+        path = self.path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(path.with_suffix('.lock'), timeout=PUBLISH_LOCK_TIMEOUT):
+            current = self._read_header(path)
+            counted = self.generation(name)
+            generation = max(counted, current[2] if current is not None else 0)
+            if current is not None and current[2] == generation and current[5] == digest:
+                self._write_published_at(path, time.time())
+                if counted != generation:
+                    self.counter(name).set(generation)
+                return generation
+
+            generation += 1
+            header = HEADER.pack(MAGIC, SHARED_FORMAT, generation, time.time(), len(blobs), digest)
+            _atomic_write(path, header + index + data)
+            self.counter(name).set(generation)
+        logger.info(f"Published generation {generation} of the shared {name} feed")
+        return generation
+
+    def counter(self, name: str) -> GenerationCounter:
+        """
+        Return the generation counter ``name``, shared by all workers.
+
+        Besides one counter per feed, other caches use counters here to
+        tell every worker that their contents are out of date. If sharing
+        is disabled, the counter is local to this process.
+
+        Parameters
+        ----------
+        name : str
+            Counter name, e.g. a feed name.
+
+        Returns
+        -------
+        GenerationCounter
+            The counter.
+        """
+        cache_dir = self.get_cache_dir()
+        path = cache_dir / f"{name}.gen" if cache_dir is not None else None
+        with self._lock:
+            counter = self._counters.get(path or name)
+            if counter is None:
+                counter = self._counters[path or name] = GenerationCounter(path)
+            return counter
+
+    def expire(self, name: str) -> None:
+        """
+        Mark the published feed ``name`` as out of date in every worker.
+
+        Parameters
+        ----------
+        name : str
+            Feed name.
+        """
+        if self.enabled():
+            self._write_published_at(self.path(name), 0.0)
+
+    def close(self) -> None:
+        """Unmap every file this process has mapped."""
+        with self._lock:
+            feeds, self._feeds = self._feeds, {}
+            counters = [c for c in self._counters.values() if c.path is not None]
+            self._counters = {k: c for k, c in self._counters.items() if c.path is None}
+        for feed in feeds.values():
+            feed.close()
+        for counter in counters:
+            counter.close()
+
+    def _read_header(self, path: Path) -> Optional[tuple]:
+        """Return the unpacked header of a published file, if it is valid."""
+        try:
+            with open(path, 'rb') as feed_file:
+                header = HEADER.unpack(feed_file.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        return header if header[:2] == (MAGIC, SHARED_FORMAT) else None
+
+    def _write_published_at(self, path: Path, published_at: float) -> None:
+        """Rewrite the publication time of a published file in place."""
+        try:
+            with open(path, 'r+b') as feed_file:
+                feed_file.seek(PUBLISHED_AT_OFFSET)
+                feed_file.write(PUBLISHED_AT.pack(published_at))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not update {path}: {e}")
+
+
+# Process-wide store used by the feed helpers in core.utils
+shared_feeds = SharedFeedStore()
@@ -0,0 +1,139 @@
+"""
+Binary snapshots of parsed feeds.
+
+Parsing the YAML feeds is the most expensive step of loading them, and every
+worker process would otherwise repeat it. After a feed is parsed, its records
+are pickled to ``FEED_CACHE_DIR`` together with the SHA-256 hash of the YAML
+body they came from. Another worker that fetches the same body (usually as a
+``304 Not Modified``) loads the snapshot instead of parsing.
+
+A snapshot is only used if its format version, record schema version and
+content hash all match; otherwise it is ignored and replaced after the next
+parse. Snapshots are written by this application into its own cache
+directory, which is what makes unpickling them safe.
+"""
+
+import hashlib
+import logging
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout written by SnapshotStore.save changes
+SNAPSHOT_FORMAT = 1
+
+# Returned by SnapshotStore.load when there is no usable snapshot
+MISSING = object()
+
+
+class SnapshotStore:
+    """
+    Store parsed feeds on disk, keyed by the hash of their source.
+
+    Each file holds a small pickled header followed by the pickled data, so a
+    stale snapshot is rejected without unpickling the records.
+
+    Parameters
+    ----------
+    cache_dir : str or Path, optional
+        Directory holding the snapshots. If None, the ``FEED_CACHE_DIR``
+        setting is used; if that is also unset, snapshots are disabled.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+
+    def get_cache_dir(self) -> Optional[Path]:
+        """
+        Return the directory holding the snapshots.
+
+        Returns
+        -------
+        Path or None
+            Snapshot directory, or None if snapshots are disabled.
+        """
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            cache_dir = getattr(settings, 'FEED_CACHE_DIR', None)
+        return Path(cache_dir) / 'snapshots' if cache_dir else None
+
+    def load(self, key: str, content_hash: str, version: str) -> Any:
+        """
+        Return the snapshot of ``key`` if it was built from ``content_hash``.
+
+        Parameters
+        ----------
+        key : str
+            Name of the parsed data, e.g. a feed URL.
+        content_hash : str
+            SHA-256 hex digest of the current source body.
+        version : str
+            Schema version of the data; snapshots of other versions are ignored.
+
+        Returns
+        -------
+        Any
+            The stored data, or ``MISSING`` if there is no usable snapshot.
+        """
+        path = self._path(key)
+        if path is None:
+            return MISSING
+        try:
+            with open(path, 'rb') as snapshot:
+                header = pickle.load(snapshot)
+                if header != self._header(key, content_hash, version):
+                    return MISSING
+                return pickle.load(snapshot)
+        except FileNotFoundError:
+            return MISSING
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feed snapshot {path}: {e}")
+            return MISSING
+
+    def save(self, key: str, content_hash: str, version: str, data: Any) -> None:
+        """
+        Write the snapshot of ``key`` atomically, logging failures.
+
+        Parameters
+        ----------
+        key : str
+            Name of the parsed data, e.g. a feed URL.
+        content_hash : str
+            SHA-256 hex digest of the source body ``data`` was parsed from.
+        version : str
+            Schema version of the data.
+        data : Any
+            Picklable parsed data.
+        """
+        # Imported here because core.http imports this module
+        from .http import _atomic_write
+
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            payload = (
+                pickle.dumps(self._header(key, content_hash, version), pickle.HIGHEST_PROTOCOL)
+                + pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(path, payload)
+        except Exception as e:
+            logger.warning(f"Could not write feed snapshot for {key}: {e}")
+
+    def _header(self, key: str, content_hash: str, version: str) -> tuple:
+        """Return the header identifying a snapshot."""
+        return (SNAPSHOT_FORMAT, key, content_hash, version)
+
+    def _path(self, key: str) -> Optional[Path]:
+        """Return the path of the snapshot of ``key``."""
+        cache_dir = self.get_cache_dir()
+        if cache_dir is None:
+            return None
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+        return cache_dir / f"{name}.pickle"
+
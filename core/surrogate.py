@@ -0,0 +1,275 @@
+"""
+Cache-Control and surrogate keys for a caching reverse proxy in front of the site.
+
+Public pages are tagged with surrogate keys naming the content they show,
+e.g. ``blog-index`` for every page listing blog posts, ``blog:<pk>`` for a
+post, ``author:<pk>`` for an author and ``feed:contributors`` for a feed.
+Views add keys with the ``surrogate_keys`` decorator or
+``add_surrogate_keys``; ``SurrogateKeyMiddleware`` then lets the proxy
+cache tagged responses to anonymous visitors for ``PROXY_CACHE_TIMEOUT``
+seconds while browsers revalidate.
+
+When content changes, ``purge_dispatcher`` sends a PURGE or BAN request
+naming the affected keys to every endpoint in ``PROXY_PURGE_ENDPOINTS``, so
+the proxy can keep pages until they actually change. Purges run after the
+transaction that changed the content commits; failures are logged, and the
+proxy then serves the page until its ``s-maxage`` runs out.
+"""
+
+import logging
+from functools import wraps
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.error import URLError
+from urllib.request import Request
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.deprecation import MiddlewareMixin
+
+from .http import connection_pool
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the PROXY_* settings
+DEFAULT_SURROGATE_KEY_HEADER = 'Surrogate-Key'
+DEFAULT_PROXY_CACHE_TIMEOUT = 300
+DEFAULT_PROXY_PURGE_TIMEOUT = 2
+
+# Key of the homepage
+HOME = 'home'
+
+# Keys of pages listing blog posts (home, blog index, related posts on each
+# post) and events (events index, related events)
+BLOG_INDEX = 'blog-index'
+EVENTS_INDEX = 'events-index'
+
+# Page model name to the prefix of its pages' keys, and to its index key
+PAGE_KEY_PREFIXES = {'blogpage': 'blog', 'eventpage': 'event'}
+INDEX_KEYS = {'blogpage': BLOG_INDEX, 'eventpage': EVENTS_INDEX}
+
+
+def get_surrogate_key_header() -> str:
+    """Return the name of the response header carrying the keys."""
+    return getattr(settings, 'SURROGATE_KEY_HEADER', DEFAULT_SURROGATE_KEY_HEADER)
+
+
+def page_key(page) -> str:
+    """Return the key of a blog post or event, e.g. ``blog:12``."""
+    return f"{PAGE_KEY_PREFIXES[page._meta.model_name]}:{page.pk}"
+
+
+def author_key(author_id) -> str:
+    """Return the key of an author, e.g. ``author:3``."""
+    return f"author:{author_id}"
+
+
+def feed_key(name: str) -> str:
+    """Return the key of a feed, e.g. ``feed:contributors``."""
+    return f"feed:{name}"
+
+
+def page_keys(pages: Iterable[Any]) -> List[str]:
+    """
+    Return the keys of listed pages and of their authors.
+
+    Parameters
+    ----------
+    pages : iterable of BlogPage or EventPage
+        Pages shown by a response.
+
+    Returns
+    -------
+    list of str
+        Keys, without duplicates.
+    """
+    keys = []
+    for page in pages:
+        keys.append(page_key(page))
+        if page.author_id is not None:
+            keys.append(author_key(page.author_id))
+    return list(dict.fromkeys(keys))
+
+
+def add_surrogate_keys(response, *keys: str):
+    """
+    Tag ``response`` with ``keys``, keeping the keys it already has.
+
+    Parameters
+    ----------
+    response : HttpResponse
+        Response to tag.
+    *keys : str
+        Surrogate keys.
+
+    Returns
+    -------
+    HttpResponse
+        ``response``.
+    """
+    header = get_surrogate_key_header()
+    current = response.headers.get(header, '').split()
+    merged = list(dict.fromkeys(current + list(keys)))
+    if merged:
+        response.headers[header] = ' '.join(merged)
+    return response
+
+
+def surrogate_keys(*keys: str):
+    """
+    Tag every response of a view with ``keys``.
+
+    Works for sync and async views. Keys that depend on what the view shows
+    are added by the view with ``add_surrogate_keys``.
+
+    Parameters
+    ----------
+    *keys : str
+        Surrogate keys.
+
+    Returns
+    -------
+    callable
+        Decorator for a view function.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                return add_surrogate_keys(await view(request, *args, **kwargs), *keys)
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                return add_surrogate_keys(view(request, *args, **kwargs), *keys)
+        return wrapper
+    return decorator
+
+
+class SurrogateKeyMiddleware(MiddlewareMixin):
+    """
+    Let the proxy cache tagged responses to anonymous visitors.
+
+    A 200 response to an anonymous GET or HEAD that carries surrogate keys,
+    sets no cookies and has no ``Cache-Control`` of its own is marked
+    ``public`` with ``s-maxage`` set to ``PROXY_CACHE_TIMEOUT``, and
+    ``max-age=0`` so browsers revalidate. The same response to a request
+    with a session is marked ``private``.
+    """
+
+    def process_response(self, request, response):
+        if (
+            get_surrogate_key_header() not in response.headers
+            or 'Cache-Control' in response.headers
+            or request.method not in ('GET', 'HEAD')
+            or response.status_code != 200
+        ):
+            return response
+
+        timeout = getattr(settings, 'PROXY_CACHE_TIMEOUT', DEFAULT_PROXY_CACHE_TIMEOUT)
+        if settings.SESSION_COOKIE_NAME in request.COOKIES or response.cookies or timeout <= 0:
+            patch_cache_control(response, private=True)
+        else:
+            patch_cache_control(response, public=True, max_age=0, s_maxage=int(timeout))
+        return response
+
+
+class PurgeDispatcher:
+    """
+    Ask reverse proxies to drop the pages tagged with some keys.
+
+    Parameters
+    ----------
+    endpoints : list, optional
+        Endpoints to notify. Defaults to the ``PROXY_PURGE_ENDPOINTS``
+        setting. Each is a URL, which gets a PURGE request, or a dict with
+        ``url`` and optionally ``method`` (e.g. ``BAN``) and ``header`` (the
+        request header listing the keys, ``SURROGATE_KEY_HEADER`` by default).
+    timeout : float, optional
+        Seconds to wait for each endpoint. Defaults to the
+        ``PROXY_PURGE_TIMEOUT`` setting.
+    """
+
+    def __init__(self, endpoints: Optional[list] = None, timeout: Optional[float] = None):
+        self.endpoints = endpoints
+        self.timeout = timeout
+
+    def get_endpoints(self) -> List[Dict[str, str]]:
+        """Return the endpoints to notify, each as a dict with url, method and header."""
+        endpoints = self.endpoints
+        if endpoints is None:
+            endpoints = getattr(settings, 'PROXY_PURGE_ENDPOINTS', [])
+        header = get_surrogate_key_header()
+        return [
+            {'method': 'PURGE', 'header': header, **({'url': endpoint} if isinstance(endpoint, str) else endpoint)}
+            for endpoint in endpoints
+        ]
+
+    def get_timeout(self) -> float:
+        """Return the number of seconds to wait for each endpoint."""
+        if self.timeout is not None:
+            return self.timeout
+        return getattr(settings, 'PROXY_PURGE_TIMEOUT', DEFAULT_PROXY_PURGE_TIMEOUT)
+
+    def purge(self, keys: Iterable[str]) -> int:
+        """
+        Send a purge for ``keys`` to every endpoint now.
+
+        Parameters
+        ----------
+        keys : iterable of str
+            Surrogate keys whose pages are out of date.
+
+        Returns
+        -------
+        int
+            Number of endpoints that accepted the purge.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+
+        accepted = 0
+        for endpoint in self.get_endpoints():
+            request = Request(
+                endpoint['url'],
+                method=endpoint['method'],
+                headers={endpoint['header']: ' '.join(keys)},
+            )
+            try:
+                connection_pool.urlopen(request, timeout=self.get_timeout())
+            except (URLError, OSError) as e:
+                logger.error(f"Failed to purge {keys} at {endpoint['url']}: {e}")
+                continue
+            accepted += 1
+        return accepted
+
+    def purge_on_commit(self, keys: Iterable[str]) -> None:
+        """
+        Send a purge for ``keys`` once the current transaction commits.
+
+        Purging earlier could let the proxy fetch the old page again.
+
+        Parameters
+        ----------
+        keys : iterable of str
+            Surrogate keys whose pages are out of date.
+        """
+        keys = list(keys)
+        if self.get_endpoints():
+            transaction.on_commit(lambda: self.purge(keys))
+
+
+def purge_page_on_publish(sender, instance, **kwargs):
+    """Signal receiver purging a blog post or event and the pages listing it."""
+    model_name = instance._meta.model_name
+    purge_dispatcher.purge_on_commit([page_key(instance), INDEX_KEYS[model_name]])
+
+
+def purge_author_on_save(sender, instance, **kwargs):
+    """Signal receiver purging the pages showing an author."""
+    purge_dispatcher.purge_on_commit([author_key(instance.pk)])
+
+
+# Process-wide dispatcher used by the signal receivers and feed refreshes
+purge_dispatcher = PurgeDispatcher()
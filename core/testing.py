@@ -0,0 +1,239 @@
+"""
+Test support: bulk seeding of pages and a query-budget harness.
+
+Used by ``core.tests`` and the benchmarks only; the site itself never
+imports this module.
+
+A listing that runs one query per row (e.g. a template reading
+``post.tags.all`` without ``prefetch_related``) looks fine with a handful of
+pages and degrades as content grows. ``assert_constant_queries`` renders
+every public route, grows the site, renders them again, and fails if any
+route now runs more queries. Use it from a ``TestCase``, with the page and
+fragment caches disabled so that every request reaches the database.
+
+``seed_pages`` inserts live blog posts or events in bulk, bypassing the
+page tree API (about 10 ms per page), so that sites of thousands of pages
+can be built in tests and benchmarks.
+"""
+
+from datetime import date, timedelta
+from itertools import cycle
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from taggit.models import Tag
+from wagtail.models import Page
+
+from publications.models import Author, BlogPage, BlogPageTag, EventPage, EventPageTag
+
+# Tags given to seeded pages, three per page, so related items overlap
+SEED_TAGS = ('python', 'science', 'packaging', 'community', 'review', 'sprint')
+
+# Number of authors seeded pages are spread over
+SEED_AUTHORS = 5
+
+# Route name and URL arguments of each public page. Detail pages are the
+# first seeded post and event.
+PUBLIC_ROUTES: Tuple[Tuple[str, tuple], ...] = (
+    ('core:home', ()),
+    ('core:blog_index', ()),
+    ('core:events_index', ()),
+    ('core:blog_page', ('post-0',)),
+    ('core:event_page', ('event-0',)),
+)
+
+_TAG_MODELS = {BlogPage: BlogPageTag, EventPage: EventPageTag}
+_SLUG_PREFIXES = {BlogPage: 'post', EventPage: 'event'}
+
+
+def seed_pages(model, count: int, start: int = 0, parent: Optional[Page] = None,
+               first_date: Optional[date] = None) -> List[Page]:
+    """
+    Insert ``count`` live pages of ``model`` under ``parent``.
+
+    Pages are numbered from ``start`` (slugs ``post-<n>`` / ``event-<n>``),
+    dated one day apart from ``first_date``, spread over a few authors and
+    tagged with three of ``SEED_TAGS`` each. Events start on their date,
+    and the dates run up to about ``count`` days from now so that some
+    events are upcoming.
+
+    Parameters
+    ----------
+    model : type
+        ``BlogPage`` or ``EventPage``.
+    count : int
+        Number of pages to create.
+    start : int, default 0
+        Number of the first page; use the number of pages already seeded.
+    parent : Page, optional
+        Parent page; defaults to the root page.
+    first_date : date, optional
+        Date of page ``start``; defaults to ``count // 2`` days ago.
+
+    Returns
+    -------
+    list of Page
+        The created pages.
+    """
+    parent = parent or Page.get_first_root_node()
+    first_date = first_date or timezone.localdate() - timedelta(days=count // 2)
+    authors = cycle(_seed_authors())
+    tags = list(_seed_tags())
+    now = timezone.now()
+    content_type = ContentType.objects.get_for_model(model)
+    prefix = _SLUG_PREFIXES[model]
+
+    with transaction.atomic():
+        parent = Page.objects.select_for_update().get(pk=parent.pk)
+        last_child = parent.get_last_child()
+        next_step = Page._str2int(last_child.path[-Page.steplen:]) + 1 if last_child else 1
+
+        pages = []
+        for offset in range(count):
+            number = start + offset
+            slug = f'{prefix}-{number}'
+            day = first_date + timedelta(days=offset)
+            fields = {'date': day, 'author': next(authors), 'excerpt': f'Excerpt of {slug}', 'last_modified': now}
+            if model is EventPage:
+                fields['start_date'] = day
+            pages.append(model(
+                title=slug.replace('-', ' ').title(),
+                draft_title=slug.replace('-', ' ').title(),
+                slug=slug,
+                path=Page._get_path(parent.path, parent.depth + 1, next_step + offset),
+                depth=parent.depth + 1,
+                numchild=0,
+                url_path=f'{parent.url_path}{slug}/',
+                content_type=content_type,
+                locale_id=parent.locale_id,
+                live=True,
+                has_unpublished_changes=False,
+                first_published_at=now,
+                last_published_at=now,
+                **fields,
+            ))
+
+        # Bulk inserts do not support multi-table inheritance: insert the
+        # Page rows, then each page's own row
+        parent_rows = Page.objects.bulk_create([Page(**{
+            field.attname: getattr(page, field.attname) for field in Page._meta.concrete_fields
+        }) for page in pages])
+        for page, row in zip(pages, parent_rows):
+            page.pk = page.page_ptr_id = row.pk
+            page.save_base(raw=True, force_insert=True)
+
+        tag_model = _TAG_MODELS[model]
+        tag_model.objects.bulk_create([
+            tag_model(content_object_id=page.pk, tag=tags[(page_index + shift) % len(tags)])
+            for page_index, page in enumerate(pages, start)
+            for shift in range(3)
+        ])
+        Page.objects.filter(pk=parent.pk).update(numchild=parent.numchild + count)
+    return pages
+
+
+def seed_site(posts: int, events: int) -> None:
+    """
+    Add ``posts`` blog posts and ``events`` events to the site.
+
+    Numbering continues after the pages already seeded, so the site can be
+    grown in steps.
+
+    Parameters
+    ----------
+    posts : int
+        Number of blog posts to add.
+    events : int
+        Number of events to add.
+    """
+    seed_pages(BlogPage, posts, start=BlogPage.objects.count())
+    seed_pages(EventPage, events, start=EventPage.objects.count())
+
+
+def count_queries(client, url: str) -> int:
+    """
+    Return the number of queries a GET of ``url`` runs.
+
+    Raises
+    ------
+    AssertionError
+        If the response is not a 200.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    if response.status_code != 200:
+        raise AssertionError(f"GET {url} returned {response.status_code}")
+    return len(queries)
+
+
+def measure_routes(client, routes: Iterable[Tuple[str, tuple]] = PUBLIC_ROUTES) -> Dict[str, int]:
+    """
+    Return the number of queries of each route, by URL.
+
+    Parameters
+    ----------
+    client : django.test.Client
+        Client making the requests.
+    routes : iterable of (str, tuple), default PUBLIC_ROUTES
+        Route names and URL arguments.
+
+    Returns
+    -------
+    dict
+        URL to query count.
+    """
+    return {
+        url: count_queries(client, url)
+        for url in (reverse(name, args=args) for name, args in routes)
+    }
+
+
+def assert_constant_queries(client, grow: Callable[[], None],
+                            routes: Sequence[Tuple[str, tuple]] = PUBLIC_ROUTES) -> Dict[str, Tuple[int, int]]:
+    """
+    Check that no route runs more queries after the site grows.
+
+    Parameters
+    ----------
+    client : django.test.Client
+        Client making the requests.
+    grow : callable
+        Adds content, e.g. ``lambda: seed_site(1000, 1000)``.
+    routes : sequence of (str, tuple), default PUBLIC_ROUTES
+        Route names and URL arguments.
+
+    Returns
+    -------
+    dict
+        URL to (queries before, queries after).
+
+    Raises
+    ------
+    AssertionError
+        Listing every route whose query count grew.
+    """
+    before = measure_routes(client, routes)
+    grow()
+    after = measure_routes(client, routes)
+    counts = {url: (before[url], after[url]) for url in before}
+    grown = [f"{url}: {old} -> {new} queries" for url, (old, new) in counts.items() if new > old]
+    if grown:
+        raise AssertionError("Query count grows with content:\n" + "\n".join(grown))
+    return counts
+
+
+def _seed_authors() -> List[Author]:
+    """Return the seed authors, creating them if needed."""
+    return [
+        Author.objects.get_or_create(slug=f'seed-author-{number}', defaults={'name': f'Seed Author {number}'})[0]
+        for number in range(SEED_AUTHORS)
+    ]
+
+
+def _seed_tags() -> List[Tag]:
+    """Return the seed tags, creating them if needed."""
+    return [Tag.objects.get_or_create(name=name, defaults={'slug': name})[0] for name in SEED_TAGS]
@@ -1,30 +1,208 @@
-from django.test import TestCase, Client
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from wagtail.models import Page
+from unittest import skipUnless
 from unittest.mock import patch, MagicMock
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from ruamel.yaml import YAMLError
+import gzip
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+import hashlib
+import html
+import json
 import logging
-
+import multiprocessing
+import os
+import pickle
+import re
+import sys
+import tempfile
+import threading
+import time
+
+from . import views
+from .models import Contributor, Package
+from .facets import YearFacet, year_facets
+from .fragments import Section, fragment_cache
+from .pagecache import cache_anonymous_page, page_cache
+from .pagination import NEXT, InvalidCursor, KeysetPaginator
+from .testing import PUBLIC_ROUTES, assert_constant_queries, count_queries, seed_pages, seed_site
+from .surrogate import PurgeDispatcher, add_surrogate_keys, purge_dispatcher
+from .upcoming import UpcomingEvents, seconds_until_midnight, upcoming_events
+from .normalize import package_fields, parse_date, to_json
+from .parsers import JSONParser, LibYAMLParser, RuamelParser, available_parsers, get_parser
+from .records import ContributorRecord, PackageRecord, PersonRecord, build_records
+from .recency import RecencyIndex, clear_recency_indexes, get_recency_index, most_recent, recency_order
+from .cache import FeedCache, feed_cache
+from .circuit import CLOSED, OPEN, CircuitBreaker, CircuitOpenError, circuit_breakers
+from .coordination import SingleFlight
+from .feeds import FeedLoader
+from .http import ConditionalFetcher, connection_pool, feed_fetcher
+from .shared import GenerationCounter, SharedFeedStore, shared_feeds
+from .snapshot import MISSING, SnapshotStore
 from .utils import (
     fetch_contributors_yaml,
+    get_feed_version,
     get_recent_contributors,
     generate_github_avatar_url,
     generate_github_profile_url,
     ContributorDataError,
     fetch_packages_yaml,
     get_recent_packages,
-    PackageDataError
+    load_contributor_records,
+    load_feed,
+    PackageDataError,
+    prefetch_feeds,
+    refresh_feeds,
+    yaml,
 )
+from .webhooks import sign, verify_signature
+from publications.models import Author, BlogPage, EventPage
 
 # Disable logging during tests for cleaner output
 logging.disable(logging.CRITICAL)
 
 
+def mock_feed_response(mock_urlopen, body, headers=None):
+    """Make a patched ``connection_pool.urlopen`` return ``body`` as an HTTP 200 response."""
+    mock_response = MagicMock()
+    mock_response.read.return_value = body
+    mock_response.headers = headers or {}
+    mock_urlopen.return_value.__enter__.return_value = mock_response
+    return mock_response
+
+
+def contributor_records(contributors):
+    """Convert contributor dictionaries into records, as the feed loader does."""
+    return build_records(contributors, ContributorRecord.from_yaml)
+
+
+def package_records(packages):
+    """Convert package dictionaries into records, as the feed loader does."""
+    return build_records(packages, PackageRecord.from_yaml)
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server that ignores clients hanging up mid-response."""
+
+    def handle_error(self, request, client_address):
+        """Skip the traceback when a client timed out and closed its socket."""
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class StandInFeedServer:
+    """
+    Local HTTP server standing in for raw.githubusercontent.com.
+
+    Serves the bodies in ``files`` over keep-alive connections with
+    ETag/Last-Modified validators, answers matching conditional requests with
+    304, gzips when asked to and records every request along with the number
+    of connections and body bytes. Paths in ``delays`` are answered after
+    sleeping for the given number of seconds, and paths in ``statuses`` with
+    that error status. Also stands in for a caching proxy: PURGE and BAN
+    requests are recorded in ``purges`` and answered with 200.
+    """
+
+    last_modified = 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+    def __init__(self):
+        self.files = {}
+        self.delays = {}
+        self.statuses = {}
+        self.requests = []
+        self.purges = []
+        self.connections = 0
+        self.bytes_sent = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                server.connections += 1
+                super().setup()
+
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers)))
+                time.sleep(server.delays.get(self.path, 0))
+                body = server.files.get(self.path)
+                if body is None or self.path in server.statuses:
+                    self.send_response(server.statuses.get(self.path, 404))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                payload = body
+                self.send_response(200)
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    payload = gzip.compress(body)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', server.last_modified)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                server.bytes_sent += len(payload)
+                self.wfile.write(payload)
+
+            def do_PURGE(self):
+                server.purges.append((self.command, self.path, dict(self.headers)))
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            do_BAN = do_PURGE
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = QuietHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+        self.thread.start()
+
+    def url(self, path):
+        """Return the absolute URL of ``path`` on this server."""
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+    def stop(self):
+        """Shut the server down and drop pooled connections to it."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        connection_pool.close()
+
+
+@override_settings(FEED_CACHE_DIR=None)
 class ContributorYAMLParsingTests(TestCase):
     """Test cases for contributor YAML parsing functionality."""
 
     def setUp(self):
         """Set up test fixtures."""
+        feed_cache.clear()
+        feed_fetcher.clear()
+        circuit_breakers.clear()
         self.sample_contributors = [
             {
                 'name': 'John Doe',
@@ -50,14 +228,12 @@ class ContributorYAMLParsingTests(TestCase):
             }
         ]
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     @patch('core.utils.yaml.load')
     def test_fetch_contributors_yaml_success(self, mock_yaml_load, mock_urlopen):
         """Test successful fetching of contributors YAML."""
         # Mock the response
-        mock_response = MagicMock()
-        mock_response.read.return_value.decode.return_value = 'yaml content'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_feed_response(mock_urlopen, b'yaml content')
         mock_yaml_load.return_value = self.sample_contributors
 
         result = fetch_contributors_yaml()
@@ -66,21 +242,20 @@ class ContributorYAMLParsingTests(TestCase):
         mock_urlopen.assert_called_once()
         mock_yaml_load.assert_called_once_with('yaml content')
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     def test_fetch_contributors_yaml_custom_url(self, mock_urlopen):
         """Test fetching contributors with custom URL."""
         custom_url = 'https://example.com/custom.yml'
-        mock_response = MagicMock()
-        mock_response.read.return_value.decode.return_value = '[]'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_feed_response(mock_urlopen, b'[]')
 
         with patch('core.utils.yaml.load') as mock_yaml_load:
             mock_yaml_load.return_value = []
             fetch_contributors_yaml(custom_url)
 
-        mock_urlopen.assert_called_once_with(custom_url)
+        mock_urlopen.assert_called_once()
+        self.assertEqual(mock_urlopen.call_args[0][0].full_url, custom_url)
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     def test_fetch_contributors_yaml_network_error(self, mock_urlopen):
         """Test handling of network errors."""
         mock_urlopen.side_effect = URLError('Network error')
@@ -90,13 +265,11 @@ class ContributorYAMLParsingTests(TestCase):
 
         self.assertIn('Network error', str(context.exception))
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     @patch('core.utils.yaml.load')
     def test_fetch_contributors_yaml_parse_error(self, mock_yaml_load, mock_urlopen):
         """Test handling of YAML parsing errors."""
-        mock_response = MagicMock()
-        mock_response.read.return_value.decode.return_value = 'invalid yaml'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_feed_response(mock_urlopen, b'invalid yaml')
         mock_yaml_load.side_effect = YAMLError('YAML parse error')
 
         with self.assertRaises(ContributorDataError) as context:
@@ -104,13 +277,11 @@ class ContributorYAMLParsingTests(TestCase):
 
         self.assertIn('YAML parsing error', str(context.exception))
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     @patch('core.utils.yaml.load')
     def test_fetch_contributors_yaml_invalid_data_type(self, mock_yaml_load, mock_urlopen):
         """Test handling of invalid data type (not a list)."""
-        mock_response = MagicMock()
-        mock_response.read.return_value.decode.return_value = 'yaml content'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_feed_response(mock_urlopen, b'yaml content')
         mock_yaml_load.return_value = {'not': 'a list'}
 
         with self.assertRaises(ContributorDataError) as context:
@@ -118,29 +289,33 @@ class ContributorYAMLParsingTests(TestCase):
 
         self.assertIn('should be a list', str(context.exception))
 
-    @patch('core.utils.fetch_contributors_yaml')
+    @patch('core.utils.load_contributor_records')
     def test_get_recent_contributors_success(self, mock_fetch):
         """Test successful retrieval of recent contributors."""
-        mock_fetch.return_value = self.sample_contributors
+        mock_fetch.return_value = contributor_records(self.sample_contributors)
 
         result = get_recent_contributors(2)
 
         # Should return reversed list (most recent first) limited to 2
         expected = list(reversed(self.sample_contributors))[:2]
-        self.assertEqual(result, expected)
+        self.assertEqual(
+            [c.github_username for c in result],
+            [c['github_username'] for c in expected]
+        )
+        self.assertIsInstance(result[0], ContributorRecord)
         self.assertEqual(len(result), 2)
 
-    @patch('core.utils.fetch_contributors_yaml')
+    @patch('core.utils.load_contributor_records')
     def test_get_recent_contributors_default_count(self, mock_fetch):
         """Test default count of 4 contributors."""
-        mock_fetch.return_value = self.sample_contributors
+        mock_fetch.return_value = contributor_records(self.sample_contributors)
 
         result = get_recent_contributors()
 
         # Should return all 3 contributors (less than default 4)
         self.assertEqual(len(result), 3)
 
-    @patch('core.utils.fetch_contributors_yaml')
+    @patch('core.utils.load_contributor_records')
     def test_get_recent_contributors_fetch_error(self, mock_fetch):
         """Test handling of fetch error."""
         mock_fetch.side_effect = ContributorDataError('Fetch failed')
@@ -149,7 +324,7 @@ class ContributorYAMLParsingTests(TestCase):
 
         self.assertEqual(result, [])
 
-    @patch('core.utils.fetch_contributors_yaml')
+    @patch('core.utils.load_contributor_records')
     def test_get_recent_contributors_unexpected_error(self, mock_fetch):
         """Test handling of unexpected errors."""
         mock_fetch.side_effect = ValueError('Unexpected error')
@@ -181,6 +356,7 @@ class UtilityFunctionTests(TestCase):
         self.assertEqual(result, expected_url)
 
 
+@override_settings(FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0)
 class HomeViewIntegrationTests(TestCase):
     """Test cases for view integration with contributor data."""
 
@@ -188,16 +364,16 @@ class HomeViewIntegrationTests(TestCase):
         """Set up test fixtures."""
         self.client = Client()
         self.sample_contributors = [
-            {
+            ContributorRecord.from_yaml({
                 'name': 'John Doe',
                 'github_username': 'johndoe',
                 'github_image_id': 12345,
                 'bio': 'Test contributor'
-            },
-            {
+            }),
+            ContributorRecord.from_yaml({
                 'github_username': 'janesmith',
                 'github_image_id': 67890
-            }
+            })
         ]
 
     @patch('core.views.get_recent_contributors')
@@ -215,7 +391,7 @@ class HomeViewIntegrationTests(TestCase):
 
     @patch('core.views.get_recent_contributors')
     def test_home_view_with_contributor_data_enhancement(self, mock_get_contributors):
-        """Test that contributor data is properly enhanced in view."""
+        """Test that contributors reach the template with derived fields."""
         mock_get_contributors.return_value = self.sample_contributors
 
         response = self.client.get(reverse('core:home'))
@@ -233,6 +409,18 @@ class HomeViewIntegrationTests(TestCase):
         second_contributor = contributors[1]
         self.assertEqual(second_contributor['display_name'], '@janesmith')
 
+    @patch('core.views.get_recent_contributors')
+    def test_home_view_does_not_copy_or_modify_records(self, mock_get_contributors):
+        """Test that the home view passes the shared records through as-is."""
+        mock_get_contributors.return_value = self.sample_contributors
+        before = [c.values() for c in self.sample_contributors]
+
+        response = self.client.get(reverse('core:home'))
+
+        for shown, record in zip(response.context['recent_contributors'], self.sample_contributors):
+            self.assertIs(shown, record)
+        self.assertEqual([c.values() for c in self.sample_contributors], before)
+
     @patch('core.views.get_recent_contributors')
     def test_home_view_with_no_contributors(self, mock_get_contributors):
         """Test home view when no contributors are returned."""
@@ -244,6 +432,32 @@ class HomeViewIntegrationTests(TestCase):
         self.assertIn('recent_contributors', response.context)
         self.assertEqual(len(response.context['recent_contributors']), 0)
 
+    def test_home_view_is_async(self):
+        """Test that the home view is a coroutine function."""
+        self.assertTrue(iscoroutinefunction(views.home))
+
+    async def test_home_view_under_asgi_reads_feeds_concurrently(self):
+        """Test that the ASGI-served home view waits for the slowest feed only."""
+        delay = 0.3
+
+        def slow(records):
+            def read(count):
+                time.sleep(delay)
+                return records[:count]
+            return read
+
+        packages = [PackageRecord.from_yaml({'package_name': 'pkg-a'})]
+        with patch('core.views.get_recent_contributors', side_effect=slow(self.sample_contributors)), \
+                patch('core.views.get_recent_packages', side_effect=slow(packages)):
+            start = time.monotonic()
+            response = await AsyncClient().get(reverse('core:home'))
+            elapsed = time.monotonic() - start
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'John Doe')
+        self.assertContains(response, 'pkg-a')
+        self.assertLess(elapsed, 2 * delay)
+
     @patch('core.views.get_recent_contributors')
     def test_home_view_contributor_avatar_url_generation(self, mock_get_contributors):
         """Test that avatar URLs are correctly generated."""
@@ -271,11 +485,15 @@ class HomeViewIntegrationTests(TestCase):
             self.assertEqual(contributor['github_profile_url'], expected_profile_url)
 
 
+@override_settings(FEED_CACHE_DIR=None)
 class PackageYAMLParsingTests(TestCase):
     """Test cases for package YAML parsing functionality."""
 
     def setUp(self):
         """Set up test fixtures."""
+        feed_cache.clear()
+        feed_fetcher.clear()
+        circuit_breakers.clear()
         self.sample_packages = [
             {
                 'package_name': 'test-package-1',
@@ -303,14 +521,12 @@ class PackageYAMLParsingTests(TestCase):
             }
         ]
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     @patch('core.utils.yaml.load')
     def test_fetch_packages_yaml_success(self, mock_yaml_load, mock_urlopen):
         """Test successful fetching of packages YAML."""
         # Mock the response
-        mock_response = MagicMock()
-        mock_response.read.return_value.decode.return_value = 'yaml content'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_feed_response(mock_urlopen, b'yaml content')
         mock_yaml_load.return_value = self.sample_packages
 
         result = fetch_packages_yaml()
@@ -319,21 +535,20 @@ class PackageYAMLParsingTests(TestCase):
         mock_urlopen.assert_called_once()
         mock_yaml_load.assert_called_once_with('yaml content')
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     def test_fetch_packages_yaml_custom_url(self, mock_urlopen):
         """Test fetching packages with custom URL."""
         custom_url = 'https://example.com/custom-packages.yml'
-        mock_response = MagicMock()
-        mock_response.read.return_value.decode.return_value = '[]'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_feed_response(mock_urlopen, b'[]')
 
         with patch('core.utils.yaml.load') as mock_yaml_load:
             mock_yaml_load.return_value = []
             fetch_packages_yaml(custom_url)
 
-        mock_urlopen.assert_called_once_with(custom_url)
+        mock_urlopen.assert_called_once()
+        self.assertEqual(mock_urlopen.call_args[0][0].full_url, custom_url)
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     def test_fetch_packages_yaml_network_error(self, mock_urlopen):
         """Test handling of network errors."""
         mock_urlopen.side_effect = URLError('Network error')
@@ -343,13 +558,11 @@ class PackageYAMLParsingTests(TestCase):
 
         self.assertIn('Network error', str(context.exception))
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     @patch('core.utils.yaml.load')
     def test_fetch_packages_yaml_parse_error(self, mock_yaml_load, mock_urlopen):
         """Test handling of YAML parsing errors."""
-        mock_response = MagicMock()
-        mock_response.read.return_value.decode.return_value = 'invalid yaml'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_feed_response(mock_urlopen, b'invalid yaml')
         mock_yaml_load.side_effect = YAMLError('YAML parse error')
 
         with self.assertRaises(PackageDataError) as context:
@@ -357,13 +570,11 @@ class PackageYAMLParsingTests(TestCase):
 
         self.assertIn('YAML parsing error', str(context.exception))
 
-    @patch('core.utils.urlopen')
+    @patch('core.http.connection_pool.urlopen')
     @patch('core.utils.yaml.load')
     def test_fetch_packages_yaml_invalid_data_type(self, mock_yaml_load, mock_urlopen):
         """Test handling of invalid data type (not a list)."""
-        mock_response = MagicMock()
-        mock_response.read.return_value.decode.return_value = 'yaml content'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_feed_response(mock_urlopen, b'yaml content')
         mock_yaml_load.return_value = {'not': 'a list'}
 
         with self.assertRaises(PackageDataError) as context:
@@ -371,10 +582,10 @@ class PackageYAMLParsingTests(TestCase):
 
         self.assertIn('should be a list', str(context.exception))
 
-    @patch('core.utils.fetch_packages_yaml')
+    @patch('core.utils.load_package_records')
     def test_get_recent_packages_success(self, mock_fetch):
         """Test successful retrieval of recent packages."""
-        mock_fetch.return_value = self.sample_packages
+        mock_fetch.return_value = package_records(self.sample_packages)
 
         result = get_recent_packages(2)
 
@@ -383,24 +594,44 @@ class PackageYAMLParsingTests(TestCase):
             self.sample_packages[0],  # 2024-01-15
             self.sample_packages[1]   # 2024-01-10
         ]
-        self.assertEqual(result, expected)
+        self.assertEqual(
+            [p.package_name for p in result],
+            [p['package_name'] for p in expected]
+        )
         self.assertEqual(len(result), 2)
 
-    @patch('core.utils.fetch_packages_yaml')
+    @patch('core.utils.load_package_records')
     def test_get_recent_packages_default_count(self, mock_fetch):
         """Test default count of 3 packages."""
-        mock_fetch.return_value = self.sample_packages
+        mock_fetch.return_value = package_records(self.sample_packages)
 
         result = get_recent_packages()
 
         # Should return all 3 packages (equals default of 3)
         self.assertEqual(len(result), 3)
         # Verify they're sorted by date_accepted descending
-        self.assertEqual(result[0]['date_accepted'], '2024-01-15')
-        self.assertEqual(result[1]['date_accepted'], '2024-01-10')
-        self.assertEqual(result[2]['date_accepted'], '2024-01-05')
-
-    @patch('core.utils.fetch_packages_yaml')
+        self.assertEqual(result[0]['date_accepted'], date(2024, 1, 15))
+        self.assertEqual(result[1]['date_accepted'], date(2024, 1, 10))
+        self.assertEqual(result[2]['date_accepted'], date(2024, 1, 5))
+
+    @patch('core.utils.load_package_records')
+    def test_get_recent_packages_mixed_date_formats(self, mock_fetch):
+        """Test that unpadded and slash dates sort by date, not as strings."""
+        mock_fetch.return_value = package_records([
+            {'package_name': 'padded', 'date_accepted': '2024-01-05'},
+            {'package_name': 'unpadded', 'date_accepted': '2024-1-10'},
+            {'package_name': 'slashes', 'date_accepted': '2/1/2024'},
+            {'package_name': 'missing'},
+        ])
+
+        result = get_recent_packages(4)
+
+        self.assertEqual(
+            [p['package_name'] for p in result],
+            ['slashes', 'unpadded', 'padded', 'missing']
+        )
+
+    @patch('core.utils.load_package_records')
     def test_get_recent_packages_fetch_error(self, mock_fetch):
         """Test handling of fetch error."""
         mock_fetch.side_effect = PackageDataError('Fetch failed')
@@ -409,7 +640,7 @@ class PackageYAMLParsingTests(TestCase):
 
         self.assertEqual(result, [])
 
-    @patch('core.utils.fetch_packages_yaml')
+    @patch('core.utils.load_package_records')
     def test_get_recent_packages_unexpected_error(self, mock_fetch):
         """Test handling of unexpected errors."""
         mock_fetch.side_effect = ValueError('Unexpected error')
@@ -419,6 +650,7 @@ class PackageYAMLParsingTests(TestCase):
         self.assertEqual(result, [])
 
 
+@override_settings(FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0)
 class PackageViewIntegrationTests(TestCase):
     """Test cases for view integration with package data."""
 
@@ -467,3 +699,2384 @@ class PackageViewIntegrationTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('recent_packages', response.context)
         self.assertEqual(len(response.context['recent_packages']), 0)
+
+
+@override_settings(FEED_CACHE_DIR=None)
+class FeedCacheTests(TestCase):
+    """Test cases for the stale-while-revalidate feed cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = FeedCache(ttl=60)
+
+    def test_miss_then_hit(self):
+        """Test that the loader only runs on the first lookup."""
+        loader = MagicMock(return_value=['a'])
+
+        self.assertEqual(self.cache.get('feed', loader), ['a'])
+        self.assertEqual(self.cache.get('feed', loader), ['a'])
+
+        loader.assert_called_once()
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_cold_miss_propagates_errors(self):
+        """Test that loader errors are raised when nothing is cached."""
+        loader = MagicMock(side_effect=ContributorDataError('down'))
+
+        with self.assertRaises(ContributorDataError):
+            self.cache.get('feed', loader)
+
+        # Nothing was stored, so the next lookup tries again
+        loader.side_effect = None
+        loader.return_value = ['b']
+        self.assertEqual(self.cache.get('feed', loader), ['b'])
+
+    @patch('core.cache.time.monotonic')
+    def test_stale_value_served_during_single_refresh(self, mock_monotonic):
+        """Test that expired entries are served while one refresh runs."""
+        mock_monotonic.return_value = 0
+        self.cache.get('feed', lambda: ['old'])
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_loader():
+            started.set()
+            release.wait(5)
+            return ['new']
+
+        mock_monotonic.return_value = 120
+        self.assertEqual(self.cache.get('feed', slow_loader), ['old'])
+        self.assertTrue(started.wait(5))
+        # A second stale lookup must not start another refresh
+        self.assertEqual(self.cache.get('feed', slow_loader), ['old'])
+        self.assertEqual(self.cache.stats()['stale_hits'], 2)
+
+        release.set()
+        for _ in range(100):
+            if self.cache.stats()['refreshes']:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(self.cache.get('feed', slow_loader), ['new'])
+        self.assertEqual(self.cache.stats()['refreshes'], 1)
+
+    @patch('core.cache.time.monotonic')
+    def test_failed_refresh_keeps_stale_value(self, mock_monotonic):
+        """Test that a failing refresh leaves the stale value in place."""
+        mock_monotonic.return_value = 0
+        self.cache.get('feed', lambda: ['old'])
+
+        done = threading.Event()
+
+        def failing_loader():
+            done.set()
+            raise ContributorDataError('upstream down')
+
+        mock_monotonic.return_value = 120
+        self.assertEqual(self.cache.get('feed', failing_loader), ['old'])
+        self.assertTrue(done.wait(5))
+        for _ in range(100):
+            if self.cache.stats()['refresh_errors']:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(self.cache.stats()['refresh_errors'], 1)
+        self.assertEqual(self.cache.get('feed', lambda: ['other']), ['old'])
+
+    def test_refresh_marks_entry_stale_and_reloads(self):
+        """Test that refresh serves the old value until the reload finishes."""
+        self.cache.get('feed', lambda: ['old'])
+        release = threading.Event()
+
+        def slow_loader():
+            release.wait(5)
+            return ['new']
+
+        self.assertTrue(self.cache.refresh('feed', slow_loader))
+        self.assertEqual(self.cache.get('feed', slow_loader), ['old'])
+        self.assertEqual(self.cache.stats()['stale_hits'], 1)
+
+        release.set()
+        for _ in range(100):
+            if self.cache.stats()['refreshes']:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(self.cache.get('feed', slow_loader), ['new'])
+
+    def test_refresh_during_refresh_runs_once_more(self):
+        """Test that a refresh requested mid-refresh is queued, not doubled."""
+        self.cache.get('feed', lambda: ['v0'])
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return [f'v{len(calls)}']
+
+        self.assertTrue(self.cache.refresh('feed', loader))
+        self.assertTrue(started.wait(5))
+        self.assertFalse(self.cache.refresh('feed', loader))
+        self.assertFalse(self.cache.refresh('feed', loader))
+
+        release.set()
+        for _ in range(100):
+            if self.cache.stats()['refreshes'] == 2:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.cache.get('feed', loader), ['v2'])
+
+    @patch('core.cache.time.monotonic')
+    def test_clear_during_refresh_allows_new_refresh(self, mock_monotonic):
+        """Test that clearing the cache mid-refresh does not block later refreshes."""
+        mock_monotonic.return_value = 0
+        self.cache.get('feed', lambda: ['old'])
+        version = self.cache.version('feed')
+        started = threading.Event()
+        release = threading.Event()
+
+        def stuck_loader():
+            started.set()
+            release.wait(5)
+            return ['dropped']
+
+        mock_monotonic.return_value = 120
+        self.cache.get('feed', stuck_loader)
+        self.assertTrue(started.wait(5))
+
+        self.cache.clear()
+        self.assertEqual(self.cache.version('feed'), 0)
+        self.cache.get('feed', lambda: ['reloaded'])
+        self.assertNotEqual(self.cache.version('feed'), version)
+
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return ['new']
+
+        mock_monotonic.return_value = 240
+        self.assertEqual(self.cache.get('feed', loader), ['reloaded'])
+        self.assertTrue(refreshed.wait(5))
+
+        # The refresh started before the clear does not overwrite newer data
+        release.set()
+        for _ in range(100):
+            if self.cache.stats()['refreshes']:
+                break
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(self.cache.get('feed', loader), ['new'])
+        self.assertEqual(self.cache.stats()['refreshes'], 1)
+
+    @patch('core.cache.time.monotonic')
+    def test_on_change_follows_changed_refreshes_only(self, mock_monotonic):
+        """Test that on_change runs after a refresh stores a different value, not the same one."""
+        mock_monotonic.return_value = 0
+        value = ['v1']
+        self.cache.get('feed', lambda: value)
+        changed = []
+
+        for now, new_value in ((120, value), (240, ['v2'])):
+            mock_monotonic.return_value = now
+            self.cache.get('feed', lambda: new_value, on_change=changed.append)
+            for _ in range(100):
+                if self.cache.stats()['refreshes'] == now // 120:
+                    break
+                time.sleep(0.01)
+
+        self.assertEqual(self.cache.stats()['refreshes'], 2)
+        self.assertEqual(changed, ['feed'])
+
+    def test_zero_ttl_disables_caching(self):
+        """Test that a TTL of zero calls the loader every time."""
+        cache = FeedCache(ttl=0)
+        loader = MagicMock(return_value=['a'])
+
+        cache.get('feed', loader)
+        cache.get('feed', loader)
+
+        self.assertEqual(loader.call_count, 2)
+
+    @patch('core.utils.load_contributor_records')
+    def test_recent_contributors_use_cache(self, mock_fetch):
+        """Test that repeated homepage lookups only fetch once."""
+        feed_cache.clear()
+        mock_fetch.return_value = contributor_records([{'github_username': 'johndoe'}])
+
+        get_recent_contributors()
+        get_recent_contributors()
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(feed_cache.stats()['hits'], 1)
+
+
+@override_settings(FEED_CACHE_DIR=None)
+class ConditionalFetchTests(TestCase):
+    """Test cases for conditional feed fetching against a local server."""
+
+    contributors_yaml = (
+        b"- name: John Doe\n"
+        b"  github_username: johndoe\n"
+        b"  date_added: '2024-01-01'\n"
+    ) * 50
+
+    def setUp(self):
+        """Start a stand-in server and use a temporary cache directory."""
+        self.server = StandInFeedServer()
+        self.addCleanup(self.server.stop)
+        self.server.files['/contributors.yml'] = self.contributors_yaml
+        self.url = self.server.url('/contributors.yml')
+
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+        self.fetcher = ConditionalFetcher(cache_dir=self.cache_dir)
+        feed_fetcher.clear()
+        self.addCleanup(feed_fetcher.clear)
+        circuit_breakers.clear()
+        self.addCleanup(circuit_breakers.clear)
+
+    def test_second_fetch_is_not_modified(self):
+        """Test that an unchanged feed is answered with a bodiless 304."""
+        first = self.fetcher.fetch(self.url)
+        bytes_after_first = self.server.bytes_sent
+        second = self.fetcher.fetch(self.url)
+
+        self.assertFalse(first.not_modified)
+        self.assertTrue(second.not_modified)
+        self.assertEqual(second.body, self.contributors_yaml)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.bytes_sent, bytes_after_first)
+        self.assertIn('If-None-Match', self.server.requests[1][1])
+        self.assertIn('If-Modified-Since', self.server.requests[1][1])
+
+    def test_gzip_transfer(self):
+        """Test that bodies are requested and decoded as gzip."""
+        result = self.fetcher.fetch(self.url)
+
+        self.assertEqual(result.body, self.contributors_yaml)
+        self.assertLess(result.bytes_transferred, len(self.contributors_yaml))
+        self.assertEqual(self.server.requests[0][1]['Accept-Encoding'], 'gzip')
+
+    def test_validators_survive_restart(self):
+        """Test that a new fetcher reuses the body stored on disk."""
+        self.fetcher.fetch(self.url)
+
+        restarted = ConditionalFetcher(cache_dir=self.cache_dir)
+        result = restarted.fetch(self.url)
+
+        self.assertTrue(result.not_modified)
+        self.assertEqual(result.body, self.contributors_yaml)
+
+    def test_changed_feed_is_downloaded_again(self):
+        """Test that a changed feed is fetched in full."""
+        self.fetcher.fetch(self.url)
+        self.server.files['/contributors.yml'] = b"- github_username: janesmith\n"
+
+        result = self.fetcher.fetch(self.url)
+
+        self.assertFalse(result.not_modified)
+        self.assertEqual(result.body, b"- github_username: janesmith\n")
+
+    def test_changed_feed_replaces_stored_copy_in_one_step(self):
+        """Test that a reader racing a store sees the new copy, not a corrupt one."""
+        self.fetcher.fetch(self.url)
+        self.server.files['/contributors.yml'] = b"- github_username: janesmith\n"
+        writer = ConditionalFetcher(cache_dir=self.cache_dir)
+        body_path = self.fetcher._body_path
+        calls = []
+
+        def store_between_reads(meta_path, content_hash):
+            # The writer replaces the copy after the reader loaded the metadata
+            if not calls:
+                writer.fetch(self.url)
+            calls.append(content_hash)
+            return body_path(meta_path, content_hash)
+
+        with patch.object(self.fetcher, '_body_path', side_effect=store_between_reads), \
+                self.assertNoLogs('core.http', level='WARNING'):
+            result = self.fetcher._load_stored(self.url)
+
+        self.assertEqual(result.body, b"- github_username: janesmith\n")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(list(Path(self.cache_dir).glob('*.body'))), 1)
+
+    def test_not_modified_skips_parsing(self):
+        """Test that a 304 reuses the parsed result without parsing."""
+        parse = MagicMock(return_value=['parsed'])
+
+        first = self.fetcher.fetch_parsed(self.url, parse)
+        second = self.fetcher.fetch_parsed(self.url, parse)
+
+        self.assertIs(first, second)
+        parse.assert_called_once_with(self.contributors_yaml.decode('utf-8'))
+
+    def test_fetch_contributors_yaml_from_server(self):
+        """Test the contributor fetcher end to end against the server."""
+        # Without a cache TTL every call revalidates with the server
+        with override_settings(FEED_CACHE_DIR=self.cache_dir, FEED_CACHE_TTL=0):
+            first = fetch_contributors_yaml(self.url)
+            second = fetch_contributors_yaml(self.url)
+
+        self.assertEqual(len(first), 50)
+        self.assertEqual(first[0]['github_username'], 'johndoe')
+        self.assertIs(first, second)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_load_contributor_records_from_server(self):
+        """Test that records are built once per feed version."""
+        with override_settings(FEED_CACHE_DIR=self.cache_dir), \
+                patch('core.utils.yaml.load', wraps=yaml.load) as mock_load:
+            first = load_contributor_records(self.url)
+            second = load_contributor_records(self.url)
+
+        self.assertIs(first, second)
+        self.assertIsInstance(first[0], ContributorRecord)
+        self.assertEqual(first[0].date_added, date(2024, 1, 1))
+        mock_load.assert_called_once()
+
+    def test_new_worker_loads_snapshot_instead_of_parsing(self):
+        """Test that records are loaded from the snapshot of an unchanged feed."""
+        with override_settings(FEED_CACHE_DIR=self.cache_dir):
+            parsed = load_contributor_records(self.url)
+            # A fresh worker has nothing in memory but shares the cache dir
+            feed_fetcher.clear()
+            with patch('core.utils.yaml.load', wraps=yaml.load) as mock_load:
+                loaded = load_contributor_records(self.url)
+
+        mock_load.assert_not_called()
+        self.assertIsNot(loaded, parsed)
+        self.assertEqual(loaded, parsed)
+
+    def test_changed_feed_is_parsed_again(self):
+        """Test that a snapshot of an older feed version is not used."""
+        with override_settings(FEED_CACHE_DIR=self.cache_dir, FEED_CACHE_TTL=0):
+            load_contributor_records(self.url)
+            feed_fetcher.clear()
+            self.server.files['/contributors.yml'] = (
+                b"- github_username: janesmith\n  date_added: '2024-02-01'\n"
+            )
+            with patch('core.utils.yaml.load', wraps=yaml.load) as mock_load:
+                records = load_contributor_records(self.url)
+
+        mock_load.assert_called_once()
+        self.assertEqual([r.github_username for r in records], ['janesmith'])
+
+    def test_snapshot_rejects_other_versions_and_corrupt_files(self):
+        """Test that mismatched or unreadable snapshots are ignored."""
+        store = SnapshotStore(cache_dir=self.cache_dir)
+        store.save('feed', 'abc', 'v1', ['data'])
+
+        self.assertEqual(store.load('feed', 'abc', 'v1'), ['data'])
+        self.assertIs(store.load('feed', 'abc', 'v2'), MISSING)
+        self.assertIs(store.load('feed', 'def', 'v1'), MISSING)
+        self.assertIs(store.load('other', 'abc', 'v1'), MISSING)
+
+        # Truncated, e.g. by a full disk
+        path = store._path('feed')
+        path.write_bytes(path.read_bytes()[:-4])
+        self.assertIs(store.load('feed', 'abc', 'v1'), MISSING)
+
+    def test_json_mirror_is_preferred(self):
+        """Test that a configured JSON mirror is read instead of the YAML feed."""
+        self.server.files['/contributors.json'] = json.dumps(
+            [{'github_username': 'johndoe', 'date_added': '2024-01-01'}]
+        ).encode('utf-8')
+        mirror = self.server.url('/contributors.json')
+
+        with override_settings(FEED_JSON_MIRRORS={self.url: mirror}):
+            records = load_contributor_records(self.url)
+
+        self.assertEqual(records, [ContributorRecord.from_yaml(
+            {'github_username': 'johndoe', 'date_added': '2024-01-01'}
+        )])
+        self.assertEqual([path for path, _ in self.server.requests], ['/contributors.json'])
+
+    def test_missing_json_mirror_falls_back_to_yaml(self):
+        """Test that the YAML feed is read if the mirror is unavailable."""
+        mirror = self.server.url('/missing.json')
+
+        with override_settings(FEED_JSON_MIRRORS={self.url: mirror}):
+            records = load_contributor_records(self.url)
+
+        self.assertEqual(len(records), 50)
+        self.assertEqual(
+            [path for path, _ in self.server.requests], ['/missing.json', '/contributors.yml']
+        )
+
+    def test_connections_are_kept_alive(self):
+        """Test that repeated fetches from one host share a connection."""
+        self.server.files['/packages.yml'] = b"[]"
+
+        self.fetcher.fetch(self.url)
+        self.fetcher.fetch(self.url)
+        self.fetcher.fetch(self.server.url('/packages.yml'))
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_fetch_times_out(self):
+        """Test that a slow server fails the fetch once the timeout expires."""
+        self.server.delays['/contributors.yml'] = 1
+
+        start = time.monotonic()
+        with self.assertRaises(URLError):
+            self.fetcher.fetch(self.url, timeout=0.1)
+
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_missing_feed_raises_network_error(self):
+        """Test that HTTP errors surface as data errors."""
+        with self.assertRaises(PackageDataError) as context:
+            fetch_packages_yaml(self.server.url('/missing.yml'))
+
+        self.assertIn('Network error', str(context.exception))
+
+
+@override_settings(FEED_CACHE_TTL=300, FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0)
+class ConcurrentFeedLoadingTests(TestCase):
+    """Test cases for loading the feeds concurrently."""
+
+    delay = 0.3
+
+    def setUp(self):
+        """Serve both feeds slowly from a stand-in server."""
+        self.server = StandInFeedServer()
+        self.addCleanup(self.server.stop)
+        self.server.files['/contributors.yml'] = b"- github_username: johndoe\n  date_added: '2024-01-01'\n"
+        self.server.files['/packages.yml'] = b"- package_name: pkg-a\n  date_accepted: '2024-01-01'\n"
+        self.server.delays = {'/contributors.yml': self.delay, '/packages.yml': self.delay}
+
+        for name, path in (('CONTRIBUTORS_URL', '/contributors.yml'), ('PACKAGES_URL', '/packages.yml')):
+            patcher = patch(f'core.utils.{name}', self.server.url(path))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        for cleanup in (feed_cache.clear, feed_fetcher.clear, circuit_breakers.clear, clear_recency_indexes, shared_feeds.close):
+            cleanup()
+            self.addCleanup(cleanup)
+
+    def test_feeds_load_in_parallel(self):
+        """Test that prefetching costs the slowest feed, not the sum."""
+        start = time.monotonic()
+        prefetch_feeds()
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 2 * self.delay)
+        self.assertEqual(feed_cache.stats()['misses'], 2)
+        self.assertEqual(get_recent_contributors(1)[0].github_username, 'johndoe')
+        self.assertEqual(get_recent_packages(1)[0].package_name, 'pkg-a')
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_home_view_loads_feeds_concurrently(self):
+        """Test that a cold homepage waits for the feeds concurrently."""
+        start = time.monotonic()
+        response = self.client.get(reverse('core:home'))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'pkg-a')
+        self.assertLess(elapsed, 2 * self.delay)
+
+    @override_settings(FEED_TIMEOUTS={'contributors': 5, 'packages': 0.1})
+    def test_per_feed_timeouts(self):
+        """Test that each feed is fetched with its own timeout."""
+        self.server.delays['/packages.yml'] = 1
+
+        start = time.monotonic()
+        with self.assertRaises(PackageDataError):
+            fetch_packages_yaml()
+        self.assertLess(time.monotonic() - start, 0.9)
+
+        self.assertEqual(len(fetch_contributors_yaml()), 1)
+
+    def test_feed_loader_reports_errors_per_feed(self):
+        """Test that one failing loader does not affect the others."""
+        def fail():
+            raise ContributorDataError('boom')
+
+        results = FeedLoader(max_workers=2).load({'ok': lambda: [1], 'broken': fail})
+
+        self.assertEqual(results['ok'], [1])
+        self.assertIsInstance(results['broken'], ContributorDataError)
+
+
+class FeedRefreshCoordinationTests(TestCase):
+    """Test cases for coalescing concurrent refreshes of a feed."""
+
+    workers = 8
+
+    def setUp(self):
+        """Serve a slow feed and use a temporary cache directory."""
+        self.server = StandInFeedServer()
+        self.addCleanup(self.server.stop)
+        self.server.files['/contributors.yml'] = b"- github_username: johndoe\n  date_added: '2024-01-01'\n"
+        self.server.delays['/contributors.yml'] = 0.2
+        self.url = self.server.url('/contributors.yml')
+
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+
+        for cleanup in (feed_cache.clear, feed_fetcher.clear, circuit_breakers.clear, clear_recency_indexes, shared_feeds.close):
+            cleanup()
+            self.addCleanup(cleanup)
+
+    def run_concurrently(self, func, workers=None):
+        """Call ``func`` from several threads at once and return the results."""
+        workers = workers or self.workers
+        barrier = threading.Barrier(workers)
+        results = [None] * workers
+
+        def run(i):
+            barrier.wait()
+            results[i] = func()
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_loads_share_one_fetch(self):
+        """Test that simultaneous callers in a process share one download."""
+        with override_settings(FEED_CACHE_DIR=self.cache_dir, FEED_CACHE_TTL=0):
+            results = self.run_concurrently(lambda: load_contributor_records(self.url))
+
+        self.assertEqual(len(self.server.requests), 1)
+        for result in results:
+            self.assertIs(result, results[0])
+
+    @override_settings(FEED_CACHE_TTL=0.5)
+    def test_one_upstream_hit_per_expiry(self):
+        """Test that a herd of requests refreshes an expired feed once."""
+        with patch('core.utils.CONTRIBUTORS_URL', self.url), \
+                override_settings(FEED_CACHE_DIR=self.cache_dir):
+            # Cold cache
+            self.run_concurrently(lambda: get_recent_contributors(1))
+            self.assertEqual(len(self.server.requests), 1)
+
+            # Expired: everyone gets the stale value and one refresh runs
+            time.sleep(0.6)
+            results = self.run_concurrently(lambda: get_recent_contributors(1))
+            deadline = time.monotonic() + 5
+            while feed_cache.stats()['refreshes'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.02)
+
+        self.assertEqual([r[0].github_username for r in results], ['johndoe'] * self.workers)
+        self.assertEqual(feed_cache.stats()['refreshes'], 1)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_processes_reuse_a_fresh_copy(self):
+        """Test that a second process waits for the first one and reuses its copy."""
+        # Two fetchers sharing a cache directory stand in for two workers
+        fetchers = [ConditionalFetcher(cache_dir=self.cache_dir) for _ in range(2)]
+        parse = MagicMock(side_effect=lambda text: text.splitlines())
+        index = iter(range(2))
+
+        def refresh():
+            fetcher = fetchers[next(index)]
+            return fetcher.fetch_parsed(self.url, parse, snapshot_version='1', max_age=60)
+
+        results = self.run_concurrently(refresh, workers=2)
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(results[0], results[1])
+        parse.assert_called_once()
+
+    def test_expired_copy_is_revalidated(self):
+        """Test that a copy older than max_age is checked with the server."""
+        fetcher = ConditionalFetcher(cache_dir=self.cache_dir)
+        fetcher.fetch_parsed(self.url, str.splitlines, max_age=60)
+        other = ConditionalFetcher(cache_dir=self.cache_dir)
+        time.sleep(0.05)
+        other.fetch_parsed(self.url, str.splitlines, max_age=0.01)
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertIn('If-None-Match', self.server.requests[1][1])
+
+    def test_single_flight_shares_errors(self):
+        """Test that waiting callers receive the running call's exception."""
+        flight = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def fail():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            raise ContributorDataError('boom')
+
+        errors = []
+
+        def call():
+            try:
+                flight.do('feed', fail)
+            except ContributorDataError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        follower = threading.Thread(target=call)
+        follower.start()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(flight.in_flight(), 0)
+
+
+class UpstreamFailureTests(TestCase):
+    """Test cases for timeouts, the circuit breaker and last-known-good data."""
+
+    def setUp(self):
+        """Serve the feeds from a stand-in server and a temporary cache directory."""
+        self.server = StandInFeedServer()
+        self.addCleanup(self.server.stop)
+        self.server.files['/contributors.yml'] = b"- github_username: johndoe\n  date_added: '2024-01-01'\n"
+        self.url = self.server.url('/contributors.yml')
+        self.fetcher = ConditionalFetcher()
+
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings_override = override_settings(FEED_CACHE_DIR=cache_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        patcher = patch('core.utils.CONTRIBUTORS_URL', self.url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for cleanup in (feed_cache.clear, feed_fetcher.clear, circuit_breakers.clear, clear_recency_indexes, shared_feeds.close):
+            cleanup()
+            self.addCleanup(cleanup)
+
+    def test_read_timeout(self):
+        """Test that a stalled response fails after the read timeout."""
+        self.server.delays['/contributors.yml'] = 1
+
+        start = time.monotonic()
+        with self.assertRaises(URLError):
+            self.fetcher.fetch(self.url, timeout=(5, 0.1))
+
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    @override_settings(FEED_CIRCUIT_FAILURES=2, FEED_CIRCUIT_COOLDOWN=60)
+    def test_circuit_opens_after_consecutive_failures(self):
+        """Test that a failing host is not contacted once its circuit opens."""
+        self.server.statuses['/contributors.yml'] = 503
+
+        for _ in range(2):
+            with self.assertRaises(HTTPError):
+                self.fetcher.fetch(self.url)
+        with self.assertRaises(CircuitOpenError):
+            self.fetcher.fetch(self.url)
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    @override_settings(FEED_CIRCUIT_FAILURES=1, FEED_CIRCUIT_COOLDOWN=0.1)
+    def test_circuit_closes_after_successful_trial(self):
+        """Test that one trial request is allowed after the cooldown."""
+        self.server.delays['/contributors.yml'] = 0.5
+        with self.assertRaises(URLError):
+            self.fetcher.fetch(self.url, timeout=0.1)
+        with self.assertRaises(CircuitOpenError):
+            self.fetcher.fetch(self.url)
+
+        time.sleep(0.15)
+        del self.server.delays['/contributors.yml']
+        result = self.fetcher.fetch(self.url)
+
+        self.assertIn(b'johndoe', result.body)
+        self.assertEqual(circuit_breakers.get(urlsplit(self.url).netloc).state, CLOSED)
+
+    @override_settings(FEED_CIRCUIT_FAILURES=1)
+    def test_client_errors_do_not_open_circuit(self):
+        """Test that a missing file is not treated as an upstream outage."""
+        for _ in range(3):
+            with self.assertRaises(HTTPError):
+                self.fetcher.fetch(self.server.url('/missing.yml'))
+
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_half_open_allows_a_single_trial(self):
+        """Test that only one caller probes a host after the cooldown."""
+        breaker = CircuitBreaker('host', failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+    @override_settings(FEED_CACHE_TTL=0)
+    def test_last_known_good_during_outage(self):
+        """Test that records are still served while the upstream fails."""
+        records = load_contributor_records()
+        self.server.statuses['/contributors.yml'] = 503
+
+        self.assertIs(load_contributor_records(), records)
+
+        # A restarted worker falls back to the copy on disk
+        feed_fetcher.clear()
+        self.assertEqual(load_contributor_records(), records)
+        self.assertEqual(get_recent_contributors(1)[0].github_username, 'johndoe')
+
+    @override_settings(FEED_CACHE_TTL=0, FEED_TIMEOUTS={'contributors': 0.1})
+    def test_stalled_upstream_serves_last_known_good_quickly(self):
+        """Test that a stalled upstream costs one read timeout, not a hang."""
+        load_contributor_records()
+        self.server.delays['/contributors.yml'] = 1
+
+        start = time.monotonic()
+        recent = get_recent_contributors(1)
+
+        self.assertLess(time.monotonic() - start, 0.9)
+        self.assertEqual(recent[0].github_username, 'johndoe')
+
+    def test_no_last_known_good_raises(self):
+        """Test that failures surface when there is nothing to fall back to."""
+        self.server.statuses['/contributors.yml'] = 503
+
+        with self.assertRaises(ContributorDataError):
+            load_contributor_records()
+
+
+class SharedFeedTests(TestCase):
+    """Test cases for feeds shared between workers through mapped files."""
+
+    def setUp(self):
+        """Use a temporary cache directory and records in feed order."""
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+        self.store = SharedFeedStore(self.cache_dir)
+        self.addCleanup(self.store.close)
+        self.records = contributor_records([
+            {'github_username': 'a', 'date_added': '2024-01-01'},
+            {'github_username': 'b', 'date_added': '2024-03-01'},
+            {'github_username': 'c', 'date_added': '2024-02-01'},
+        ])
+        self.order = recency_order(self.records, 'date_added', newest_last=True)
+
+    def other_worker(self):
+        """Return a store standing in for another worker process."""
+        store = SharedFeedStore(self.cache_dir)
+        self.addCleanup(store.close)
+        return store
+
+    def test_published_feed_is_read_by_other_workers(self):
+        """Test that another store maps the published records."""
+        self.assertEqual(self.store.publish('contributors', self.records, self.order), 1)
+
+        feed = self.other_worker().get('contributors')
+        self.assertEqual(len(feed), 3)
+        self.assertEqual(list(feed), self.records)
+        self.assertEqual(feed[-1], self.records[2])
+        self.assertEqual([r.github_username for r in feed.recent(2)], ['b', 'c'])
+        self.assertEqual(feed.recent(10), [self.records[i] for i in self.order])
+        self.assertLess(feed.age(), 5)
+
+    def test_nothing_published(self):
+        """Test that an unpublished feed is empty and infinitely old."""
+        feed = self.store.get('contributors')
+
+        self.assertEqual(feed.generation, 0)
+        self.assertEqual(len(feed), 0)
+        self.assertEqual(feed.recent(4), [])
+        self.assertEqual(feed.age(), float('inf'))
+
+    def test_new_generation_reaches_existing_views(self):
+        """Test that a view follows the feed when another worker republishes it."""
+        feed = self.store.get('contributors')
+        self.store.publish('contributors', self.records, self.order)
+        before = feed.recent(1)
+
+        newer = self.records + contributor_records([{'github_username': 'd', 'date_added': '2024-04-01'}])
+        generation = self.other_worker().publish(
+            'contributors', newer, recency_order(newer, 'date_added', newest_last=True)
+        )
+
+        self.assertEqual(generation, 2)
+        self.assertEqual(feed.generation, 2)
+        self.assertEqual(feed.recent(1)[0].github_username, 'd')
+        # Records read from the old mapping stay usable
+        self.assertEqual(before[0].github_username, 'b')
+
+    def test_lost_counter_does_not_hide_new_generation(self):
+        """Test that a reset counter still gives a generation newer than every mapping."""
+        feed = self.store.get('contributors')
+        self.store.publish('contributors', self.records, self.order)
+        self.store.publish('contributors', self.records[:2], self.order[:2])
+        self.assertEqual(feed.generation, 2)
+
+        # E.g. the counter file was deleted and created again
+        self.store.counter('contributors').set(0)
+        newer = self.records + contributor_records([{'github_username': 'd', 'date_added': '2024-04-01'}])
+        generation = self.other_worker().publish(
+            'contributors', newer, recency_order(newer, 'date_added', newest_last=True)
+        )
+
+        self.assertEqual(generation, 3)
+        self.assertEqual(feed.recent(1)[0].github_username, 'd')
+
+    def test_unchanged_records_are_confirmed_not_republished(self):
+        """Test that publishing the same records only refreshes their age."""
+        self.store.publish('contributors', self.records, self.order)
+        self.store.expire('contributors')
+        feed = self.other_worker().get('contributors')
+        self.assertEqual(feed.age(), float('inf'))
+
+        self.assertEqual(self.store.publish('contributors', list(self.records), self.order), 1)
+        self.assertLess(feed.age(), 5)
+
+    @skipUnless(hasattr(os, 'fork'), "needs fork")
+    def test_refresh_in_another_process_is_visible(self):
+        """Test that a feed published by a child process is seen without reloading."""
+        feed = self.store.get('contributors')
+        self.store.publish('contributors', self.records, self.order)
+        self.assertEqual(feed.recent(1)[0].github_username, 'b')
+
+        newer = contributor_records([{'github_username': 'z', 'date_added': '2025-01-01'}])
+        child = multiprocessing.get_context('fork').Process(
+            target=SharedFeedStore(self.cache_dir).publish, args=('contributors', newer, [0])
+        )
+        child.start()
+        child.join(10)
+
+        self.assertEqual(child.exitcode, 0)
+        self.assertEqual(feed.generation, 2)
+        self.assertEqual(feed.recent(1)[0].github_username, 'z')
+
+    @override_settings(FEED_CACHE_TTL=300)
+    @patch('core.utils.load_contributor_records')
+    def test_workers_read_published_feed_without_loading(self, mock_load):
+        """Test that a worker with a cold cache uses a freshly published feed."""
+        mock_load.return_value = self.records
+        with override_settings(FEED_CACHE_DIR=self.cache_dir):
+            for cleanup in (feed_cache.clear, feed_fetcher.clear, clear_recency_indexes, shared_feeds.close):
+                cleanup()
+                self.addCleanup(cleanup)
+
+            self.assertEqual(get_recent_contributors(1)[0].github_username, 'b')
+            mock_load.assert_called_once()
+
+            # A second worker starts with empty in-process caches
+            feed_cache.clear()
+            shared_feeds.close()
+            recent = get_recent_contributors(2)
+
+        mock_load.assert_called_once()
+        self.assertEqual([r.github_username for r in recent], ['b', 'c'])
+
+    def test_shared_records_are_not_kept_by_the_fetcher(self):
+        """Test that publishing drops the fetcher's in-memory copy of the records."""
+        server = StandInFeedServer()
+        self.addCleanup(server.stop)
+        server.files['/contributors.yml'] = b"- github_username: johndoe\n  date_added: '2024-01-01'\n"
+        for cleanup in (feed_cache.clear, feed_fetcher.clear, circuit_breakers.clear, clear_recency_indexes, shared_feeds.close):
+            cleanup()
+            self.addCleanup(cleanup)
+
+        with override_settings(FEED_CACHE_DIR=self.cache_dir, FEED_CACHE_TTL=300), \
+                patch('core.utils.CONTRIBUTORS_URL', server.url('/contributors.yml')):
+            self.assertEqual(get_recent_contributors(1)[0].github_username, 'johndoe')
+
+        self.assertEqual(feed_fetcher._parsed, {})
+
+
+@override_settings(FEED_CACHE_TTL=3600, FEED_WEBHOOK_SECRET='s3cret')
+class FeedWebhookTests(TestCase):
+    """Test cases for the signed feed refresh webhook."""
+
+    def setUp(self):
+        """Serve the feeds from a stand-in server and a temporary cache directory."""
+        self.server = StandInFeedServer()
+        self.addCleanup(self.server.stop)
+        self.server.files['/contributors.yml'] = b"- github_username: johndoe\n  date_added: '2024-01-01'\n"
+        self.server.files['/packages.yml'] = b"- package_name: pkg-a\n  date_accepted: '2024-01-01'\n"
+
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings_override = override_settings(FEED_CACHE_DIR=cache_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        for name, path in (('CONTRIBUTORS_URL', '/contributors.yml'), ('PACKAGES_URL', '/packages.yml')):
+            patcher = patch(f'core.utils.{name}', self.server.url(path))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        for cleanup in (feed_cache.clear, feed_fetcher.clear, circuit_breakers.clear, clear_recency_indexes, shared_feeds.close):
+            cleanup()
+            self.addCleanup(cleanup)
+
+    def post(self, body=b'{"ref": "refs/heads/main"}', secret='s3cret', **headers):
+        """Post ``body`` to the webhook, signed with ``secret`` unless it is None."""
+        if secret is not None:
+            headers.setdefault('HTTP_X_HUB_SIGNATURE_256', sign(body, secret))
+        return self.client.post(
+            reverse('core:feed_webhook'), body, content_type='application/json', **headers
+        )
+
+    def wait_for_refreshes(self, count):
+        """Wait until the feed cache has finished ``count`` background refreshes."""
+        for _ in range(200):
+            if feed_cache.stats()['refreshes'] >= count:
+                return
+            time.sleep(0.01)
+        self.fail(f"Only {feed_cache.stats()['refreshes']} of {count} refreshes finished")
+
+    def test_signature_round_trip(self):
+        """Test that signatures verify only with the same body and secret."""
+        signature = sign(b'payload', 's3cret')
+
+        self.assertTrue(signature.startswith('sha256='))
+        self.assertTrue(verify_signature(b'payload', signature, 's3cret'))
+        self.assertFalse(verify_signature(b'payload!', signature, 's3cret'))
+        self.assertFalse(verify_signature(b'payload', signature, 'other'))
+        self.assertFalse(verify_signature(b'payload', None, 's3cret'))
+        self.assertFalse(verify_signature(b'payload', signature, ''))
+
+    def test_unsigned_or_badly_signed_requests_are_rejected(self):
+        """Test that requests without a valid signature refresh nothing."""
+        self.assertEqual(self.post(secret=None).status_code, 403)
+        self.assertEqual(self.post(secret='wrong').status_code, 403)
+        self.assertEqual(self.post(HTTP_X_HUB_SIGNATURE_256='sha256=00').status_code, 403)
+
+        time.sleep(0.05)
+        self.assertEqual(self.server.requests, [])
+
+    @override_settings(FEED_WEBHOOK_SECRET='')
+    def test_endpoint_disabled_without_secret(self):
+        """Test that the webhook does not exist until a secret is configured."""
+        self.assertEqual(self.post(secret='').status_code, 404)
+
+    def test_only_post_is_allowed(self):
+        """Test that the webhook rejects GET requests."""
+        self.assertEqual(self.client.get(reverse('core:feed_webhook')).status_code, 405)
+
+    def test_ping_does_not_refresh(self):
+        """Test that GitHub's ping event is acknowledged without refreshing."""
+        response = self.post(HTTP_X_GITHUB_EVENT='ping')
+
+        self.assertEqual(response.status_code, 204)
+        time.sleep(0.05)
+        self.assertEqual(self.server.requests, [])
+
+    def test_push_refreshes_feeds_despite_long_ttl(self):
+        """Test that a signed push reloads both feeds in the background."""
+        self.assertEqual(get_recent_contributors(1)[0].github_username, 'johndoe')
+        self.assertEqual(get_recent_packages(1)[0].package_name, 'pkg-a')
+        self.assertEqual(len(self.server.requests), 2)
+
+        self.server.files['/contributors.yml'] += b"- github_username: newcomer\n  date_added: '2024-06-01'\n"
+        response = self.post(HTTP_X_GITHUB_EVENT='push')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(sorted(response.json()['refreshing']), ['contributors', 'packages'])
+        self.wait_for_refreshes(2)
+
+        self.assertEqual(get_recent_contributors(1)[0].github_username, 'newcomer')
+        self.assertEqual(feed_cache.stats()['misses'], 2)
+        # The refreshes revalidated the stored copies instead of reusing them
+        revalidations = [headers for _, headers in self.server.requests[2:]]
+        self.assertEqual(len(revalidations), 2)
+        self.assertTrue(all('If-None-Match' in headers for headers in revalidations))
+
+    def test_push_expires_copy_shared_with_other_workers(self):
+        """Test that another worker's fresh-looking copy on disk is expired too."""
+        get_recent_packages(1)
+        other_worker = ConditionalFetcher()
+        url = self.server.url('/packages.yml')
+        self.assertIsNotNone(other_worker._get_fresh(url, max_age=3600))
+
+        refresh_feeds(['packages'])
+        self.wait_for_refreshes(1)
+
+        # Only the expiry is shared; the refreshed copy is fresh again
+        self.assertIsNotNone(other_worker._get_fresh(url, max_age=3600))
+        self.assertEqual(len(self.server.requests), 2)
+
+    @override_settings(FEED_SOURCE='db')
+    def test_db_source_has_nothing_to_refresh(self):
+        """Test that the webhook accepts pushes but fetches nothing in db mode."""
+        response = self.post()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['refreshing'], [])
+
+
+class NormalizeTests(TestCase):
+    """Test cases for YAML value normalization."""
+
+    def test_parse_date_formats(self):
+        """Test that the date layouts found in the feeds are parsed."""
+        expected = date(2024, 1, 5)
+        for value in ['2024-01-05', '2024-1-5', '2024/01/05', '1/5/2024',
+                      '2024-01-05T10:00:00Z', date(2024, 1, 5)]:
+            with self.subTest(value=value):
+                self.assertEqual(parse_date(value), expected)
+
+    def test_parse_date_invalid(self):
+        """Test that empty and unparseable values become None."""
+        for value in [None, '', 'TBD', '2024-13-01']:
+            with self.subTest(value=value):
+                self.assertIsNone(parse_date(value))
+
+    def test_package_fields_parse_date_accepted(self):
+        """Test that date_accepted is normalized to a date at ingest."""
+        fields = package_fields({'package_name': 'pkg', 'date_accepted': '2024-1-5'})
+
+        self.assertEqual(fields['date_accepted'], date(2024, 1, 5))
+
+
+@override_settings(FEED_CACHE_DIR=None)
+class RecencyTests(TestCase):
+    """Test cases for recency ordering of feed records."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        clear_recency_indexes()
+        self.records = [
+            {'github_username': 'b', 'date_added': '2024-02-01'},
+            {'github_username': 'a', 'date_added': '2024-1-15'},
+            {'github_username': 'undated'},
+            {'github_username': 'c', 'date_added': '2024-02-01'},
+            {'github_username': 'd', 'date_added': date(2023, 12, 1)},
+        ]
+
+    def test_index_orders_by_parsed_date(self):
+        """Test that records are ordered by date, not by position."""
+        index = RecencyIndex(self.records, 'date_added', newest_last=True)
+
+        self.assertEqual(
+            [r['github_username'] for r in index.recent(5)],
+            ['c', 'b', 'a', 'd', 'undated']
+        )
+
+    def test_earlier_records_win_ties_by_default(self):
+        """Test the tie-break used for packages."""
+        index = RecencyIndex(self.records, 'date_added')
+
+        self.assertEqual([r['github_username'] for r in index.recent(2)], ['b', 'c'])
+
+    def test_most_recent_matches_index(self):
+        """Test that the top-k fallback agrees with the full index."""
+        index = RecencyIndex(self.records, 'date_added', newest_last=True)
+        for count in range(len(self.records) + 2):
+            with self.subTest(count=count):
+                self.assertEqual(
+                    most_recent(self.records, count, 'date_added', newest_last=True),
+                    index.recent(count)
+                )
+
+    def test_index_is_built_once_per_feed_version(self):
+        """Test that the index is only rebuilt for a new records list."""
+        first = get_recency_index('contributors', self.records, 'date_added')
+        again = get_recency_index('contributors', self.records, 'date_added')
+        changed = get_recency_index('contributors', list(self.records), 'date_added')
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, changed)
+
+    @patch('core.recency.RecencyIndex')
+    @patch('core.utils.load_contributor_records')
+    def test_uncached_lookups_use_top_k(self, mock_fetch, mock_index):
+        """Test that a disabled cache falls back to heapq selection."""
+        mock_fetch.return_value = contributor_records(self.records)
+
+        with override_settings(FEED_CACHE_TTL=0):
+            result = get_recent_contributors(2)
+
+        mock_index.assert_not_called()
+        self.assertEqual([r['github_username'] for r in result], ['c', 'b'])
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0)
+class FeedRecordTests(TestCase):
+    """Test cases for the compact feed record types."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.package = PackageRecord.from_yaml({
+            'package_name': 'pkg-a',
+            'package_description': 'A package',
+            'date_accepted': '2024-1-15',
+            'submitting_author': {'name': 'John Doe', 'github_username': 'johndoe'},
+            'all_current_maintainers': [
+                {'name': 'John Doe', 'github_username': 'johndoe'},
+                {'github_username': 'janesmith'},
+            ],
+            'categories': ['data-processing'],
+            'gh_meta': {'documentation': 'https://pkg-a.readthedocs.io'},
+        })
+
+    def test_records_are_immutable(self):
+        """Test that fields cannot be assigned or deleted."""
+        with self.assertRaises(AttributeError):
+            self.package.package_name = 'other'
+        with self.assertRaises(AttributeError):
+            del self.package.package_name
+        with self.assertRaises(AttributeError):
+            self.package.extra = 'value'
+
+    def test_contributor_derived_fields_computed_at_build(self):
+        """Test that display and GitHub URL fields are precomputed."""
+        named = ContributorRecord.from_yaml({
+            'name': 'John Doe', 'github_username': 'johndoe', 'github_image_id': '12345',
+        })
+        unnamed = ContributorRecord.from_yaml({'github_username': 'janesmith'})
+
+        self.assertEqual(named.display_name, 'John Doe')
+        self.assertEqual(named.github_avatar_url, 'https://avatars.githubusercontent.com/u/12345?s=400&v=4')
+        self.assertEqual(named.github_profile_url, 'https://github.com/johndoe')
+        self.assertEqual(unnamed.display_name, '@janesmith')
+        self.assertIsNone(unnamed.github_avatar_url)
+        self.assertIn('display_name', named)
+        self.assertNotIn('display_name', ContributorRecord.stored_fields)
+
+    def test_records_have_no_instance_dict(self):
+        """Test that records use slots only."""
+        self.assertFalse(hasattr(self.package, '__dict__'))
+
+    def test_attribute_and_item_access(self):
+        """Test attribute access and the dictionary-style helpers."""
+        self.assertEqual(self.package.package_name, 'pkg-a')
+        self.assertEqual(self.package['date_accepted'], date(2024, 1, 15))
+        self.assertEqual(self.package.get('version_accepted', 'n/a'), 'n/a')
+        self.assertIsNone(self.package.get('not_a_field'))
+        with self.assertRaises(KeyError):
+            self.package['not_a_field']
+
+    def test_nested_values_are_compact(self):
+        """Test that people become records and lists become tuples."""
+        self.assertEqual(self.package.submitting_author, PersonRecord(name='John Doe', github_username='johndoe'))
+        self.assertEqual(self.package.all_current_maintainers[1].name, '')
+        self.assertEqual(self.package.categories, ('data-processing',))
+        self.assertIsNone(PackageRecord.from_yaml({'package_name': 'x'}).submitting_author)
+
+    def test_pickle_round_trip(self):
+        """Test that records survive pickling unchanged."""
+        self.assertEqual(pickle.loads(pickle.dumps(self.package)), self.package)
+
+    @patch('core.views.get_recent_packages')
+    def test_home_template_renders_package_records(self, mock_get_packages):
+        """Test that the homepage template reads package records."""
+        mock_get_packages.return_value = [self.package]
+
+        response = self.client.get(reverse('core:home'))
+
+        self.assertContains(response, 'pkg-a')
+        self.assertContains(response, 'John Doe,')
+        self.assertContains(response, 'janesmith')
+        self.assertContains(response, 'https://pkg-a.readthedocs.io')
+
+
+class ParserBackendTests(TestCase):
+    """Test cases for the pluggable feed parser backends."""
+
+    # Entries shaped like the real contributors.yml and packages.yml feeds
+    contributors_yaml = """\
+- name: John Doe
+  github_username: johndoe
+  github_image_id: 12345
+  bio: >-
+    Scientist, open source
+    maintainer.
+  organization: University A
+  location: ''
+  email:
+  twitter: no
+  orcidid: 0000-0002-1825-0097
+  website: https://example.org
+  date_added: 2024-01-05
+  deia_advisory: false
+  editorial_board: true
+  sort: 010
+  title:
+  - Editor
+  - Reviewer
+  partners: [astropy]
+  contributor_type:
+  - package-reviewer
+  packages_reviewed:
+  - pandera
+  packages_submitted: []
+- github_username: janesmith
+  date_added: '2024-1-6'
+  title: Maintainer
+  sort: 1_000
+"""
+    packages_yaml = """\
+- package_name: pkg-a
+  package_description: |
+    A package: with colons and "quotes".
+  date_accepted: 01/15/2024
+  repository_link: https://github.com/org/pkg-a
+  version_submitted: 0.10
+  version_accepted: v1.0.0
+  created_at: 2023-01-09T19:49:49Z
+  updated_at: '2024-02-01T10:00:00Z'
+  closed_at:
+  submitting_author:
+    name: John Doe
+    github_username: johndoe
+  editor: {github_username: janesmith, name: Jane Smith}
+  eic: ~
+  all_current_maintainers:
+  - name: John Doe
+    github_username: johndoe
+  - github_username: 'on'
+  reviewers: []
+  categories: [data-processing, data-retrieval]
+  labels:
+  - 6/pyOS-approved
+  - 1e3
+  gh_meta:
+    name: pkg-a
+    forks_count: 12
+    stargazers_count: 1e3
+    last_commit: 2024-03-01
+    documentation: https://pkg-a.readthedocs.io
+  active: yes
+"""
+    tricky_scalars = "[yes, no, on, off, 010, 0o17, 0x1F, 0b101, 1_000, 1:20, 1e3, 12e03, 1., .inf, ~, -0, +12, True, 2024-01-05]"
+
+    def parse_records(self, parser, text, build):
+        """Parse ``text`` with ``parser`` and build records from it."""
+        return build_records(parser.load(text), build)
+
+    def test_libyaml_matches_ruamel(self):
+        """Test that both YAML backends load the feeds identically."""
+        ruamel, libyaml = RuamelParser(), LibYAMLParser()
+
+        for text in (self.contributors_yaml, self.packages_yaml, self.tricky_scalars):
+            self.assertEqual(libyaml.load(text), ruamel.load(text))
+        for text, build in (
+            (self.contributors_yaml, ContributorRecord.from_yaml),
+            (self.packages_yaml, PackageRecord.from_yaml),
+        ):
+            self.assertEqual(
+                self.parse_records(libyaml, text, build),
+                self.parse_records(ruamel, text, build),
+            )
+
+    def test_json_mirror_builds_identical_records(self):
+        """Test that a JSON copy of a feed produces the same records."""
+        ruamel = RuamelParser()
+
+        for text, build in (
+            (self.contributors_yaml, ContributorRecord.from_yaml),
+            (self.packages_yaml, PackageRecord.from_yaml),
+        ):
+            mirror = json.dumps(to_json(ruamel.load(text)))
+            self.assertEqual(
+                self.parse_records(JSONParser(), mirror, build),
+                self.parse_records(ruamel, text, build),
+            )
+
+    def test_parse_errors_are_yaml_errors(self):
+        """Test that every backend reports malformed input as a YAMLError."""
+        parsers = [RuamelParser(), JSONParser(), LibYAMLParser()]
+
+        for parser in parsers:
+            with self.subTest(parser=parser.name):
+                with self.assertRaises(YAMLError):
+                    parser.load('- a\nb: [')
+
+    def test_get_parser(self):
+        """Test backend selection from the FEED_PARSER setting."""
+        self.assertEqual(get_parser('ruamel').name, 'ruamel')
+        self.assertEqual(get_parser('auto').name, available_parsers()[0])
+        with override_settings(FEED_PARSER='ruamel'):
+            self.assertEqual(get_parser().name, 'ruamel')
+        with self.assertRaises(ImproperlyConfigured):
+            get_parser('fast')
+
+
+@override_settings(FEED_CACHE_DIR=None)
+class SyncPyosmetaCommandTests(TestCase):
+    """Test cases for the sync_pyosmeta management command."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.contributors = [
+            {
+                'name': 'John Doe',
+                'github_username': 'johndoe',
+                'github_image_id': 12345,
+                'date_added': '2024-01-01',
+                'title': 'Editor',
+                'packages_reviewed': ['pkg-a', 'pkg-b'],
+            },
+            {
+                'github_username': 'janesmith',
+                'date_added': date(2024, 1, 2),
+                'board': True,
+            },
+        ]
+        self.packages = [
+            {
+                'package_name': 'pkg-a',
+                'date_accepted': '2024-01-15',
+                'created_at': '2023-01-09T19:49:49Z',
+                'submitting_author': {'name': 'John Doe', 'github_username': 'johndoe'},
+                'all_current_maintainers': [{'github_username': 'johndoe'}],
+                'gh_meta': {'documentation': 'https://pkg-a.readthedocs.io'},
+            },
+        ]
+
+    def sync(self, **options):
+        """Run the command with the fixture feeds and return its output."""
+        out = StringIO()
+        with patch('core.management.commands.sync_pyosmeta.fetch_contributors_yaml',
+                   return_value=self.contributors), \
+                patch('core.management.commands.sync_pyosmeta.fetch_packages_yaml',
+                      return_value=self.packages):
+            call_command('sync_pyosmeta', stdout=out, **options)
+        return out.getvalue()
+
+    def test_initial_sync_inserts_rows(self):
+        """Test that a first sync inserts every record."""
+        output = self.sync()
+
+        self.assertIn('Contributors: 2 inserted, 0 updated, 0 unchanged, 0 deleted', output)
+        self.assertIn('Packages: 1 inserted, 0 updated, 0 unchanged, 0 deleted', output)
+
+        john = Contributor.objects.get(github_username='johndoe')
+        self.assertEqual(john.date_added, date(2024, 1, 1))
+        self.assertEqual(john.title, ['Editor'])
+        self.assertEqual(john.packages_reviewed, ['pkg-a', 'pkg-b'])
+        self.assertTrue(Contributor.objects.get(github_username='janesmith').board)
+
+        package = Package.objects.get(package_name='pkg-a')
+        self.assertEqual(package.documentation_url, 'https://pkg-a.readthedocs.io')
+        self.assertEqual(package.submitting_author_name, 'John Doe')
+        self.assertEqual(package.created_at.year, 2023)
+        self.assertEqual(package.date_accepted, date(2024, 1, 15))
+
+    def test_resync_skips_unchanged_rows(self):
+        """Test that unchanged records are not written again."""
+        self.sync()
+
+        # Savepoint and release, plus one hash lookup per model; no writes
+        with self.assertNumQueries(4):
+            output = self.sync()
+
+        self.assertIn('Contributors: 0 inserted, 0 updated, 2 unchanged, 0 deleted', output)
+        self.assertIn('Packages: 0 inserted, 0 updated, 1 unchanged, 0 deleted', output)
+
+    def test_sync_updates_and_deletes(self):
+        """Test that changed records are updated and removed ones deleted."""
+        self.sync()
+        created_at = Contributor.objects.get(github_username='johndoe').created_at
+
+        self.contributors[0]['organization'] = 'pyOpenSci'
+        del self.contributors[1]
+        output = self.sync()
+
+        self.assertIn('Contributors: 0 inserted, 1 updated, 0 unchanged, 1 deleted', output)
+        john = Contributor.objects.get(github_username='johndoe')
+        self.assertEqual(john.organization, 'pyOpenSci')
+        self.assertEqual(john.created_at, created_at)
+        self.assertFalse(Contributor.objects.filter(github_username='janesmith').exists())
+
+    def test_keep_missing(self):
+        """Test that --keep-missing leaves removed records in place."""
+        self.sync()
+        del self.contributors[1]
+
+        output = self.sync(keep_missing=True)
+
+        self.assertIn('0 deleted', output)
+        self.assertEqual(Contributor.objects.count(), 2)
+
+    def test_bulk_writes_are_batched(self):
+        """Test that inserts use one query per batch, not one per row."""
+        self.contributors = [
+            {'github_username': f'user{i}', 'date_added': '2024-01-01'}
+            for i in range(250)
+        ]
+        self.packages = []
+
+        with CaptureQueriesContext(connection) as queries:
+            self.sync(batch_size=100)
+
+        inserts = [q for q in queries if q['sql'].startswith('INSERT')]
+        # SQLite may split batches further to stay under its variable limit
+        self.assertGreaterEqual(len(inserts), 3)
+        self.assertLess(len(inserts), 25)
+        self.assertEqual(Contributor.objects.count(), 250)
+
+    def test_records_without_key_are_skipped(self):
+        """Test that records missing their unique key are reported."""
+        self.contributors.append({'name': 'No Username'})
+
+        output = self.sync()
+
+        self.assertIn('2 inserted, 0 updated, 0 unchanged, 0 deleted, 1 skipped', output)
+
+    def test_empty_feed_deletes_nothing(self):
+        """Test that an empty feed aborts the sync instead of emptying the table."""
+        self.sync()
+        self.contributors = []
+
+        with self.assertRaisesRegex(CommandError, 'feed is empty'):
+            self.sync()
+
+        self.assertEqual(Contributor.objects.count(), 2)
+        self.assertEqual(Package.objects.count(), 1)
+
+    def test_truncated_feed_deletes_nothing(self):
+        """Test that a sync deleting most rows is refused unless forced."""
+        self.contributors = [
+            {'github_username': f'user{i}', 'date_added': '2024-01-01'}
+            for i in range(10)
+        ]
+        self.sync()
+        self.contributors = self.contributors[:3]
+        self.contributors[0]['organization'] = 'pyOpenSci'
+
+        with self.assertRaisesRegex(CommandError, 'Refusing to delete 7 of 10'):
+            self.sync()
+        self.assertEqual(Contributor.objects.count(), 10)
+        self.assertIsNone(Contributor.objects.get(github_username='user0').organization)
+
+        output = self.sync(force=True)
+        self.assertIn('Contributors: 0 inserted, 1 updated, 2 unchanged, 7 deleted', output)
+        self.assertEqual(Contributor.objects.count(), 3)
+
+    def test_max_delete_fraction(self):
+        """Test that --max-delete-fraction sets how many rows a sync may delete."""
+        self.sync()
+        del self.contributors[1]
+
+        with self.assertRaises(CommandError):
+            self.sync(max_delete_fraction=0.25)
+        self.assertIn('1 deleted', self.sync(max_delete_fraction=0.5))
+
+    def test_fetch_error_raises_command_error(self):
+        """Test that feed errors abort the command."""
+        with patch('core.management.commands.sync_pyosmeta.fetch_contributors_yaml',
+                   side_effect=ContributorDataError('down')):
+            with self.assertRaises(CommandError):
+                call_command('sync_pyosmeta', stdout=StringIO())
+
+
+@override_settings(FEED_SOURCE='db', FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0)
+class DatabaseFeedSourceTests(TestCase):
+    """Test cases for serving recent contributors and packages from the DB."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create contributors and packages."""
+        for day in range(1, 11):
+            Contributor.objects.create(
+                github_username=f'user{day}',
+                name=f'User {day}',
+                github_image_id=day,
+                date_added=date(2024, 1, day),
+                title=['Reviewer'],
+            )
+        Contributor.objects.create(github_username='undated')
+        for day in range(1, 6):
+            Package.objects.create(
+                package_name=f'pkg-{day}',
+                date_accepted=f'2024-02-0{day}',
+                all_current_maintainers=[{'github_username': f'user{day}'}],
+            )
+
+    def test_recent_contributors_single_query(self):
+        """Test that recent contributors come from one LIMIT query."""
+        with self.assertNumQueries(1):
+            result = get_recent_contributors(4)
+
+        self.assertEqual(
+            [c['github_username'] for c in result],
+            ['user10', 'user9', 'user8', 'user7']
+        )
+        self.assertEqual(result[0].title, ('Reviewer',))
+        self.assertEqual(result[0]['github_image_id'], 10)
+        self.assertEqual(result[0].display_name, 'User 10')
+        self.assertEqual(result[0].github_profile_url, 'https://github.com/user10')
+
+    def test_recent_packages_single_query(self):
+        """Test that recent packages come from one LIMIT query."""
+        with self.assertNumQueries(1):
+            result = get_recent_packages(3)
+
+        self.assertEqual([p['package_name'] for p in result], ['pkg-5', 'pkg-4', 'pkg-3'])
+        self.assertEqual(result[0].all_current_maintainers[0].github_username, 'user5')
+
+    @patch('core.utils.load_contributor_records')
+    @patch('core.utils.load_package_records')
+    def test_home_view_does_not_fetch_yaml(self, mock_packages, mock_contributors):
+        """Test that the homepage renders from the DB without any downloads."""
+        response = self.client.get(reverse('core:home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'User 10')
+        self.assertContains(response, 'pkg-5')
+        mock_contributors.assert_not_called()
+        mock_packages.assert_not_called()
+
+    @override_settings(FEED_SOURCE='csv')
+    def test_invalid_source(self):
+        """Test that an unknown FEED_SOURCE is rejected."""
+        with self.assertRaises(ImproperlyConfigured):
+            get_recent_contributors()
+
+
+@override_settings(FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=300)
+class PageCacheTests(TestCase):
+    """Test cases for the anonymous full-page cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.factory = RequestFactory()
+        page_cache.get_cache().clear()
+        self.addCleanup(page_cache.get_cache().clear)
+
+    def publish_blog_post(self, title):
+        """Create and publish a blog post under the root page."""
+        post = BlogPage(title=title, slug=title.lower().replace(' ', '-'), date=date(2024, 1, 1))
+        Page.get_first_root_node().add_child(instance=post)
+        post.save_revision().publish()
+        return post
+
+    def test_hit_runs_no_queries(self):
+        """Test that a cached index page is served without running the view."""
+        first = self.client.get(reverse('core:blog_index'))
+
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('core:blog_index'))
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+
+    def test_key_covers_year_and_page_only(self):
+        """Test that only the query parameters the views read make new pages."""
+        key = page_cache.key
+
+        self.assertEqual(key(self.factory.get('/blog/?utm_source=x')), key(self.factory.get('/blog/')))
+        self.assertNotEqual(key(self.factory.get('/blog/?page=2')), key(self.factory.get('/blog/')))
+        self.assertNotEqual(key(self.factory.get('/blog/?year=2024')), key(self.factory.get('/blog/')))
+        self.assertNotEqual(key(self.factory.get('/blog/'), 'v2'), key(self.factory.get('/blog/'), 'v1'))
+
+    def test_session_cookie_bypasses_cache(self):
+        """Test that requests with a session are always rendered."""
+        self.client.get(reverse('core:blog_index'))
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'session'
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('core:blog_index'))
+
+        self.assertGreater(len(queries), 0)
+
+    def test_responses_setting_cookies_are_not_stored(self):
+        """Test that a response with cookies is never shown to other visitors."""
+        calls = []
+
+        @cache_anonymous_page()
+        def view(request):
+            calls.append(request)
+            response = HttpResponse('page')
+            response.set_cookie('csrftoken', 'token')
+            return response
+
+        view(self.factory.get('/'))
+        view(self.factory.get('/'))
+
+        self.assertEqual(len(calls), 2)
+
+    def test_publish_invalidates_index(self):
+        """Test that publishing a post shows it on the cached blog index."""
+        self.assertNotContains(self.client.get(reverse('core:blog_index')), 'Fresh post')
+        version = page_cache.version()
+
+        self.publish_blog_post('Fresh post')
+
+        self.assertEqual(page_cache.version(), version + 1)
+        self.assertContains(self.client.get(reverse('core:blog_index')), 'Fresh post')
+
+    def test_unpublish_invalidates_index(self):
+        """Test that withdrawing a post removes it from the cached blog index."""
+        post = self.publish_blog_post('Withdrawn post')
+        self.assertContains(self.client.get(reverse('core:blog_index')), 'Withdrawn post')
+
+        post.unpublish()
+
+        self.assertNotContains(self.client.get(reverse('core:blog_index')), 'Withdrawn post')
+
+    def test_delete_invalidates_index(self):
+        """Test that deleting a live post removes it from the cached blog index."""
+        post = self.publish_blog_post('Deleted post')
+        self.assertContains(self.client.get(reverse('core:blog_index')), 'Deleted post')
+
+        post.delete()
+
+        self.assertNotContains(self.client.get(reverse('core:blog_index')), 'Deleted post')
+
+    def test_author_edit_invalidates_index(self):
+        """Test that renaming an author updates the cached blog index."""
+        author = Author.objects.create(name='Old Name')
+        post = self.publish_blog_post('Authored post')
+        post.author = author
+        post.save_revision().publish()
+        self.assertContains(self.client.get(reverse('core:blog_index')), 'Old Name')
+
+        author.name = 'New Name'
+        author.save()
+
+        response = self.client.get(reverse('core:blog_index'))
+        self.assertContains(response, 'New Name')
+        self.assertNotContains(response, 'Old Name')
+
+    def test_events_index_moves_at_midnight(self):
+        """Test that the cached events index is keyed by the local date."""
+        url = reverse('core:events_index')
+        with patch('core.views.timezone.localdate', return_value=date(2024, 5, 1)):
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as same_day:
+                self.client.get(url)
+        with patch('core.views.timezone.localdate', return_value=date(2024, 5, 2)):
+            with CaptureQueriesContext(connection) as next_day:
+                response = self.client.get(url)
+
+        self.assertEqual(len(same_day), 0)
+        self.assertGreater(len(next_day), 0)
+        self.assertEqual(response.context['today'], date(2024, 5, 2))
+
+    def test_variant_moves_only_its_view(self):
+        """Test that a view's own data version is part of its key."""
+        version = ['1']
+        calls = []
+
+        @cache_anonymous_page(variant=lambda: version[0])
+        async def view(request):
+            calls.append(request)
+            return HttpResponse(f'version {version[0]}')
+
+        request = self.factory.get('/')
+        self.assertEqual(async_to_sync(view)(request).content, b'version 1')
+        self.assertEqual(async_to_sync(view)(request).content, b'version 1')
+        version[0] = '2'
+        self.assertEqual(async_to_sync(view)(request).content, b'version 2')
+        self.assertEqual(len(calls), 2)
+
+    def test_feed_version_follows_feed_cache(self):
+        """Test that storing new feed records changes the feed version."""
+        version = get_feed_version()
+
+        feed_cache.set('contributors', [])
+
+        self.assertNotEqual(get_feed_version(), version)
+        self.assertEqual(get_feed_version(('packages',)), get_feed_version(('packages',)))
+
+    @override_settings(FEED_SOURCE='db')
+    def test_sync_bumps_db_feed_version(self):
+        """Test that a sync that changes rows moves the homepage in db mode."""
+        version = get_feed_version()
+        contributors = [{'github_username': 'johndoe', 'date_added': '2024-01-01'}]
+
+        with patch('core.management.commands.sync_pyosmeta.fetch_contributors_yaml', return_value=contributors), \
+                patch('core.management.commands.sync_pyosmeta.fetch_packages_yaml', return_value=[]):
+            call_command('sync_pyosmeta', stdout=StringIO())
+            changed = get_feed_version()
+            call_command('sync_pyosmeta', stdout=StringIO())
+
+        self.assertNotEqual(changed, version)
+        self.assertEqual(get_feed_version(), changed)
+
+    def test_generation_counter_is_shared_through_file(self):
+        """Test that an increment is seen through another mapping of the file."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, 'pages.gen')
+            first, second = GenerationCounter(path), GenerationCounter(path)
+
+            self.assertEqual(first.increment(), 1)
+            self.assertEqual(second.increment(), 2)
+            self.assertEqual(first.get(), 2)
+            first.close()
+            second.close()
+
+
+@override_settings(FEED_SOURCE='db', FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=3600)
+class FragmentCacheTests(TestCase):
+    """Test cases for the versioned homepage section cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a contributor and a package."""
+        Contributor.objects.create(github_username='johndoe', name='John Doe', date_added=date(2024, 1, 1))
+        Package.objects.create(package_name='pkg-a', date_accepted='2024-02-01')
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        fragment_cache.get_cache().clear()
+        self.addCleanup(fragment_cache.get_cache().clear)
+        self.versions = {'a': '1', 'b': '1', 'c': None}
+        self.loads = []
+
+    def section(self, name):
+        """Return a section whose version is read from ``self.versions``."""
+        async def version():
+            return self.versions[name]
+
+        async def load():
+            self.loads.append(name)
+            return {'records': [f'{name}{self.versions[name]}']}
+
+        return Section(name, 'core/home/hero.html', version, load)
+
+    def test_only_changed_sections_are_rendered(self):
+        """Test that a new data version renders only its own section."""
+        sections = [self.section('a'), self.section('b')]
+        async_to_sync(fragment_cache.render)(sections)
+        self.loads.clear()
+
+        html, context = async_to_sync(fragment_cache.render)(sections)
+        self.assertEqual(self.loads, [])
+        self.assertEqual(set(html), {'a', 'b'})
+        self.assertEqual(context, {})
+
+        self.versions['b'] = '2'
+        async_to_sync(fragment_cache.render)(sections)
+        self.assertEqual(self.loads, ['b'])
+
+    def test_untracked_section_is_always_rendered(self):
+        """Test that a section without a version is never cached."""
+        sections = [self.section('c')]
+        async_to_sync(fragment_cache.render)(sections)
+        async_to_sync(fragment_cache.render)(sections)
+
+        self.assertEqual(self.loads, ['c', 'c'])
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+    def test_disabled_cache_renders_without_versions(self):
+        """Test that no version is read when the fragment cache is disabled."""
+        async def version():
+            raise AssertionError('version read')
+
+        async def load():
+            return {}
+
+        html, _ = async_to_sync(fragment_cache.render)([Section('hero', 'core/home/hero.html', version, load)])
+
+        self.assertIn('Welcome to pyOpenSci', html['hero'])
+
+    def test_blog_publish_renders_only_blog_section(self):
+        """Test that publishing a post re-renders the blog section alone."""
+        self.client.get(reverse('core:home'))
+        post = BlogPage(title='Fresh post', slug='fresh-post', date=date(2024, 3, 1))
+        Page.get_first_root_node().add_child(instance=post)
+        post.save_revision().publish()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('core:home'))
+
+        self.assertContains(response, 'Fresh post')
+        self.assertContains(response, 'John Doe')
+        self.assertContains(response, 'pkg-a')
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('core_contributor', tables)
+        self.assertNotIn('core_package', tables)
+
+    def test_author_edit_renders_blog_section(self):
+        """Test that renaming an author re-renders the blog section."""
+        author = Author.objects.create(name='Old Name')
+        post = BlogPage(title='Authored post', slug='authored-post', date=date(2024, 3, 1), author=author)
+        Page.get_first_root_node().add_child(instance=post)
+        post.save_revision().publish()
+        self.assertContains(self.client.get(reverse('core:home')), 'Old Name')
+
+        author.name = 'New Name'
+        author.save()
+
+        response = self.client.get(reverse('core:home'))
+        self.assertContains(response, 'New Name')
+        self.assertNotContains(response, 'Old Name')
+
+    def test_unchanged_home_loads_no_section_data(self):
+        """Test that a repeat homepage only reads the blog version."""
+        self.client.get(reverse('core:home'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('core:home'))
+
+        self.assertContains(response, 'John Doe')
+
+
+class ConditionalPageTests(TestCase):
+    """Test cases for ETag / Last-Modified on blog and event pages."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        root = Page.get_first_root_node()
+        self.post = root.add_child(instance=BlogPage(title='First post', slug='first-post', date=date(2024, 1, 1)))
+        self.event = root.add_child(instance=EventPage(
+            title='Sprint', slug='sprint', date=date(2024, 1, 1), start_date=date(2024, 6, 1),
+        ))
+
+    def test_response_has_strong_validators(self):
+        """Test that a detail page sends a strong ETag and Last-Modified."""
+        response = self.client.get(reverse('core:blog_page', args=['first-post']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['ETag'], r'^"[0-9a-f]{64}"$')
+        self.assertIn('Last-Modified', response)
+
+    def test_matching_etag_gets_304_without_rendering(self):
+        """Test that a current copy is confirmed with a single query."""
+        etag = self.client.get(reverse('core:blog_page', args=['first-post']))['ETag']
+
+        with patch.object(BlogPage, 'serve') as serve, self.assertNumQueries(1):
+            response = self.client.get(reverse('core:blog_page', args=['first-post']), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        serve.assert_not_called()
+
+    def test_if_modified_since_gets_304(self):
+        """Test that Last-Modified validates a copy too."""
+        last_modified = self.client.get(reverse('core:event_page', args=['sprint']))['Last-Modified']
+
+        response = self.client.get(reverse('core:event_page', args=['sprint']), HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_related_page_changes_etag(self):
+        """Test that a page listed as related changes the validators."""
+        etag = self.client.get(reverse('core:blog_page', args=['first-post']))['ETag']
+        Page.get_first_root_node().add_child(
+            instance=BlogPage(title='Second post', slug='second-post', date=date(2024, 2, 1)),
+        )
+
+        response = self.client.get(reverse('core:blog_page', args=['first-post']), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Second post')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_template_change_changes_etag(self):
+        """Test that the template version is part of the ETag."""
+        etag = self.client.get(reverse('core:blog_page', args=['first-post']))['ETag']
+
+        with patch('core.conditional.template_version', return_value='other'):
+            response = self.client.get(reverse('core:blog_page', args=['first-post']), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_author_edit_changes_etag(self):
+        """Test that editing or removing the page's author changes the validators."""
+        author = Author.objects.create(name='Jane Doe', slug='jane-doe')
+        BlogPage.objects.filter(pk=self.post.pk).update(author=author)
+        url = reverse('core:blog_page', args=['first-post'])
+        etag = self.client.get(url)['ETag']
+
+        author.name = 'Jane Smith'
+        author.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Jane Smith')
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        author.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Jane Smith')
+
+    def test_missing_page_is_404(self):
+        """Test that an unknown slug still gets a 404."""
+        response = self.client.get(reverse('core:blog_page', args=['missing']), HTTP_IF_NONE_MATCH='"x"')
+
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(
+    FEED_SOURCE='db', FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0, PROXY_CACHE_TIMEOUT=600,
+)
+class SurrogateKeyTests(TestCase):
+    """Test cases for surrogate keys, Cache-Control and proxy purges."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.proxy = StandInFeedServer()
+        self.addCleanup(self.proxy.stop)
+        self.client = Client()
+        self.author = Author.objects.create(name='Jane', slug='jane')
+        self.post = Page.get_first_root_node().add_child(instance=BlogPage(
+            title='First post', slug='first-post', date=date(2024, 1, 1), author=self.author,
+        ))
+
+    def keys(self, response):
+        """Return the surrogate keys of ``response``."""
+        return set(response['Surrogate-Key'].split())
+
+    def test_index_is_tagged_with_listed_pages(self):
+        """Test that the blog index names itself, its posts and their authors."""
+        response = self.client.get(reverse('core:blog_index'))
+
+        self.assertEqual(
+            self.keys(response), {'blog-index', f'blog:{self.post.pk}', f'author:{self.author.pk}'},
+        )
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('s-maxage=600', response['Cache-Control'])
+        self.assertIn('max-age=0', response['Cache-Control'])
+
+    def test_home_is_tagged_with_feeds(self):
+        """Test that the homepage names the feeds it shows."""
+        response = self.client.get(reverse('core:home'))
+
+        self.assertTrue({'home', 'blog-index', 'feed:contributors', 'feed:packages'} <= self.keys(response))
+
+    def test_detail_page_is_tagged(self):
+        """Test that a post names itself, its author and the post listings."""
+        response = self.client.get(reverse('core:blog_page', args=['first-post']))
+
+        self.assertEqual(
+            self.keys(response), {'blog-index', f'blog:{self.post.pk}', f'author:{self.author.pk}'},
+        )
+
+    def test_session_requests_are_private(self):
+        """Test that a response to a visitor with a session is not shared."""
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'session'
+
+        response = self.client.get(reverse('core:blog_index'))
+
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotIn('public', response['Cache-Control'])
+
+    def test_untagged_responses_are_left_alone(self):
+        """Test that only tagged responses get a Cache-Control header."""
+        response = self.client.get(reverse('core:feed_webhook'))
+
+        self.assertNotIn('Cache-Control', response)
+
+    def test_add_keys_merges(self):
+        """Test that keys are added once, keeping existing ones."""
+        response = add_surrogate_keys(HttpResponse(), 'a', 'b')
+        add_surrogate_keys(response, 'b', 'c')
+
+        self.assertEqual(response['Surrogate-Key'], 'a b c')
+
+    def test_publish_purges_after_commit(self):
+        """Test that publishing a post purges it and the post listings."""
+        with self.settings(PROXY_PURGE_ENDPOINTS=[self.proxy.url('/')]):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.post.save_revision().publish()
+                self.assertEqual(self.proxy.purges, [])
+
+        self.assertEqual(len(self.proxy.purges), 1)
+        method, path, headers = self.proxy.purges[0]
+        self.assertEqual((method, path), ('PURGE', '/'))
+        self.assertEqual(set(headers['Surrogate-Key'].split()), {f'blog:{self.post.pk}', 'blog-index'})
+
+    def test_author_change_purges_author(self):
+        """Test that editing an author purges the pages showing them."""
+        with self.settings(PROXY_PURGE_ENDPOINTS=[self.proxy.url('/')]):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.author.save()
+
+        self.assertEqual(self.proxy.purges[0][2]['Surrogate-Key'], f'author:{self.author.pk}')
+
+    def test_ban_endpoint_with_custom_header(self):
+        """Test that endpoints choose the method and the header."""
+        dispatcher = PurgeDispatcher(endpoints=[
+            {'url': self.proxy.url('/ban'), 'method': 'BAN', 'header': 'xkey-purge'},
+            self.proxy.url('/purge'),
+        ])
+
+        self.assertEqual(dispatcher.purge(['feed:contributors', 'feed:contributors']), 2)
+        self.assertEqual([(m, p) for m, p, _ in self.proxy.purges], [('BAN', '/ban'), ('PURGE', '/purge')])
+        headers = {name.lower(): value for name, value in self.proxy.purges[0][2].items()}
+        self.assertEqual(headers['xkey-purge'], 'feed:contributors')
+
+    def test_unreachable_endpoint_is_skipped(self):
+        """Test that a failed purge is logged and does not stop the others."""
+        dispatcher = PurgeDispatcher(endpoints=['http://127.0.0.1:1/', self.proxy.url('/')], timeout=1)
+
+        self.assertEqual(dispatcher.purge(['blog-index']), 1)
+        self.assertEqual(len(self.proxy.purges), 1)
+
+    @override_settings(FEED_SOURCE='yaml', FEED_CACHE_TTL=300)
+    def test_feed_refresh_purges_after_store(self):
+        """Test that a refreshed feed is purged once its new records are stored."""
+        feed_cache.set('contributors', ['old'])
+        self.addCleanup(feed_cache.clear)
+        stored = []
+
+        def check_purge(keys):
+            stored.append((keys, feed_cache.get('contributors', list)))
+
+        with self.settings(PROXY_PURGE_ENDPOINTS=[self.proxy.url('/')]), \
+                patch('core.utils._feed_loader', return_value=lambda: ['new']), \
+                patch('core.utils.feed_fetcher.expire'), patch('core.utils.shared_feeds.expire'), \
+                patch.object(purge_dispatcher, 'purge', side_effect=check_purge):
+            refresh_feeds(['contributors'])
+            deadline = time.monotonic() + 5
+            while not stored and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(stored, [(['feed:contributors'], ['new'])])
+
+
+    @override_settings(FEED_SOURCE='yaml', FEED_CACHE_TTL=300)
+    def test_stale_feed_refresh_purges_changed_feed(self):
+        """Test that a background refresh publishing new records purges the feed's pages."""
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        for cleanup in (feed_cache.clear, feed_fetcher.clear, clear_recency_indexes, shared_feeds.close):
+            self.addCleanup(cleanup)
+        first = contributor_records([{'github_username': 'a', 'date_added': '2024-01-01'}])
+        second = contributor_records([{'github_username': 'b', 'date_added': '2024-02-01'}])
+        purged = []
+
+        with self.settings(FEED_CACHE_DIR=cache_dir.name, PROXY_PURGE_ENDPOINTS=[self.proxy.url('/')]), \
+                patch('core.utils.load_contributor_records', side_effect=[first, second, list(second)]), \
+                patch.object(purge_dispatcher, 'purge', side_effect=purged.append), \
+                patch('core.cache.time.monotonic') as mock_monotonic:
+            mock_monotonic.return_value = 0
+            load_feed('contributors')
+            # Two refreshes once the feed is stale: new records, then the same ones
+            for refreshes, now in ((1, 1000), (2, 2000)):
+                shared_feeds.expire('contributors')
+                mock_monotonic.return_value = now
+                load_feed('contributors')
+                for _ in range(100):
+                    if feed_cache.stats()['refreshes'] == refreshes:
+                        break
+                    time.sleep(0.01)
+            records = list(load_feed('contributors'))
+
+        self.assertEqual(feed_cache.stats()['refreshes'], 2)
+        self.assertEqual(purged, [['feed:contributors']])
+        self.assertEqual(records, second)
+
+@override_settings(
+    FEED_SOURCE='db', FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0, FACET_CACHE_TIMEOUT=0,
+)
+class QueryBudgetTests(TestCase):
+    """Test cases keeping the query count of public routes independent of content size."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        seed_site(posts=2, events=2)
+
+    def test_public_routes_do_not_grow_with_content(self):
+        """Test that no route runs more queries on a site of over a thousand pages."""
+        counts = assert_constant_queries(self.client, lambda: seed_site(posts=1000, events=200))
+
+        self.assertEqual(BlogPage.objects.live().count(), 1002)
+        self.assertEqual(len(counts), len(PUBLIC_ROUTES))
+
+    def test_harness_catches_per_row_queries(self):
+        """Test that a page running a query per listed post fails the check."""
+        class PerRowClient:
+            def get(self, url):
+                for post in BlogPage.objects.live():
+                    list(post.tags.all())
+                return HttpResponse()
+
+        with self.assertRaisesRegex(AssertionError, r'/blog/: 3 -> 23 queries'):
+            assert_constant_queries(PerRowClient(), lambda: seed_site(posts=20, events=0), [('core:blog_index', ())])
+
+
+@override_settings(
+    FEED_SOURCE='db', FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0, FACET_CACHE_TIMEOUT=0,
+)
+class KeysetPaginationTests(TestCase):
+    """Test cases for cursor pagination of the blog and events indexes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        # 25 posts from 2023-12-20 to 2024-01-13; posts 5-9 share one date
+        self.posts = seed_pages(BlogPage, 25, first_date=date(2023, 12, 20))
+        BlogPage.objects.filter(pk__in=[post.pk for post in self.posts[5:10]]).update(date=date(2023, 12, 25))
+        self.queryset = BlogPage.objects.live()
+
+    def walk(self, paginator):
+        """Return the pages of ``paginator``, following next cursors from the first."""
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        return pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        """Test that following next cursors lists every post once, newest first, across equal dates."""
+        pages = self.walk(KeysetPaginator(self.queryset, 4, 'date'))
+
+        rows = [post for page in pages for post in page]
+        expected = list(self.queryset.order_by('-date', '-pk'))
+        self.assertEqual(rows, expected)
+        self.assertEqual([len(page) for page in pages], [4] * 6 + [1])
+        self.assertFalse(pages[0].has_previous())
+        self.assertIsNone(pages[-1].next_cursor)
+
+    def test_previous_cursor_returns_the_page_before(self):
+        """Test that the previous cursor of each page gives back the page before it."""
+        paginator = KeysetPaginator(self.queryset, 4, 'date')
+        pages = self.walk(paginator)
+
+        for before, page in zip(pages, pages[1:]):
+            self.assertEqual(list(paginator.page(page.previous_cursor)), list(before))
+        self.assertFalse(paginator.page(pages[1].previous_cursor).has_previous())
+
+    def test_invalid_cursor_gives_first_page(self):
+        """Test that a cursor that does not decode falls back to the first page."""
+        paginator = KeysetPaginator(self.queryset, 4, 'date')
+        first = list(paginator.page())
+
+        for token in ('garbage', 'WyJ4IiwxLDJd', paginator.encode_cursor('n', self.posts[0])[:-3]):
+            with self.subTest(token=token):
+                self.assertEqual(list(paginator.page(token)), first)
+        with self.assertRaises(InvalidCursor):
+            paginator.decode_cursor('garbage')
+
+    def test_year_filter_applies_to_cursor_pages(self):
+        """Test that the blog index keeps the year filter while following cursors."""
+        url = reverse('core:blog_index')
+        response = self.client.get(url, {'year': '2024'})
+        page = response.context['blog_posts']
+        self.assertEqual(len(page), 12)
+        self.assertContains(response, f'?cursor={page.next_cursor}&year=2024')
+
+        response = self.client.get(url, {'year': '2024', 'cursor': page.next_cursor})
+        rest = response.context['blog_posts']
+        self.assertEqual([post.date for post in rest], [date(2024, 1, 1)])
+        self.assertFalse(rest.has_next())
+
+    def test_deep_page_costs_the_same_as_first(self):
+        """Test that a page far into the archive runs as many queries as the first."""
+        seed_pages(BlogPage, 300, start=25, first_date=date(2020, 1, 1))
+        paginator = KeysetPaginator(BlogPage.objects.live(), 12, 'date')
+        last = self.walk(paginator)[-1]
+        url = reverse('core:blog_index')
+
+        first_queries = count_queries(self.client, url)
+        deep_queries = count_queries(self.client, f'{url}?cursor={last.previous_cursor}')
+
+        self.assertEqual(deep_queries, first_queries)
+
+    def test_offset_mode_keeps_numbered_pages(self):
+        """Test that INDEX_PAGINATION='offset' serves numbered pages."""
+        with override_settings(INDEX_PAGINATION='offset'):
+            response = self.client.get(reverse('core:blog_index'), {'page': '2'})
+
+        self.assertEqual(response.context['blog_posts'].number, 2)
+        self.assertContains(response, '?page=3')
+        self.assertNotContains(response, '?cursor=')
+
+    def test_events_index_pages_by_start_date(self):
+        """Test that the events index follows cursors on start date."""
+        events = seed_pages(EventPage, 20, first_date=date(2020, 1, 1))
+        url = reverse('core:events_index')
+
+        first = self.client.get(url).context['events']
+        second = self.client.get(url, {'cursor': first.next_cursor}).context['events']
+
+        self.assertEqual(len(first) + len(second), len(events))
+        self.assertEqual(list(first) + list(second), list(EventPage.objects.live().order_by('-start_date', '-pk')))
+
+
+@override_settings(
+    FEED_SOURCE='db', FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0, FACET_CACHE_TIMEOUT=300,
+)
+class YearFacetTests(TestCase):
+    """Test cases for the cached year filters of the blog and events indexes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        year_facets.get_cache().clear()
+        self.addCleanup(year_facets.get_cache().clear)
+        # 2023-12-20 to 2024-01-13: 12 posts in 2023, 13 in 2024
+        self.posts = seed_pages(BlogPage, 25, first_date=date(2023, 12, 20))
+
+    def publish_blog_post(self, title, day):
+        """Create and publish a blog post under the root page."""
+        post = BlogPage(title=title, slug=title.lower().replace(' ', '-'), date=day)
+        Page.get_first_root_node().add_child(instance=post)
+        post.save_revision().publish()
+        return post
+
+    def test_counts_live_pages_per_year(self):
+        """Test that the facets count live pages by year, newest first."""
+        BlogPage.objects.filter(pk=self.posts[0].pk).update(live=False)
+
+        self.assertEqual(year_facets.get(BlogPage), [YearFacet(2024, 13), YearFacet(2023, 11)])
+        self.assertEqual(year_facets.get(EventPage), [])
+
+    def test_index_reads_facets_from_cache(self):
+        """Test that the blog index shows counts and runs no year or count query once cached."""
+        url = reverse('core:blog_index')
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertContains(response, '2024 (13)')
+        self.assertContains(response, '2023 (12)')
+        self.assertFalse([query['sql'] for query in queries if 'COUNT(' in query['sql'].upper()])
+
+    def test_offset_pages_take_count_from_facets(self):
+        """Test that numbered pages of a year get their count from the facets."""
+        url = reverse('core:blog_index')
+        self.client.get(url)
+
+        with override_settings(INDEX_PAGINATION='offset'), CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'year': '2024', 'page': '2'})
+
+        page = response.context['blog_posts']
+        self.assertEqual((page.paginator.count, page.paginator.num_pages, len(page)), (13, 2, 1))
+        self.assertFalse([query['sql'] for query in queries if 'COUNT(' in query['sql'].upper()])
+
+    def test_publish_and_unpublish_recount(self):
+        """Test that publishing and unpublishing a post update the facets of its type only."""
+        events_key = year_facets.key(EventPage)
+        year_facets.get(BlogPage)
+
+        post = self.publish_blog_post('Future post', date(2025, 6, 1))
+        self.assertEqual(year_facets.get(BlogPage)[0], YearFacet(2025, 1))
+        self.assertEqual(year_facets.key(EventPage), events_key)
+
+        post.unpublish()
+        self.assertEqual(year_facets.get(BlogPage)[0], YearFacet(2024, 13))
+
+    def test_delete_recounts(self):
+        """Test that deleting a post updates the facets."""
+        post = self.publish_blog_post('Future post', date(2025, 6, 1))
+        self.assertEqual(year_facets.get(BlogPage)[0], YearFacet(2025, 1))
+
+        post.delete()
+
+        self.assertEqual(year_facets.get(BlogPage)[0], YearFacet(2024, 13))
+
+
+@override_settings(
+    FEED_SOURCE='db', FEED_CACHE_DIR=None, PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=3600, FACET_CACHE_TIMEOUT=0,
+    UPCOMING_EVENTS_LIMIT=3,
+)
+class UpcomingEventsTests(TestCase):
+    """Test cases for the cached upcoming events block of the events index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        upcoming_events.get_cache().clear()
+        self.addCleanup(upcoming_events.get_cache().clear)
+        # Events from 10 days ago to 9 days from now, one per day
+        self.today = timezone.localdate()
+        self.events = seed_pages(EventPage, 20, first_date=self.today - timedelta(days=10))
+
+    def publish_event(self, title, day):
+        """Create and publish an event under the root page."""
+        event = EventPage(title=title, slug=title.lower().replace(' ', '-'), date=day, start_date=day)
+        Page.get_first_root_node().add_child(instance=event)
+        event.save_revision().publish()
+        return event
+
+    def test_block_lists_next_events_only(self):
+        """Test that the block lists the next few events and the archive lists only past ones."""
+        response = self.client.get(reverse('core:events_index'))
+
+        for event in self.events[10:13]:
+            self.assertContains(response, f'/events/{event.slug}/')
+        self.assertNotContains(response, f'/events/{self.events[13].slug}/')
+        self.assertTrue(all(event.start_date < self.today for event in response.context['events']))
+        self.assertEqual(len(response.context['events']), 10)
+        self.assertIn(f'event:{self.events[10].pk}', response.headers['Surrogate-Key'].split())
+
+    def test_block_is_rendered_once(self):
+        """Test that later requests reuse the rendered block without querying it."""
+        with patch.object(UpcomingEvents, 'page', autospec=True, side_effect=UpcomingEvents.page) as page:
+            first = self.client.get(reverse('core:events_index'))
+            second = self.client.get(reverse('core:events_index'))
+
+        self.assertEqual(page.call_count, 1)
+        self.assertContains(second, f'/events/{self.events[10].slug}/')
+        self.assertEqual(first.headers['Surrogate-Key'], second.headers['Surrogate-Key'])
+
+    def test_every_upcoming_event_is_reachable(self):
+        """Test that events beyond the block's limit are linked from it, each shown once."""
+        url = reverse('core:events_index')
+        upcoming = {event.slug for event in self.events[10:]}
+        shown = []
+        response = self.client.get(url)
+        pages = 1
+        while True:
+            shown += [slug for slug in re.findall(r'/events/(event-\d+)/', response.content.decode()) if slug in upcoming]
+            next_link = re.search(r'\?upcoming=([\w-]+)#upcoming-events"[^>]*>\s*More upcoming', response.content.decode())
+            if next_link is None:
+                break
+            response = self.client.get(url, {'upcoming': next_link.group(1)})
+            pages += 1
+
+        self.assertEqual(sorted(shown), sorted(upcoming))
+        self.assertEqual(pages, 4)
+        self.assertContains(response, 'Sooner')
+
+        response = self.client.get(url, {'year': str(self.today.year)})
+        self.assertTrue(all(event.start_date < self.today for event in response.context['events']))
+
+    def test_links_keep_archive_query(self):
+        """Test that the upcoming links keep the year filter and archive cursor."""
+        url = reverse('core:events_index')
+        archive = EventPage.objects.live()
+        cursor = KeysetPaginator(archive, 12, 'start_date').encode_cursor(NEXT, self.events[5])
+        params = {'year': str(self.today.year), 'cursor': cursor}
+        first = self.client.get(url, params)
+        self.assertNotIn(self.events[9], first.context['events'])
+
+        link = re.search(r'href="\?([^"#]+)#upcoming-events"[^>]*>\s*More upcoming', first.content.decode())
+        query = parse_qs(html.unescape(link.group(1)))
+        self.assertEqual(query['year'], [params['year']])
+        self.assertEqual(query['cursor'], [cursor])
+        self.assertIn('upcoming', query)
+
+        second = self.client.get(url, {name: values[0] for name, values in query.items()})
+        self.assertEqual(list(second.context['events']), list(first.context['events']))
+        self.assertEqual(second.context['selected_year'], first.context['selected_year'])
+        self.assertNotContains(second, f'/events/{self.events[10].slug}/')
+
+    def test_publish_and_unpublish_render_again(self):
+        """Test that publishing and unpublishing an event refresh the block."""
+        upcoming_events.render(self.today)
+
+        event = self.publish_event('Launch party', self.today)
+        self.assertIn('/events/launch-party/', upcoming_events.render(self.today)[0])
+
+        event.unpublish()
+        self.assertNotIn('/events/launch-party/', upcoming_events.render(self.today)[0])
+
+    def test_block_moves_on_at_midnight(self):
+        """Test that the next day gets its own block and entries expire at local midnight."""
+        html, _ = upcoming_events.render(self.today)
+        tomorrow, _ = upcoming_events.render(self.today + timedelta(days=1))
+
+        self.assertIn(f'/events/{self.events[10].slug}/', html)
+        self.assertNotIn(f'/events/{self.events[10].slug}/', tomorrow)
+        self.assertIn(f'/events/{self.events[13].slug}/', tomorrow)
+        self.assertEqual(seconds_until_midnight(datetime(2024, 5, 1, 23, 0, tzinfo=dt_timezone.utc)), 3600)
+        with patch('core.upcoming.seconds_until_midnight', return_value=90):
+            self.assertEqual(upcoming_events.get_timeout(), 90)
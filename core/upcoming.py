@@ -0,0 +1,215 @@
+"""
+Cached "Upcoming Events" block of the events index.
+
+The block lists the next ``UPCOMING_EVENTS_LIMIT`` live events starting
+today or later. Its content only changes when an event is published,
+unpublished or deleted, or when the day changes and today's events stop or
+start qualifying. ``UpcomingEvents`` therefore renders it once and keeps the
+HTML in the ``PAGE_CACHE_ALIAS`` cache under a key made of today's local
+date and a generation counter shared by all workers (see ``core.shared``),
+until the next local midnight at the latest. Publishing, unpublishing or
+deleting an event increments the counter; the next request renders again.
+
+When more events are coming up than the block shows, it links to the next
+ones with a keyset cursor in the ``upcoming`` query parameter; those later
+pages are rare and rendered on request. The links keep the other query
+parameters of the index (its year filter and archive cursor), so the block
+is cached once per combination of them.
+
+The surrogate keys of the listed events are cached with the HTML, so the
+events index can tag its response without loading them.
+"""
+
+import hashlib
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import SafeString, mark_safe
+
+from publications.models import EventPage
+
+from .fragments import DEFAULT_FRAGMENT_CACHE_TIMEOUT
+from .pagecache import PAGE_QUERY_PARAMS
+from .pagination import KeysetPage, KeysetPaginator
+from .shared import shared_feeds
+from .surrogate import page_keys
+
+logger = logging.getLogger(__name__)
+
+# Default for the UPCOMING_EVENTS_LIMIT setting
+DEFAULT_UPCOMING_EVENTS_LIMIT = 6
+
+# Generation counter bumped when the upcoming events must be rendered again
+UPCOMING_EVENTS_COUNTER = 'upcoming-events'
+
+# Template of the block
+UPCOMING_EVENTS_TEMPLATE = 'core/events/upcoming.html'
+
+# Query parameter carrying the cursor of a later page of upcoming events
+UPCOMING_CURSOR_PARAM = 'upcoming'
+
+
+def seconds_until_midnight(now: Optional[datetime] = None) -> int:
+    """
+    Return the number of seconds until the next local midnight.
+
+    Parameters
+    ----------
+    now : datetime, optional
+        Aware current time; defaults to ``timezone.now()``.
+
+    Returns
+    -------
+    int
+        Seconds, at least 1.
+    """
+    now = timezone.localtime(now)
+    midnight = timezone.make_aware(datetime.combine(now.date() + timedelta(days=1), time.min))
+    return max(1, int((midnight - now).total_seconds()))
+
+
+class UpcomingEvents:
+    """
+    Render the upcoming events block, cached until midnight or a change.
+
+    Parameters
+    ----------
+    alias : str, optional
+        Django cache to use. Defaults to the ``PAGE_CACHE_ALIAS`` setting,
+        or ``default``.
+    limit : int, optional
+        Number of events shown. Defaults to the ``UPCOMING_EVENTS_LIMIT``
+        setting.
+    """
+
+    def __init__(self, alias: Optional[str] = None, limit: Optional[int] = None):
+        self.alias = alias
+        self.limit = limit
+
+    def get_limit(self) -> int:
+        """Return the number of events shown."""
+        if self.limit is not None:
+            return self.limit
+        return getattr(settings, 'UPCOMING_EVENTS_LIMIT', DEFAULT_UPCOMING_EVENTS_LIMIT)
+
+    def get_timeout(self, now: Optional[datetime] = None) -> float:
+        """
+        Return the number of seconds the block is kept.
+
+        That is the time left until local midnight, capped by the
+        ``FRAGMENT_CACHE_TIMEOUT`` setting; 0 or less disables the cache.
+        """
+        timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', DEFAULT_FRAGMENT_CACHE_TIMEOUT)
+        if timeout <= 0:
+            return timeout
+        return min(timeout, seconds_until_midnight(now))
+
+    def get_cache(self):
+        """Return the Django cache holding the block."""
+        return caches[self.alias or getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+    def key(self, today: date, query: str = '') -> str:
+        """Return the cache key of the block on ``today``, linking with ``query``."""
+        version = shared_feeds.counter(UPCOMING_EVENTS_COUNTER).get()
+        key = f"upcoming-events:{today.isoformat()}:{self.get_limit()}:{version}"
+        if query:
+            key += f":{hashlib.sha256(query.encode('utf-8')).hexdigest()}"
+        return key
+
+    @staticmethod
+    def query(params: Optional[Mapping[str, str]]) -> str:
+        """Return the query parameters the block's links keep, URL-encoded."""
+        if not params:
+            return ''
+        return urlencode([
+            (name, params[name]) for name in PAGE_QUERY_PARAMS
+            if name != UPCOMING_CURSOR_PARAM and name in params
+        ])
+
+    def page(self, today: date, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Return a page of the live events starting on or after ``today``.
+
+        Parameters
+        ----------
+        today : date
+            Local date.
+        cursor : str, optional
+            Token of a later page; the soonest events if omitted or invalid.
+
+        Returns
+        -------
+        KeysetPage
+            At most ``get_limit()`` events, soonest first.
+        """
+        events = EventPage.objects.live().filter(start_date__gte=today)
+        return KeysetPaginator(events, self.get_limit(), 'start_date', descending=False).page(cursor)
+
+    def render(
+        self,
+        today: Optional[date] = None,
+        cursor: Optional[str] = None,
+        params: Optional[Mapping[str, str]] = None,
+    ) -> Tuple[SafeString, List[str]]:
+        """
+        Return the HTML of the block and the surrogate keys of its events.
+
+        Parameters
+        ----------
+        today : date, optional
+            Local date; defaults to ``timezone.localdate()``.
+        cursor : str, optional
+            Token of a later page of upcoming events. Only the first page is
+            cached.
+        params : mapping, optional
+            Query parameters of the index request, e.g. ``request.GET``; the
+            links to other pages of upcoming events keep those the index
+            reads.
+
+        Returns
+        -------
+        tuple of (SafeString, list of str)
+            Rendered block and surrogate keys.
+        """
+        today = today or timezone.localdate()
+        timeout = self.get_timeout() if not cursor else 0
+        query = self.query(params)
+        key = self.key(today, query)
+        if timeout > 0:
+            cached = self.get_cache().get(key)
+            if cached is not None:
+                return mark_safe(cached[0]), cached[1]
+
+        events = self.page(today, cursor)
+        html = render_to_string(UPCOMING_EVENTS_TEMPLATE, {'upcoming_events': events, 'archive_query': query})
+        keys = page_keys(events)
+        if timeout > 0:
+            self.get_cache().set(key, (html, keys), timeout)
+            logger.debug(f"Rendered {len(events)} upcoming events for {today}")
+        return mark_safe(html), keys
+
+    def invalidate(self) -> int:
+        """
+        Move the block to a new key, in all workers.
+
+        Returns
+        -------
+        int
+            The new version of the block.
+        """
+        return shared_feeds.counter(UPCOMING_EVENTS_COUNTER).increment()
+
+
+def invalidate_upcoming_on_change(sender, **kwargs):
+    """Signal receiver rendering the upcoming events again when an event is published, unpublished or deleted."""
+    upcoming_events.invalidate()
+
+
+# Process-wide block used by the events index
+upcoming_events = UpcomingEvents()
@@ -9,4 +9,5 @@ urlpatterns = [
     path('events/', views.events_index, name='events_index'),
     path('blog/<slug:slug>/', views.serve_blog_page, name='blog_page'),
     path('events/<slug:slug>/', views.serve_event_page, name='event_page'),
+    path('webhooks/feeds/', views.feed_webhook, name='feed_webhook'),
 ]
\ No newline at end of file
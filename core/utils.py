@@ -5,17 +5,54 @@ This module provides functions to fetch and parse contributor and package data f
 following the same format used by the Jekyll site and pyosMeta package.
 """
 
-from ruamel.yaml import YAML, YAMLError
+from ruamel.yaml import YAMLError
 import logging
-from typing import List, Dict, Any
-from urllib.request import urlopen
+from functools import partial
+from typing import List, Dict, Any, Tuple
 from urllib.error import URLError
-from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .cache import feed_cache
+from .feeds import feed_loader
+from .http import feed_fetcher
+from .models import Contributor, Package
+from .normalize import generate_github_avatar_url, generate_github_profile_url  # noqa: F401
+from .parsers import JSONParser, get_json_mirror, get_parser
+from .records import SCHEMA_VERSION, ContributorRecord, PackageRecord, build_records
+from .recency import get_recency_index, most_recent, recency_order
+from .shared import SharedFeed, shared_feeds
+from .surrogate import feed_key, purge_dispatcher
 
 logger = logging.getLogger(__name__)
 
-# Initialize YAML parser with safe loading
-yaml = YAML(typ='safe')
+# Fastest available safe YAML loader, and the loader for JSON mirrors
+yaml = get_parser()
+json_parser = JSONParser()
+
+# Default locations of the pyosMeta YAML feeds
+CONTRIBUTORS_URL = "https://raw.githubusercontent.com/pyOpenSci/pyopensci.github.io/main/_data/contributors.yml"
+PACKAGES_URL = "https://raw.githubusercontent.com/pyOpenSci/pyopensci.github.io/main/_data/packages.yml"
+
+# Where get_recent_contributors / get_recent_packages read from
+FEED_SOURCES = ('yaml', 'db')
+
+# Timeouts in seconds used when the FEED_CONNECT_TIMEOUT / FEED_TIMEOUTS
+# settings do not say otherwise
+DEFAULT_FEED_CONNECT_TIMEOUT = 5
+DEFAULT_FEED_TIMEOUT = 10
+
+# Generation counter bumped by every sync_pyosmeta run
+SYNC_COUNTER = 'pyosmeta-sync'
+
+# Feed name to the date field that orders it by recency and whether later
+# records win ties. contributors.yml is appended to, so later entries win;
+# packages compare by parsed date_accepted, so "2024-1-5" and "2024-01-05" agree
+RECENCY_FIELDS = {
+    'contributors': ('date_added', True),
+    'packages': ('date_accepted', False),
+}
 
 
 class ContributorDataError(Exception):
@@ -28,6 +65,51 @@ class PackageDataError(Exception):
     pass
 
 
+def get_feed_source() -> str:
+    """
+    Return the configured source for contributor and package data.
+
+    Returns
+    -------
+    str
+        ``'yaml'`` to read the GitHub YAML feeds, or ``'db'`` to query the
+        ``Contributor`` and ``Package`` tables filled by ``sync_pyosmeta``.
+
+    Raises
+    ------
+    ImproperlyConfigured
+        If the ``FEED_SOURCE`` setting is not one of ``FEED_SOURCES``.
+    """
+    source = getattr(settings, 'FEED_SOURCE', 'yaml')
+    if source not in FEED_SOURCES:
+        raise ImproperlyConfigured(
+            f"FEED_SOURCE must be one of {', '.join(FEED_SOURCES)}, not {source!r}"
+        )
+    return source
+
+
+def get_feed_timeout(name: str) -> Tuple[float, float]:
+    """
+    Return the connect and read timeouts used when fetching a feed.
+
+    Parameters
+    ----------
+    name : str
+        Feed name, ``contributors`` or ``packages``.
+
+    Returns
+    -------
+    tuple of float
+        ``(connect, read)`` timeouts in seconds. The connect timeout comes
+        from the ``FEED_CONNECT_TIMEOUT`` setting and the read timeout from
+        the feed's ``FEED_TIMEOUTS`` entry, with defaults of
+        ``DEFAULT_FEED_CONNECT_TIMEOUT`` and ``DEFAULT_FEED_TIMEOUT``.
+    """
+    timeouts = getattr(settings, 'FEED_TIMEOUTS', None) or {}
+    connect_timeout = getattr(settings, 'FEED_CONNECT_TIMEOUT', DEFAULT_FEED_CONNECT_TIMEOUT)
+    return connect_timeout, timeouts.get(name, DEFAULT_FEED_TIMEOUT)
+
+
 def fetch_contributors_yaml(url: str = None) -> List[Dict[str, Any]]:
     """
     Fetch contributor data from YAML source.
@@ -47,33 +129,157 @@ def fetch_contributors_yaml(url: str = None) -> List[Dict[str, Any]]:
     ContributorDataError
         If data cannot be fetched or parsed.
     """
-    if url is None:
-        url = "https://raw.githubusercontent.com/pyOpenSci/pyopensci.github.io/main/_data/contributors.yml"
-    
+    return _fetch_feed(url or CONTRIBUTORS_URL, 'contributors', ContributorDataError)
+
+
+def load_contributor_records(url: str = None) -> List[ContributorRecord]:
+    """
+    Fetch contributor data and convert it to compact records.
+
+    Only the records are kept between calls, not the parsed dictionaries, and
+    they are rebuilt only when the feed content changes.
+
+    Parameters
+    ----------
+    url : str, optional
+        URL to fetch YAML from. If None, uses the default pyOpenSci GitHub URL.
+
+    Returns
+    -------
+    list of ContributorRecord
+        Contributors in feed order.
+
+    Raises
+    ------
+    ContributorDataError
+        If data cannot be fetched or parsed.
+    """
+    return _fetch_feed(
+        url or CONTRIBUTORS_URL, 'contributors', ContributorDataError,
+        build=ContributorRecord.from_yaml,
+    )
+
+
+def _fetch_feed(url, label, error_class, build=None):
+    """
+    Fetch and parse a YAML list feed, wrapping failures in ``error_class``.
+
+    If a JSON mirror of ``url`` is configured it is read instead, falling
+    back to the YAML feed if the mirror cannot be loaded. If ``build`` is
+    given, each entry is converted with it and only the converted list is
+    remembered by the fetcher, which also snapshots it to disk so that other
+    workers can load it instead of parsing.
+    """
+    mirror = get_json_mirror(url)
+    if mirror is not None:
+        try:
+            return _load_feed(mirror, label, error_class, json_parser, build)
+        except error_class as e:
+            logger.warning(f"Falling back to YAML {label} feed: {e}")
+    return _load_feed(url, label, error_class, yaml, build)
+
+
+def _load_feed(url, label, error_class, parser, build=None):
+    """Fetch ``url`` and parse it with ``parser``; see ``_fetch_feed``."""
+    def parse(text):
+        data = parser.load(text)
+        if isinstance(data, list) and build is not None:
+            data = build_records(data, build)
+        return data
+
+    timeout = get_feed_timeout(label)
+    # A copy another worker fetched within the cache TTL is as good as ours
+    max_age = feed_cache.get_ttl()
+
     try:
-        with urlopen(url) as response:
-            yaml_content = response.read().decode('utf-8')
-            contributors = yaml.load(yaml_content)
-            
-        if not isinstance(contributors, list):
-            raise ContributorDataError("YAML data should be a list of contributors")
-            
-        logger.info(f"Successfully fetched {len(contributors)} contributors from {url}")
-        return contributors
-        
+        # Conditional request shared by concurrent callers; an unchanged body
+        # is not parsed again
+        if build is not None:
+            data = feed_fetcher.fetch_parsed(
+                url, parse, cache_key=f"{url}#records", snapshot_version=SCHEMA_VERSION,
+                timeout=timeout, max_age=max_age,
+            )
+        else:
+            data = feed_fetcher.fetch_parsed(url, parse, timeout=timeout, max_age=max_age)
+
+        if not isinstance(data, list):
+            raise error_class(f"YAML data should be a list of {label}")
+
+        logger.info(f"Successfully fetched {len(data)} {label} from {url}")
+        return data
+
     except URLError as e:
-        logger.error(f"Failed to fetch contributors from {url}: {e}")
-        raise ContributorDataError(f"Network error: {e}")
+        logger.error(f"Failed to fetch {label} from {url}: {e}")
+        raise error_class(f"Network error: {e}")
     except YAMLError as e:
         logger.error(f"Failed to parse YAML: {e}")
-        raise ContributorDataError(f"YAML parsing error: {e}")
+        raise error_class(f"YAML parsing error: {e}")
     except Exception as e:
-        logger.error(f"Unexpected error fetching contributors: {e}")
-        raise ContributorDataError(f"Unexpected error: {e}")
+        logger.error(f"Unexpected error fetching {label}: {e}")
+        raise error_class(f"Unexpected error: {e}")
+
 
+def _load_shared(name, load, purge=False):
+    """
+    Load feed ``name`` for the feed cache, sharing it with other workers.
 
+    When feeds can be shared (``FEED_CACHE_DIR`` is set), the records from
+    ``load`` are published to a memory-mapped file and a view of that file
+    is returned instead; see ``core.shared``. A version that any worker
+    published within the cache TTL is used without loading at all.
+    Nothing is shared while the feed cache is disabled.
 
-def get_recent_contributors(count: int = 4) -> List[Dict[str, Any]]:
+    Every worker reads a newly published version straight away, so with
+    ``purge`` the pages showing the feed are purged from the reverse
+    proxies as soon as a load publishes different records.
+    """
+    feed = shared_feeds.get(name)
+    ttl = feed_cache.get_ttl()
+    if feed is None or ttl <= 0:
+        return load()
+    if feed.age() < ttl:
+        return feed
+
+    records = load()
+    date_key, newest_last = RECENCY_FIELDS[name]
+    published = feed.generation
+    try:
+        generation = shared_feeds.publish(name, records, recency_order(records, date_key, newest_last))
+    except OSError as e:
+        logger.warning(f"Could not share the {name} feed with other workers: {e}")
+        return records
+
+    # The shared file holds the records now, so no worker keeps its own copy
+    feed_fetcher.forget_parsed(records)
+    if purge and published and generation != published:
+        _purge_feed(name)
+    return feed
+
+
+def _feed_loader(name, purge=True):
+    """Return the feed cache loader of feed ``name``, purging pages when it publishes changes."""
+    load = {'contributors': load_contributor_records, 'packages': load_package_records}[name]
+    return partial(_load_shared, name, load, purge)
+
+
+def _recent_records(name, records, count):
+    """
+    Return the ``count`` most recent feed records.
+
+    A shared feed is stored in recency order. Otherwise, while the feed cache
+    is enabled the same feed version is read many times, so it is sorted once
+    and sliced; without the cache a top-k selection is cheaper.
+    """
+    if isinstance(records, SharedFeed):
+        return records.recent(count)
+
+    date_key, newest_last = RECENCY_FIELDS[name]
+    if feed_cache.get_ttl() > 0:
+        return get_recency_index(name, records, date_key, newest_last).recent(count)
+    return most_recent(records, count, date_key, newest_last)
+
+
+def get_recent_contributors(count: int = 4) -> List[ContributorRecord]:
     """
     Get the most recent contributors.
     
@@ -84,16 +290,17 @@ def get_recent_contributors(count: int = 4) -> List[Dict[str, Any]]:
         
     Returns
     -------
-    list of dict
-        List of recent contributor dictionaries, sorted by date_added descending.
+    list of ContributorRecord
+        List of recent contributors, sorted by date_added descending.
     """
+    if get_feed_source() == 'db':
+        return get_recent_contributors_from_db(count)
+
     try:
-        contributors = fetch_contributors_yaml()
-        
-        # Return most recent contributors (last items in list)
-        reversed_contributors = list(reversed(contributors))
-        
-        return reversed_contributors[:count]
+        contributors = load_feed('contributors')
+
+        # Newest by date_added
+        return _recent_records('contributors', contributors, count)
         
     except ContributorDataError as e:
         logger.error(f"Failed to get recent contributors: {e}")
@@ -119,32 +326,38 @@ def fetch_packages_yaml(url=None):
         
     Raises
     ------
-    ContributorDataError
+    PackageDataError
         If data cannot be fetched or parsed.
     """
-    if url is None:
-        url = "https://raw.githubusercontent.com/pyOpenSci/pyopensci.github.io/main/_data/packages.yml"
-    
-    try:
-        with urlopen(url) as response:
-            yaml_content = response.read().decode('utf-8')
-            packages = yaml.load(yaml_content)
-            
-        if not isinstance(packages, list):
-            raise PackageDataError("YAML data should be a list of packages")
-            
-        logger.info(f"Successfully fetched {len(packages)} packages from {url}")
-        return packages
-        
-    except URLError as e:
-        logger.error(f"Failed to fetch packages from {url}: {e}")
-        raise PackageDataError(f"Network error: {e}")
-    except YAMLError as e:
-        logger.error(f"Failed to parse YAML: {e}")
-        raise PackageDataError(f"YAML parsing error: {e}")
-    except Exception as e:
-        logger.error(f"Unexpected error fetching packages: {e}")
-        raise PackageDataError(f"Unexpected error: {e}")
+    return _fetch_feed(url or PACKAGES_URL, 'packages', PackageDataError)
+
+
+def load_package_records(url: str = None) -> List[PackageRecord]:
+    """
+    Fetch package data and convert it to compact records.
+
+    Only the records are kept between calls, not the parsed dictionaries, and
+    they are rebuilt only when the feed content changes.
+
+    Parameters
+    ----------
+    url : str, optional
+        URL to fetch YAML from. If None, uses the default pyOpenSci GitHub URL.
+
+    Returns
+    -------
+    list of PackageRecord
+        Packages in feed order.
+
+    Raises
+    ------
+    PackageDataError
+        If data cannot be fetched or parsed.
+    """
+    return _fetch_feed(
+        url or PACKAGES_URL, 'packages', PackageDataError,
+        build=PackageRecord.from_yaml,
+    )
 
 
 def get_recent_packages(count=3):
@@ -158,16 +371,17 @@ def get_recent_packages(count=3):
         
     Returns
     -------
-    list of dict
-        List of recent package dictionaries, sorted by date_accepted descending.
+    list of PackageRecord
+        List of recent packages, sorted by date_accepted descending.
     """
+    if get_feed_source() == 'db':
+        return get_recent_packages_from_db(count)
+
     try:
-        packages = fetch_packages_yaml()
-        
-        # Sort packages by date_accepted descending (most recent first)
-        sorted_packages = sorted(packages, key=lambda x: x.get('date_accepted', ''), reverse=True)
-        
-        return sorted_packages[:count]
+        packages = load_feed('packages')
+
+        # Newest by date_accepted
+        return _recent_records('packages', packages, count)
         
     except PackageDataError as e:
         logger.error(f"Failed to get recent packages: {e}")
@@ -177,37 +391,182 @@ def get_recent_packages(count=3):
         return []
 
 
-def generate_github_avatar_url(github_image_id: int) -> str:
+def prefetch_feeds(names=('contributors', 'packages')) -> None:
     """
-    Generate GitHub avatar URL from image ID.
-    
+    Load feeds into the feed cache concurrently.
+
+    Call this before reading several feeds, e.g. with
+    ``get_recent_contributors`` and ``get_recent_packages``, so that a cold
+    cache costs the slowest feed instead of the sum of all of them. Each
+    fetch is bounded by its ``FEED_TIMEOUTS`` entry. Failures are logged and
+    left for the readers to handle.
+
+    Does nothing when data comes from the database, or when the feed cache is
+    disabled and the loaded feeds would not be kept.
+
     Parameters
     ----------
-    github_image_id : int
-        GitHub user's image ID.
-        
+    names : iterable of str, default ('contributors', 'packages')
+        Feeds to load.
+    """
+    if get_feed_source() == 'db' or feed_cache.get_ttl() <= 0:
+        return
+
+    feed_loader.load({name: partial(load_feed, name) for name in names})
+
+
+def load_feed(name: str):
+    """
+    Return the records of a feed through the feed cache.
+
+    Loads the feed if it is not cached yet and starts a background refresh
+    when it is stale; the ``get_recent_*`` readers go through here too. Lets
+    callers that only need ``get_feed_version`` keep the feed current without
+    reading records. When a refresh finds different records, the pages
+    showing the feed are purged from the reverse proxies once they are
+    stored, instead of waiting for their ``s-maxage`` to run out.
+
+    Parameters
+    ----------
+    name : str
+        ``'contributors'`` or ``'packages'``.
+
     Returns
     -------
-    str
-        GitHub avatar URL.
+    sequence
+        All records of the feed.
+
+    Raises
+    ------
+    ContributorDataError, PackageDataError
+        If the feed cannot be loaded.
     """
-    return f"https://avatars.githubusercontent.com/u/{github_image_id}?s=400&v=4"
+    return feed_cache.get(name, _feed_loader(name), on_change=_purge_feed)
+
 
+def _purge_feed(name):
+    """Purge the pages showing feed ``name`` from the reverse proxies."""
+    purge_dispatcher.purge_on_commit([feed_key(name)])
 
-def generate_github_profile_url(github_username: str) -> str:
+
+def refresh_feeds(names=('contributors', 'packages')) -> List[str]:
     """
-    Generate GitHub profile URL from username.
-    
+    Mark feeds dirty and reload them in the background.
+
+    Called when the upstream is known to have changed, e.g. from the feed
+    webhook. The stored copies are expired so that the reload asks the
+    server instead of reusing a copy that is still within the cache TTL,
+    while readers keep getting the old records until it finishes.
+
+    Once a feed is reloaded, the pages showing it are purged from the
+    reverse proxies (see ``core.surrogate``). Does nothing when data comes
+    from the database.
+
     Parameters
     ----------
-    github_username : str
-        GitHub username.
-        
+    names : iterable of str, default ('contributors', 'packages')
+        Feeds to refresh.
+
+    Returns
+    -------
+    list of str
+        Names of the feeds whose refresh was started. A feed already being
+        refreshed is refreshed once more after that finishes instead.
+    """
+    if get_feed_source() == 'db':
+        return []
+
+    urls = {'contributors': CONTRIBUTORS_URL, 'packages': PACKAGES_URL}
+    started = []
+    for name in names:
+        for feed_url in (urls[name], get_json_mirror(urls[name])):
+            if feed_url is not None:
+                feed_fetcher.expire(feed_url)
+        shared_feeds.expire(name)
+        # Purged once the refresh is done, whichever worker published the change
+        if feed_cache.refresh(name, _feed_loader(name, purge=False), on_done=_purge_feed):
+            started.append(name)
+    return started
+
+
+def get_feed_version(names=('contributors', 'packages')) -> str:
+    """
+    Return a token that changes whenever the records of the feeds change.
+
+    Used to key cached pages and fragments built from the feeds. Reading it
+    loads nothing: it combines the feed cache's version of each feed with
+    the generation of its shared file, which another worker may have
+    published.
+
+    Parameters
+    ----------
+    names : iterable of str, default ('contributors', 'packages')
+        Feeds to cover.
+
     Returns
     -------
     str
-        GitHub profile URL.
+        Version token.
+    """
+    if get_feed_source() == 'db':
+        # The tables only change through sync_pyosmeta, which counts its runs
+        return f"db.{shared_feeds.counter(SYNC_COUNTER).get()}"
+    return '-'.join(f"{feed_cache.version(name)}.{shared_feeds.generation(name)}" for name in names)
+
+
+def get_recent_contributors_from_db(count: int = 4) -> List[ContributorRecord]:
     """
-    return f"https://github.com/{github_username}"
+    Get the most recent contributors from the ``Contributor`` table.
 
+    Uses a single ``LIMIT`` query on the indexed ``date_added`` column.
+
+    Parameters
+    ----------
+    count : int, default 4
+        Number of recent contributors to return.
 
+    Returns
+    -------
+    list of ContributorRecord
+        Recent contributors, sorted by date_added descending.
+    """
+    try:
+        rows = (
+            Contributor.objects
+            .exclude(date_added=None)
+            .order_by('-date_added', '-pk')
+            .values(*ContributorRecord.stored_fields)[:count]
+        )
+        return [ContributorRecord.from_fields(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Unexpected error getting recent contributors from database: {e}")
+        return []
+
+
+def get_recent_packages_from_db(count: int = 3) -> List[PackageRecord]:
+    """
+    Get the most recently accepted packages from the ``Package`` table.
+
+    Uses a single ``LIMIT`` query on the indexed ``date_accepted`` column.
+
+    Parameters
+    ----------
+    count : int, default 3
+        Number of recent packages to return.
+
+    Returns
+    -------
+    list of PackageRecord
+        Recent packages, sorted by date_accepted descending.
+    """
+    try:
+        rows = (
+            Package.objects
+            .exclude(date_accepted=None)
+            .order_by('-date_accepted', 'package_name')
+            .values(*PackageRecord.__slots__)[:count]
+        )
+        return [PackageRecord.from_fields(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Unexpected error getting recent packages from database: {e}")
+        return []
@@ -1,22 +1,179 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse
 from django.shortcuts import render, get_object_or_404
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_POST
+from django.db.models import Count, Max
 import logging
 
+from .cache import feed_cache
+from .conditional import page_etag, page_last_modified
+from .feeds import feed_loader
+from .fragments import Section, fragment_cache
+from .facets import total, year_facets
+from .pagecache import cache_anonymous_page
+from .pagination import paginate
+from .upcoming import UPCOMING_CURSOR_PARAM, upcoming_events
+from .surrogate import BLOG_INDEX, EVENTS_INDEX, HOME, add_surrogate_keys, feed_key, page_keys, surrogate_keys
 from .utils import (
+    ContributorDataError,
+    PackageDataError,
+    get_feed_source,
+    get_feed_version,
     get_recent_contributors,
     get_recent_packages,
-    generate_github_avatar_url,
-    generate_github_profile_url
+    load_feed,
+    refresh_feeds,
 )
+from .webhooks import SIGNATURE_HEADER, verify_signature
 from publications.models import BlogPage, EventPage
 
 logger = logging.getLogger(__name__)
 
+# Text of the homepage hero section
+HERO_TITLE = 'We make it easier for scientists to create, find, maintain, and contribute to reusable code and software.'
+HERO_SUBTITLE = 'pyOpenSci broadens participation in scientific open source by breaking down social and technical barriers. Join our global community.'
 
-def home(request):
+
+async def _read_feed(func, count):
+    """
+    Await a blocking feed reader from async code.
+
+    YAML feeds are read on the feed loader's threads so that several feeds
+    load at once. Database reads stay on Django's sync thread, which owns
+    the request's database connection.
+
+    Parameters
+    ----------
+    func : callable
+        ``get_recent_contributors`` or ``get_recent_packages``.
+    count : int
+        Number of records to return.
+
+    Returns
+    -------
+    list
+        The records returned by ``func``.
+    """
+    if get_feed_source() == 'db':
+        return await sync_to_async(func)(count)
+    return await feed_loader.run(func, count)
+
+
+async def _get_recent_blog_posts(count):
+    """
+    Return the most recent live blog posts, with authors, using the async ORM.
+
+    Parameters
+    ----------
+    count : int
+        Number of posts to return.
+
+    Returns
+    -------
+    list of BlogPage
+        Posts, newest first.
+    """
+    queryset = (
+        BlogPage.objects.live()
+        .select_related('author')
+        .order_by('-date')[:count]
+    )
+    return [post async for post in queryset]
+
+
+async def _get_blog_version():
+    """
+    Return the version of the live blog posts: their latest modification and count.
+
+    The count catches unpublished and deleted posts, which leave the latest
+    ``last_modified`` unchanged, and the latest ``updated_at`` of their
+    authors catches renamed authors.
+    """
+    stats = await BlogPage.objects.live().aaggregate(
+        latest=Max('last_modified'), count=Count('pk'), author_updated=Max('author__updated_at'),
+    )
+    latest = stats['latest'].isoformat() if stats['latest'] is not None else ''
+    author_updated = stats['author_updated'].isoformat() if stats['author_updated'] is not None else ''
+    return f"{latest}.{stats['count']}.{author_updated}"
+
+
+def _feed_version(name):
+    """
+    Return a coroutine function giving the version of feed ``name``.
+
+    The feed is loaded through the feed cache first, so that the version is
+    that of the current records and a stale feed gets refreshed even while
+    its section is served from the fragment cache. Returns None when the
+    feed cache is disabled, as nothing then tracks changes to the feed.
+    """
+    async def version():
+        if get_feed_source() != 'db':
+            if feed_cache.get_ttl() <= 0:
+                return None
+            try:
+                await feed_loader.run(load_feed, name)
+            except (ContributorDataError, PackageDataError):
+                # Not cached; the section's reader logs and shows the fallback
+                return None
+        return get_feed_version((name,))
+    return version
+
+
+async def _load_hero():
+    """Return the context of the hero section."""
+    return {
+        'hero_title': HERO_TITLE,
+        'hero_subtitle': HERO_SUBTITLE,
+    }
+
+
+async def _hero_version():
+    """Return the version of the hero section, which only changes with its text."""
+    return f"{HERO_TITLE}\n{HERO_SUBTITLE}"
+
+
+async def _load_recent_contributors():
+    """Return the context of the "New pyOpenSci contributors" section."""
+    # Contributor records come with display_name, github_avatar_url and
+    # github_profile_url precomputed
+    return {'recent_contributors': await _read_feed(get_recent_contributors, 4)}
+
+
+async def _load_recent_blog_posts():
+    """Return the context of the "Recent blog posts & updates" section."""
+    return {'recent_blog_posts': await _get_recent_blog_posts(3)}
+
+
+async def _load_recent_packages():
+    """Return the context of the "Recently Accepted Python Packages" section."""
+    return {'recent_packages': await _read_feed(get_recent_packages, 3)}
+
+
+# Sections of the homepage, each cached under the version of its own data
+HOME_SECTIONS = (
+    Section('hero', 'core/home/hero.html', _hero_version, _load_hero),
+    Section('contributors', 'core/home/contributors.html', _feed_version('contributors'), _load_recent_contributors),
+    Section('blog', 'core/home/blog.html', _get_blog_version, _load_recent_blog_posts),
+    Section('packages', 'core/home/packages.html', _feed_version('packages'), _load_recent_packages),
+)
+
+
+@surrogate_keys(HOME, BLOG_INDEX, feed_key('contributors'), feed_key('packages'))
+@cache_anonymous_page(variant=get_feed_version)
+async def home(request):
     """
     Homepage view for PyOpenSci.
-    
+
+    Each section of the page (hero, contributors, blog posts, packages) is
+    cached under the version of its own data, so a blog publish renders
+    only the blog section again and a feed refresh only that feed's cards.
+    The data of the sections to render is loaded concurrently, so a cold
+    feed cache costs the slowest source rather than their sum. Under ASGI
+    the view does not tie up a worker thread while it waits.
+
     Parameters
     ----------
     request : HttpRequest
@@ -27,51 +184,19 @@ def home(request):
     HttpResponse
         Rendered home page with recent contributors data.
     """
-    # Fetch recent contributors from YAML
-    recent_contributors = get_recent_contributors(count=4)
-    
-    # Enhance contributor data with computed properties
-    for contributor in recent_contributors:
-        # Add avatar URL if github_image_id exists
-        if contributor.get('github_image_id'):
-            contributor['github_avatar_url'] = generate_github_avatar_url(
-                contributor['github_image_id']
-            )
-        
-        # Add profile URL
-        contributor['github_profile_url'] = generate_github_profile_url(
-            contributor['github_username']
-        )
-        
-        # Add display name
-        contributor['display_name'] = (
-            contributor.get('name') or f"@{contributor['github_username']}"
-        )
-
-    # Fetch recent packages from YAML
-    recent_packages = get_recent_packages(count=3)
+    sections, context = await fragment_cache.render(HOME_SECTIONS)
 
-    # Fetch recent blog posts from Wagtail
-    recent_blog_posts = (
-        BlogPage.objects.live()
-        .select_related('author')
-        .order_by('-date')[:3]
-    )
-
-    context = {
+    context.update({
         'page_title': 'Welcome to pyOpenSci',
-        'hero_title': 'We make it easier for scientists to create, find, maintain, and contribute to reusable code and software.',
-        'hero_subtitle': 'pyOpenSci broadens participation in scientific open source by breaking down social and technical barriers. Join our global community.',
-        # Used for the "New pyOpenSci contributors" section on the home page
-        'recent_contributors': recent_contributors,
-        # Used for the "Recently Accepted Python Packages" section on the home page
-        'recent_packages': recent_packages,
-        # Used for the "Recent blog posts & updates" section on the home page
-        'recent_blog_posts': recent_blog_posts,
-    }
+        'sections': sections,
+    })
+    # Everything the sections use is loaded above, so rendering runs no
+    # queries and is safe in the event loop
     return render(request, 'core/home.html', context)
 
 
+@surrogate_keys(BLOG_INDEX)
+@cache_anonymous_page()
 def blog_index(request):
     """
     Blog index view for PyOpenSci.
@@ -94,30 +219,20 @@ def blog_index(request):
     year_filter = request.GET.get('year')
 
     # Base queryset
-    blog_posts = BlogPage.objects.live().select_related('author').order_by('-date')
+    # Cards show each post's author and tags
+    blog_posts = BlogPage.objects.live().select_related('author').prefetch_related('tags').order_by('-date')
 
     # Apply year filter if provided
+    year = None
     if year_filter and year_filter.isdigit():
-        blog_posts = blog_posts.filter(date__year=int(year_filter))
-
-    # Get available years for filter dropdown
-    available_years = (
-        BlogPage.objects.live()
-        .dates('date', 'year', order='DESC')
-    )
+        year = int(year_filter)
+        blog_posts = blog_posts.filter(date__year=year)
 
-    # Pagination: 12 posts per page
-    paginator = Paginator(blog_posts, 12)
-    page = request.GET.get('page')
+    # Available years for the filter dropdown, with the number of blog posts in each
+    available_years = year_facets.get(BlogPage)
 
-    try:
-        paginated_posts = paginator.page(page)
-    except PageNotAnInteger:
-        # If page is not an integer, deliver first page
-        paginated_posts = paginator.page(1)
-    except EmptyPage:
-        # If page is out of range, deliver last page of results
-        paginated_posts = paginator.page(paginator.num_pages)
+    # Pagination: 12 posts per page, continuing from the cursor's post
+    paginated_posts = paginate(request, blog_posts, 12, 'date', count=total(available_years, year))
 
     context = {
         'page_title': 'pyOpenSci Blog',
@@ -127,9 +242,17 @@ def blog_index(request):
         'available_years': available_years,
         'selected_year': year_filter,
     }
-    return render(request, 'core/blog_index.html', context)
+    response = render(request, 'core/blog_index.html', context)
+    return add_surrogate_keys(response, *page_keys(paginated_posts))
 
 
+def _local_date_version():
+    """Return today's local date, on which the events index splits upcoming and past events."""
+    return timezone.localdate().isoformat()
+
+
+@surrogate_keys(EVENTS_INDEX)
+@cache_anonymous_page(variant=_local_date_version)
 def events_index(request):
     """
     Events index view for PyOpenSci.
@@ -150,56 +273,56 @@ def events_index(request):
     """
     # Get year filter from query params
     year_filter = request.GET.get('year')
+    today = timezone.localdate()
 
-    # Base queryset
-    events = EventPage.objects.live().select_related('author').prefetch_related('tags').order_by('-start_date')
+    # Base queryset: past events; upcoming ones are listed in their own block
+    events = (
+        EventPage.objects.live().filter(start_date__lt=today)
+        .select_related('author').prefetch_related('tags').order_by('-start_date')
+    )
 
     # Apply year filter if provided
+    year = None
     if year_filter and year_filter.isdigit():
-        events = events.filter(start_date__year=int(year_filter))
+        year = int(year_filter)
+        events = events.filter(start_date__year=year)
 
-    # Get available years for filter dropdown
-    available_years = (
-        EventPage.objects.live()
-        .dates('start_date', 'year', order='DESC')
-    )
+    # Available years for the filter dropdown, with the number of past events in each
+    available_years = year_facets.get(EventPage, before=today)
 
-    # Pagination: 15 events per page
-    paginator = Paginator(events, 15)
-    page = request.GET.get('page')
+    # Pagination: 15 events per page, continuing from the cursor's event
+    paginated_events = paginate(request, events, 15, 'start_date', count=total(available_years, year))
 
-    try:
-        paginated_events = paginator.page(page)
-    except PageNotAnInteger:
-        # If page is not an integer, deliver first page
-        paginated_events = paginator.page(1)
-    except EmptyPage:
-        # If page is out of range, deliver last page of results
-        paginated_events = paginator.page(paginator.num_pages)
-
-    # Separate upcoming and past events
-    from django.utils import timezone
-    today = timezone.now().date()
-
-    upcoming_events = EventPage.objects.live().filter(start_date__gte=today).select_related('author').prefetch_related('tags').order_by('start_date')
+    # Next few upcoming events, rendered once per day or change; later ones
+    # are linked from the block
+    upcoming_block, upcoming_keys = upcoming_events.render(
+        today, request.GET.get(UPCOMING_CURSOR_PARAM), request.GET,
+    )
 
     context = {
         'page_title': 'pyOpenSci Events',
         'hero_title': 'pyOpenSci Events',
         'hero_subtitle': 'pyOpenSci holds events that support scientists developing open science skills.',
         'events': paginated_events,
-        'upcoming_events': upcoming_events,
+        'upcoming_block': upcoming_block,
         'available_years': available_years,
         'selected_year': year_filter,
         'today': today,
     }
-    return render(request, 'core/events_index.html', context)
+    response = render(request, 'core/events_index.html', context)
+    return add_surrogate_keys(response, *page_keys(paginated_events), *upcoming_keys)
 
 
+@surrogate_keys(BLOG_INDEX)
+@condition(etag_func=page_etag(BlogPage), last_modified_func=page_last_modified(BlogPage))
 def serve_blog_page(request, slug):
     """
     Serve individual blog page with /blog/ prefix.
 
+    Responses carry an ETag and Last-Modified (see ``core.conditional``);
+    a client with a current copy gets a 304 before the page is rendered or
+    related posts are queried.
+
     Parameters
     ----------
     request : HttpRequest
@@ -220,7 +343,6 @@ def serve_blog_page(request, slug):
 
     if page_tags:
         # Find posts with overlapping tags
-        from django.db.models import Count
         related_posts = (
             BlogPage.objects.live()
             .select_related('author')
@@ -243,13 +365,20 @@ def serve_blog_page(request, slug):
     # Add related_posts to the page context
     page.related_posts = related_posts
 
-    return page.serve(request)
+    # Related posts are covered by BLOG_INDEX
+    return add_surrogate_keys(page.serve(request), *page_keys([page]))
 
 
+@surrogate_keys(EVENTS_INDEX)
+@condition(etag_func=page_etag(EventPage), last_modified_func=page_last_modified(EventPage))
 def serve_event_page(request, slug):
     """
     Serve individual event page with /events/ prefix.
 
+    Responses carry an ETag and Last-Modified (see ``core.conditional``);
+    a client with a current copy gets a 304 before the page is rendered or
+    related events are queried.
+
     Parameters
     ----------
     request : HttpRequest
@@ -270,7 +399,6 @@ def serve_event_page(request, slug):
 
     if page_tags:
         # Find events with overlapping tags
-        from django.db.models import Count
         related_events = (
             EventPage.objects.live()
             .select_related('author')
@@ -293,4 +421,42 @@ def serve_event_page(request, slug):
     # Add related_events to the page context
     page.related_events = related_events
 
-    return page.serve(request)
+    # Related events are covered by EVENTS_INDEX
+    return add_surrogate_keys(page.serve(request), *page_keys([page]))
+
+
+@csrf_exempt
+@require_POST
+def feed_webhook(request):
+    """
+    Refresh the contributor and package feeds when GitHub reports a push.
+
+    The request must be signed with ``FEED_WEBHOOK_SECRET`` (see
+    ``core.webhooks``). The feeds are marked dirty and reloaded in the
+    background, so the response does not wait for the upstream.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django HTTP request object.
+
+    Returns
+    -------
+    HttpResponse
+        202 with the names of the feeds being refreshed, 204 for GitHub's
+        ``ping`` event, or 403 if the signature does not match.
+    """
+    secret = getattr(settings, 'FEED_WEBHOOK_SECRET', '')
+    if not secret:
+        raise Http404("Feed webhook is not configured")
+
+    if not verify_signature(request.body, request.headers.get(SIGNATURE_HEADER), secret):
+        logger.warning("Rejected feed webhook with a missing or invalid signature")
+        return HttpResponseForbidden("Invalid signature")
+
+    if request.headers.get('X-GitHub-Event') == 'ping':
+        return HttpResponse(status=204)
+
+    refreshing = refresh_feeds()
+    logger.info(f"Feed webhook started refreshing: {', '.join(refreshing) or 'nothing'}")
+    return JsonResponse({'refreshing': refreshing}, status=202)
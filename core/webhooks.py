@@ -0,0 +1,61 @@
+"""
+Signature checking for the feed webhook.
+
+The contributor and package feeds live in the pyopensci.github.io
+repository. A GitHub push webhook pointed at ``core:feed_webhook`` tells the
+site when they may have changed, so the feeds can be refreshed right away and
+``FEED_CACHE_TTL`` can be long. GitHub signs each delivery with the shared
+``FEED_WEBHOOK_SECRET`` and sends the HMAC-SHA256 of the raw body, as
+``sha256=<hex digest>``, in the ``X-Hub-Signature-256`` header.
+"""
+
+import hashlib
+import hmac
+from typing import Optional
+
+# Header carrying the signature of the request body
+SIGNATURE_HEADER = 'X-Hub-Signature-256'
+SIGNATURE_PREFIX = 'sha256='
+
+
+def sign(body: bytes, secret: str) -> str:
+    """
+    Return the signature header value for ``body``.
+
+    Parameters
+    ----------
+    body : bytes
+        Raw request body.
+    secret : str
+        Shared webhook secret.
+
+    Returns
+    -------
+    str
+        ``sha256=`` followed by the hex HMAC-SHA256 of ``body``.
+    """
+    digest = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return SIGNATURE_PREFIX + digest
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Check a webhook signature in constant time.
+
+    Parameters
+    ----------
+    body : bytes
+        Raw request body.
+    signature : str or None
+        Value of the ``X-Hub-Signature-256`` header.
+    secret : str
+        Shared webhook secret. An empty secret rejects every request.
+
+    Returns
+    -------
+    bool
+        True if ``signature`` was made from ``body`` with ``secret``.
+    """
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(sign(body, secret), signature)
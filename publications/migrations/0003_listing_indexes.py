@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publications', '0002_blogindexpage_eventindexpage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpage',
+            index=models.Index(fields=['date', 'page_ptr'], name='blogpage_date_pk_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventpage',
+            index=models.Index(fields=['start_date', 'page_ptr'], name='eventpage_start_date_pk_idx'),
+        ),
+    ]
@@ -38,6 +38,8 @@ class Author(models.Model):
         Mastodon handle (without @ symbol)
     discord : CharField
         Discord username
+    updated_at : DateTimeField
+        Last modification timestamp
     """
     name = models.CharField(max_length=255)
     slug = models.SlugField(max_length=100, unique=True)
@@ -49,6 +51,7 @@ class Author(models.Model):
     linkedin = models.URLField(blank=True)
     mastodon = models.CharField(max_length=100, blank=True)
     discord = models.CharField(max_length=100, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     panels = [
         FieldPanel('name'),
@@ -171,6 +174,10 @@ class BlogPage(Page):
 
     class Meta:
         verbose_name = "Blog Page"
+        indexes = [
+            # Blog index pages, newest first, and their year filter
+            models.Index(fields=['date', 'page_ptr'], name='blogpage_date_pk_idx'),
+        ]
 
 
 class EventPage(Page):
@@ -289,4 +296,8 @@ class EventPage(Page):
 
 
     class Meta:
-        verbose_name = "Event Page"
\ No newline at end of file
+        verbose_name = "Event Page"
+        indexes = [
+            # Events index pages, upcoming events and their year filter
+            models.Index(fields=['start_date', 'page_ptr'], name='eventpage_start_date_pk_idx'),
+        ]
\ No newline at end of file
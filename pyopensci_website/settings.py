@@ -70,6 +70,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
+    "core.surrogate.SurrogateKeyMiddleware",
 ]
 
 ROOT_URLCONF = "pyopensci_website.urls"
@@ -167,3 +168,83 @@ WAGTAILDOCS_EXTENSIONS = ['csv', 'docx', 'key', 'odt', 'pdf', 'pptx', 'rtf', 'tx
 
 # Case insensitive tags
 TAGGIT_CASE_INSENSITIVE = True
+
+# Seconds the contributor and package feeds are served from the in-process
+# cache before a background refresh is started (0 disables the cache)
+FEED_CACHE_TTL = 300
+
+# Where downloaded feed bodies and their HTTP validators (ETag,
+# Last-Modified) are kept between requests and restarts, and where the parsed
+# feeds are published for all worker processes to map (None disables both)
+FEED_CACHE_DIR = BASE_DIR / "var" / "feed_cache"
+
+# Seconds to wait for a connection to a feed host, and per feed for each
+# read from it
+FEED_CONNECT_TIMEOUT = 5
+FEED_TIMEOUTS = {"contributors": 10, "packages": 10}
+
+# After this many consecutive failures a feed host is not contacted for the
+# cooldown (in seconds); the last good copy of each feed is served meanwhile
+FEED_CIRCUIT_FAILURES = 3
+FEED_CIRCUIT_COOLDOWN = 60
+
+# Shared secret of the GitHub push webhook that refreshes the feeds as soon as
+# they change (core:feed_webhook). With the webhook set up, FEED_CACHE_TTL can
+# be raised a lot. Empty disables the endpoint.
+FEED_WEBHOOK_SECRET = ""
+
+# Seconds the homepage and the blog and events indexes are served to
+# anonymous visitors from the PAGE_CACHE_ALIAS cache (0 disables it).
+# Publishing, unpublishing or deleting a post or event moves all of them in
+# every worker.
+PAGE_CACHE_TIMEOUT = 300
+PAGE_CACHE_ALIAS = "default"
+
+# Seconds each homepage section is kept in the PAGE_CACHE_ALIAS cache (0
+# disables it). Sections are keyed by the version of their own data, so a
+# change to one source only renders that section again.
+FRAGMENT_CACHE_TIMEOUT = 3600
+
+# Number of upcoming events listed above the past events on the events index;
+# later ones are linked from the list, page by page. The first page is cached
+# until local midnight or until an event is published, unpublished or deleted
+# (FRAGMENT_CACHE_TIMEOUT caps it, 0 disables it).
+UPCOMING_EVENTS_LIMIT = 6
+
+# Seconds the year filters of the blog and events indexes, with the number
+# of pages in each year, are kept in the PAGE_CACHE_ALIAS cache (0 counts on
+# every request). Publishing, unpublishing or deleting a page recounts its type.
+FACET_CACHE_TIMEOUT = 86400
+
+# How the blog and events indexes paginate: "cursor" continues from the last
+# row shown (?cursor=...), so every page costs the same however deep;
+# "offset" uses numbered pages (?page=N), which count and skip rows.
+INDEX_PAGINATION = "cursor"
+
+# Response header listing the surrogate keys (cache tags) of public pages,
+# e.g. "Surrogate-Key" (Fastly, Varnish xkey) or "Cache-Tag"
+SURROGATE_KEY_HEADER = "Surrogate-Key"
+
+# Seconds a reverse proxy may keep tagged pages (s-maxage); browsers always
+# revalidate. 0 marks them private.
+PROXY_CACHE_TIMEOUT = 300
+
+# Reverse proxies told to drop pages when their content changes. Each entry is
+# a URL receiving a PURGE request, or a dict with "url", "method" (e.g. "BAN")
+# and "header" listing the keys, e.g.
+# [{"url": "http://varnish:6081/", "method": "BAN", "header": "xkey-purge"}]
+PROXY_PURGE_ENDPOINTS = []
+PROXY_PURGE_TIMEOUT = 2
+
+# Source for the homepage contributor and package lists: "yaml" reads the
+# GitHub feeds, "db" queries the tables filled by `manage.py sync_pyosmeta`
+FEED_SOURCE = "yaml"
+
+# YAML backend for the feeds: "libyaml" (needs PyYAML built with libyaml),
+# "ruamel" (pure Python) or "auto" for the fastest one installed
+FEED_PARSER = "auto"
+
+# Optional JSON copies of the YAML feeds, keyed by YAML URL; a mirror is read
+# instead of its YAML feed when configured, e.g.
+# {CONTRIBUTORS_URL: "https://example.org/contributors.json"}
+FEED_JSON_MIRRORS = {}